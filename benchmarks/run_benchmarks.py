@@ -0,0 +1,273 @@
+"""
+Benchmark suite for the core GA hot paths.
+
+Usage:
+    python benchmarks/run_benchmarks.py run --output results.json
+    python benchmarks/run_benchmarks.py run --sizes 50 500 --instances original instance4
+    python benchmarks/run_benchmarks.py compare baseline.json results.json --threshold 0.10
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# Add the repository root to the sys.path to allow importing from src
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(REPO_ROOT)
+
+import numpy as np
+from src.core.cache import DEFAULT_CACHE
+from src.core.fitness import calculate_fitness, select_parents
+from src.core.genetic_algorithm import (genetic_algorithm, genetic_algorithm_instance_4, local_search,
+                                        local_search_instance_4, next_generation, next_generation_instance_4)
+from src.core.test_case import initialize_population, initialize_population_instance_4
+from src.instances.registry import INSTANCES, get_instance
+from src.utils.validation import get_batch_validator
+
+DEFAULT_SIZES = [50, 500, 5000, 50000, 100000]
+BENCHMARKS = ["fitness", "selection", "offspring", "local_search", "validator", "validator_batch", "ga_run",
+              "startup"]
+
+
+def _population(instance, size):
+    """Build a fresh population with evaluated categories for an instance."""
+    if instance["format_aware"]:
+        population = initialize_population_instance_4(size, instance["categories"], instance["validator"])
+    else:
+        population = initialize_population(size, instance["categories"], instance["validator"])
+    for ind in population:
+        ind.categories
+    return population
+
+
+def _setup(benchmark, instance, size, generations, instance_key=None):
+    """
+    Prepare one benchmark case.
+
+    Returns:
+        Tuple of (callable, evaluations) where evaluations is the number of individual
+        evaluations one call performs, or None if the case does not apply
+    """
+    categories, validator = instance["categories"], instance["validator"]
+    format_aware = instance["format_aware"]
+    population = _population(instance, size)
+
+    if benchmark == "fitness":
+        return (lambda: calculate_fitness(population)), size
+
+    if benchmark == "selection":
+        fitness = calculate_fitness(population)
+        return (lambda: select_parents(population, fitness, size // 2)), size
+
+    if benchmark == "offspring":
+        if format_aware:
+            step = lambda: next_generation_instance_4(population, size, categories, validator)
+        else:
+            step = lambda: next_generation(population, size)
+        return step, size - size // 2
+
+    if benchmark == "local_search":
+        if format_aware:
+            search = lambda: local_search_instance_4(population, categories, validator, 5)
+        else:
+            search = lambda: local_search(population, categories, validator)
+        return search, size * 5
+
+    if benchmark == "validator":
+        if format_aware:
+            pairs = [(ind.date_str, ind.format_type) for ind in population]
+            return (lambda: [validator(s, f) for s, f in pairs]), size
+        date_strs = [ind.date_str for ind in population]
+        return (lambda: [validator(s) for s in date_strs]), size
+
+    if benchmark == "validator_batch":
+        batch = get_batch_validator(validator)
+        if batch is None:
+            return None
+        genes = [np.array([getattr(ind, gene) for ind in population]) for gene in ("day", "month", "year")]
+        if format_aware:
+            genes.append(np.array([ind.format_type for ind in population]))
+        return (lambda: batch(*genes)), size
+
+    if benchmark == "ga_run":
+        engine = genetic_algorithm_instance_4 if format_aware else genetic_algorithm
+        state = {}
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, coverages = engine(pop_size=size, generations=generations, category_dict=categories,
+                                      validator=validator)
+            state["coverages"] = coverages
+
+        run.state = state
+        return run, None
+
+    if benchmark == "startup":
+        # Command-line run from interpreter start through the first generation
+        command = [sys.executable, os.path.join(REPO_ROOT, "main.py"), "--instances", instance_key,
+                   "--modes", "baseline", "--pop-size", str(size), "--generations", "1",
+                   "--workers", "1", "--no-plots"]
+
+        def start():
+            with tempfile.TemporaryDirectory() as data_dir:
+                subprocess.run(command + ["--data-dir", data_dir], stdout=subprocess.DEVNULL, check=True)
+
+        return start, None
+
+    raise ValueError(f"Unknown benchmark '{benchmark}'")
+
+
+def run_case(benchmark, instance_key, size, repeat, generations, seed):
+    """
+    Measure one (benchmark, instance, size) case.
+
+    Wall time is the best of `repeat` runs; peak memory is measured in a separate traced run.
+
+    Returns:
+        Result dictionary, or None if the case does not apply
+    """
+    instance = get_instance(instance_key)
+    times = []
+    case = None
+    for _ in range(repeat):
+        DEFAULT_CACHE.clear()
+        random.seed(seed)
+        case = _setup(benchmark, instance, size, generations, instance_key)
+        if case is None:
+            return None
+        func, _ = case
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    DEFAULT_CACHE.clear()
+    random.seed(seed)
+    func, evaluations = _setup(benchmark, instance, size, generations, instance_key)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    wall_time = min(times)
+    result = {
+        "benchmark": benchmark,
+        "instance": instance_key,
+        "size": size,
+        "wall_time": wall_time,
+        "evals_per_sec": None,
+        "peak_memory_bytes": peak,
+        "generations_to_95": None,
+    }
+    if benchmark == "ga_run":
+        coverages = func.state["coverages"]
+        reached = [i + 1 for i, coverage in enumerate(coverages) if coverage >= 95]
+        result["generations_to_95"] = reached[0] if reached else None
+        evaluations = size + len(coverages) * (size - size // 2)
+    if evaluations:
+        result["evals_per_sec"] = evaluations / wall_time if wall_time > 0 else None
+    return result
+
+
+def run_benchmarks(args):
+    """Run the selected benchmarks and write the results file."""
+    results = []
+    for benchmark in args.benchmarks:
+        for instance_key in args.instances:
+            for size in args.sizes:
+                result = run_case(benchmark, instance_key, size, args.repeat, args.generations, args.seed)
+                if result is None:
+                    continue
+                results.append(result)
+                rate = f"{result['evals_per_sec']:,.0f} evals/s" if result["evals_per_sec"] else ""
+                print(f"{benchmark:16s} {instance_key:10s} {size:>8d}  {result['wall_time']:10.4f}s  "
+                      f"{result['peak_memory_bytes'] / 1e6:9.2f} MB  {rate}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "generations": args.generations,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+def compare_results(args):
+    """Compare two results files and flag wall-time regressions."""
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    with open(args.candidate) as f:
+        candidate = json.load(f)["results"]
+
+    key = lambda r: (r["benchmark"], r["instance"], r["size"])
+    baseline_by_key = {key(r): r for r in baseline}
+    regressions = 0
+
+    print(f"{'benchmark':16s} {'instance':10s} {'size':>8s}  {'baseline':>10s}  {'candidate':>10s}  {'ratio':>7s}")
+    for result in candidate:
+        base = baseline_by_key.get(key(result))
+        if base is None or not base["wall_time"]:
+            continue
+        ratio = result["wall_time"] / base["wall_time"]
+        flag = ""
+        if max(base["wall_time"], result["wall_time"]) < args.min_time:
+            flag = "  (below min time)"
+        elif ratio > 1 + args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            flag = "  faster"
+        print(f"{result['benchmark']:16s} {result['instance']:10s} {result['size']:>8d}  "
+              f"{base['wall_time']:10.4f}  {result['wall_time']:10.4f}  {ratio:7.2f}{flag}")
+
+    print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    """Parse the command line and run the requested command."""
+    parser = argparse.ArgumentParser(description="Benchmark the GA hot paths.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmarks and write a JSON results file")
+    run.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    run.add_argument("--instances", nargs="+", choices=list(INSTANCES), default=list(INSTANCES))
+    run.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    run.add_argument("--repeat", type=int, default=3, help="Timed repetitions per case (best is kept)")
+    run.add_argument("--generations", type=int, default=100, help="Generation budget for ga_run")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--output", default="benchmark_results.json")
+
+    compare = commands.add_parser("compare", help="Compare two results files")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--threshold", type=float, default=0.10,
+                         help="Relative slowdown reported as a regression")
+    compare.add_argument("--min-time", type=float, default=0.001,
+                         help="Cases faster than this many seconds are too noisy to flag")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run_benchmarks(args)
+        return 0
+    return compare_results(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
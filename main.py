@@ -1,140 +1,137 @@
+import argparse
 import os
 import sys
 
 # Add the parent directory to the sys.path to allow importing from src
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.utils.validation import is_valid_date, validator_instance_1, validator_instance_2, validator_instance_3, validator_instance_4
-from src.utils.visualization import save_test_cases_to_csv, print_coverage_comparison
-from src.runners.run_instance import run_instance
-from src.runners.run_instance4 import run_instance_4
-
-# Import instance-specific configuration
-from src.instances.original import CATEGORIES as ORIGINAL_CATEGORIES, DEFAULT_PARAMS as ORIGINAL_PARAMS
-from src.instances.instance1 import CATEGORIES as CATEGORIES_INSTANCE_1, DEFAULT_PARAMS as INSTANCE1_PARAMS
-from src.instances.instance2 import CATEGORIES as CATEGORIES_INSTANCE_2, DEFAULT_PARAMS as INSTANCE2_PARAMS
-from src.instances.instance3 import CATEGORIES as CATEGORIES_INSTANCE_3, DEFAULT_PARAMS as INSTANCE3_PARAMS
-from src.instances.instance4 import CATEGORIES as CATEGORIES_INSTANCE_4, DEFAULT_PARAMS as INSTANCE4_PARAMS
-
-def main():
-    """Execute the genetic algorithm on all problem instances."""
-    results = {}
-    instance_results = {}
-    
-    print("\n=== Original Problem (Baseline GA) ===")
-    coverage, test_cases = run_instance(
-        category_dict=ORIGINAL_CATEGORIES, 
-        validator=is_valid_date, 
-        instance_name="Original Baseline",
-        force_full_generations=True,
-        **{k: v for k, v in ORIGINAL_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Original (Baseline)"] = coverage
-    instance_results["Original (Baseline)"] = (coverage, test_cases)
-    
-    print("\n=== Original Problem (GA + Local Search) ===")
-    coverage, test_cases = run_instance(
-        category_dict=ORIGINAL_CATEGORIES, 
-        validator=is_valid_date, 
-        use_local_search=True, 
-        instance_name="Original GA + Local Search",
-        force_full_generations=True,
-        **{k: v for k, v in ORIGINAL_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Original (GA + Local Search)"] = coverage
-    instance_results["Original (GA + Local Search)"] = (coverage, test_cases)
-    
-    print("\n=== Instance 1: Basic Date Validation (Baseline GA) ===")
-    coverage, test_cases = run_instance(
-        category_dict=CATEGORIES_INSTANCE_1, 
-        validator=validator_instance_1, 
-        instance_name="Instance 1 Baseline",
-        **{k: v for k, v in INSTANCE1_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Instance 1 (Baseline)"] = coverage
-    instance_results["Instance 1 (Baseline)"] = (coverage, test_cases)
-    
-    print("\n=== Instance 1: Basic Date Validation (GA + Local Search) ===")
-    coverage, test_cases = run_instance(
-        category_dict=CATEGORIES_INSTANCE_1, 
-        validator=validator_instance_1, 
-        use_local_search=True, 
-        instance_name="Instance 1 GA + Local Search",
-        **{k: v for k, v in INSTANCE1_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Instance 1 (GA + Local Search)"] = coverage
-    instance_results["Instance 1 (GA + Local Search)"] = (coverage, test_cases)
-    
-    print("\n=== Instance 2: Advanced Leap Year & Boundaries (Baseline GA) ===")
-    coverage, test_cases = run_instance(
-        category_dict=CATEGORIES_INSTANCE_2, 
-        validator=validator_instance_2, 
-        instance_name="Instance 2 Baseline",
-        **{k: v for k, v in INSTANCE2_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Instance 2 (Baseline)"] = coverage
-    instance_results["Instance 2 (Baseline)"] = (coverage, test_cases)
-    
-    print("\n=== Instance 2: Advanced Leap Year & Boundaries (GA + Local Search) ===")
-    coverage, test_cases = run_instance(
-        category_dict=CATEGORIES_INSTANCE_2, 
-        validator=validator_instance_2, 
-        use_local_search=True, 
-        instance_name="Instance 2 GA + Local Search",
-        **{k: v for k, v in INSTANCE2_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Instance 2 (GA + Local Search)"] = coverage
-    instance_results["Instance 2 (GA + Local Search)"] = (coverage, test_cases)
-    
-    print("\n=== Instance 3: Complex Month-Day Combinations (Baseline GA) ===")
-    coverage, test_cases = run_instance(
-        category_dict=CATEGORIES_INSTANCE_3, 
-        validator=validator_instance_3, 
-        instance_name="Instance 3 Baseline",
-        **{k: v for k, v in INSTANCE3_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Instance 3 (Baseline)"] = coverage
-    instance_results["Instance 3 (Baseline)"] = (coverage, test_cases)
-    
-    print("\n=== Instance 3: Complex Month-Day Combinations (GA + Local Search) ===")
-    coverage, test_cases = run_instance(
-        category_dict=CATEGORIES_INSTANCE_3, 
-        validator=validator_instance_3, 
-        use_local_search=True, 
-        instance_name="Instance 3 GA + Local Search",
-        **{k: v for k, v in INSTANCE3_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Instance 3 (GA + Local Search)"] = coverage
-    instance_results["Instance 3 (GA + Local Search)"] = (coverage, test_cases)
-    
-    print("\n=== Instance 4: Format Variations (Baseline GA) ===")
-    coverage, test_cases = run_instance_4(
-        category_dict=CATEGORIES_INSTANCE_4, 
-        validator=validator_instance_4, 
-        instance_name="Instance 4 Baseline",
-        force_full_generations=True,
-        **{k: v for k, v in INSTANCE4_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Instance 4 (Baseline)"] = coverage
-    instance_results["Instance 4 (Baseline)"] = (coverage, test_cases)
-    
-    print("\n=== Instance 4: Format Variations (GA + Local Search) ===")
-    coverage, test_cases = run_instance_4(
-        category_dict=CATEGORIES_INSTANCE_4, 
-        validator=validator_instance_4, 
-        use_local_search=True, 
-        instance_name="Instance 4 GA + Local Search",
-        force_full_generations=True,
-        **{k: v for k, v in INSTANCE4_PARAMS.items() if k not in ['instance_name']}
-    )
-    results["Instance 4 (GA + Local Search)"] = coverage
-    instance_results["Instance 4 (GA + Local Search)"] = (coverage, test_cases)
-    
+from src.utils.visualization import (save_test_cases_to_csv, print_coverage_comparison,
+                                      print_phase_breakdown, save_run_stats_to_json,
+                                      PlotBatch, DATA_DIR, IMAGES_DIR)
+from src.runners.parallel import run_configurations
+from src.instances.registry import INSTANCES
+
+# GA configurations run by main(), in output order
+RUN_CONFIGS = [
+    {"label": "Original (Baseline)", "title": "Original Problem (Baseline GA)",
+     "instance": "original", "run_name": "Original Baseline", "force_full_generations": True},
+    {"label": "Original (GA + Local Search)", "title": "Original Problem (GA + Local Search)",
+     "instance": "original", "run_name": "Original GA + Local Search", "use_local_search": True,
+     "force_full_generations": True},
+    {"label": "Instance 1 (Baseline)", "title": "Instance 1: Basic Date Validation (Baseline GA)",
+     "instance": "instance1", "run_name": "Instance 1 Baseline"},
+    {"label": "Instance 1 (GA + Local Search)", "title": "Instance 1: Basic Date Validation (GA + Local Search)",
+     "instance": "instance1", "run_name": "Instance 1 GA + Local Search", "use_local_search": True},
+    {"label": "Instance 2 (Baseline)", "title": "Instance 2: Advanced Leap Year & Boundaries (Baseline GA)",
+     "instance": "instance2", "run_name": "Instance 2 Baseline"},
+    {"label": "Instance 2 (GA + Local Search)", "title": "Instance 2: Advanced Leap Year & Boundaries (GA + Local Search)",
+     "instance": "instance2", "run_name": "Instance 2 GA + Local Search", "use_local_search": True},
+    {"label": "Instance 3 (Baseline)", "title": "Instance 3: Complex Month-Day Combinations (Baseline GA)",
+     "instance": "instance3", "run_name": "Instance 3 Baseline"},
+    {"label": "Instance 3 (GA + Local Search)", "title": "Instance 3: Complex Month-Day Combinations (GA + Local Search)",
+     "instance": "instance3", "run_name": "Instance 3 GA + Local Search", "use_local_search": True},
+    {"label": "Instance 4 (Baseline)", "title": "Instance 4: Format Variations (Baseline GA)",
+     "instance": "instance4", "run_name": "Instance 4 Baseline", "force_full_generations": True},
+    {"label": "Instance 4 (GA + Local Search)", "title": "Instance 4: Format Variations (GA + Local Search)",
+     "instance": "instance4", "run_name": "Instance 4 GA + Local Search", "use_local_search": True,
+     "force_full_generations": True},
+]
+
+# Run modes selectable on the command line, by whether they use local search
+MODES = {"baseline": False, "local-search": True}
+
+def select_configs(instances=None, modes=None, pop_size=None, generations=None):
+    """
+    Select the run configurations of some instances and modes.
+
+    Args:
+        instances: Instance keys to run (None runs all)
+        modes: Modes to run, "baseline" and/or "local-search" (None runs both)
+        pop_size: Population size overriding the instances' defaults
+        generations: Generation budget overriding the instances' defaults
+
+    Returns:
+        List of run configurations, in RUN_CONFIGS order
+    """
+    local_search = {MODES[mode] for mode in modes or MODES}
+    configs = []
+    for config in RUN_CONFIGS:
+        if (instances is None or config["instance"] in instances) and \
+                config.get("use_local_search", False) in local_search:
+            overrides = {"pop_size": pop_size, "generations": generations}
+            configs.append({**config, **{k: v for k, v in overrides.items() if v is not None}})
+    return configs
+
+def main(workers=None, seed=None, profile=False, plots=True, instances=None, modes=None,
+         pop_size=None, generations=None, csv_filename="test_cases_all.csv", data_dir=DATA_DIR,
+         images_dir=IMAGES_DIR, report=False):
+    """
+    Execute the genetic algorithm on all problem instances, or a selection of them.
+
+    Args:
+        workers: Number of worker processes (None uses all cores, 1 runs serially)
+        seed: Base seed; each run gets a deterministic seed derived from it
+        profile: Whether to time every phase of each run and print and save the breakdown
+        plots: Whether to render the coverage plots (rendered together after all runs)
+        instances: Instance keys to run (None runs all)
+        modes: Modes to run, "baseline" and/or "local-search" (None runs both)
+        pop_size: Population size overriding the instances' defaults
+        generations: Generation budget overriding the instances' defaults
+        csv_filename: Filename of the test case CSV file
+        data_dir: Directory of the CSV file and run statistics
+        images_dir: Directory of the coverage plots
+        report: Whether to generate the PDF report afterwards
+    """
+    configs = select_configs(instances, modes, pop_size, generations)
+    plot_batch = PlotBatch() if plots else False
+    instance_results = run_configurations(configs, workers=workers, seed=seed, profile=profile,
+                                          plots=plot_batch)
+    if profile:
+        run_stats = {label: result[2] for label, result in instance_results.items()}
+        instance_results = {label: result[:2] for label, result in instance_results.items()}
+    results = {label: coverage for label, (coverage, _) in instance_results.items()}
+
     # Print comparison of coverage across all instances
     print_coverage_comparison(results)
-    
+
     # Save all test cases to CSV
-    save_test_cases_to_csv(instance_results, "test_cases_all.csv")
+    save_test_cases_to_csv(instance_results, csv_filename, data_dir)
+
+    # Render the coverage plots of all runs together
+    if plots:
+        plot_batch.render(workers, images_dir)
+
+    # Print and save where the time of each run went
+    if profile:
+        print_phase_breakdown(run_stats)
+        save_run_stats_to_json(run_stats, "run_stats.json", data_dir)
+
+    # The report pulls in fpdf and matplotlib, so it is only imported when requested
+    if report:
+        from generate_report_pdf import generate_pdf_report
+        print(f"PDF report generated: {generate_pdf_report()}")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse the command line into the keyword arguments of main()."""
+    parser = argparse.ArgumentParser(description="Generate date validation test suites with a genetic algorithm.")
+    parser.add_argument("--instances", nargs="+", choices=list(INSTANCES), default=None,
+                        help="Instances to run (default: all)")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=None,
+                        help="Run modes (default: both)")
+    parser.add_argument("--pop-size", type=int, default=None, help="Population size (default: per instance)")
+    parser.add_argument("--generations", type=int, default=None,
+                        help="Generation budget (default: per instance)")
+    parser.add_argument("--seed", type=int, default=None, help="Base seed of the runs")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: all cores, 1 runs in-process)")
+    parser.add_argument("--csv", dest="csv_filename", default="test_cases_all.csv",
+                        help="Filename of the test case CSV file")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory of the CSV file and run statistics")
+    parser.add_argument("--images-dir", default=IMAGES_DIR, help="Directory of the coverage plots")
+    parser.add_argument("--no-plots", dest="plots", action="store_false", help="Skip the coverage plots")
+    parser.add_argument("--profile", action="store_true", help="Print and save a per-phase time breakdown")
+    parser.add_argument("--report", action="store_true", help="Generate the PDF report afterwards")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
+    main(**vars(parse_args()))
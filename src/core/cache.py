@@ -0,0 +1,156 @@
+from typing import Dict, Any, Optional
+from collections import OrderedDict
+from .test_case import TestCase, TestCaseFormat
+
+
+class TestCaseCache:
+    """
+    Bounded LRU interning cache for evaluated test cases.
+
+    Test cases are keyed on their genome and problem instance (category dictionary and
+    validator), so identical genomes share a single evaluated object instead of
+    repeating the string formatting, validation and category checks.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of test cases kept before the least recently used is evicted
+        """
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[tuple, TestCase]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """Number of cached test cases."""
+        return len(self._entries)
+
+    def _lookup(self, key: tuple) -> Optional[TestCase]:
+        """Return a cached test case and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def _store(self, key: tuple, test_case: TestCase) -> TestCase:
+        """Insert a test case, evicting the least recently used one if the cache is full."""
+        self._entries[key] = test_case
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return test_case
+
+    def get_test_case(self, day: int, month: int, year: int, category_dict=None, validator=None) -> TestCase:
+        """
+        Get the shared TestCase for a genome, evaluating it on a miss.
+
+        Args:
+            day: The day component of the date
+            month: The month component of the date
+            year: The year component of the date
+            category_dict: Dictionary mapping category names to validation functions
+            validator: The validation function to use
+
+        Returns:
+            A shared TestCase object that must not be modified
+        """
+        # Cached test cases reference the category dictionary and validator, so their ids
+        # cannot be reused by other objects while an entry is alive
+        key = (day, month, year, None, id(category_dict), id(validator))
+        entry = self._lookup(key)
+        if entry is None:
+            entry = self._store(key, TestCase(day, month, year, category_dict, validator))
+        return entry
+
+    def get_test_case_format(self, day: int, month: int, year: int, format_type: str,
+                             category_dict=None, validator=None) -> TestCaseFormat:
+        """
+        Get the shared TestCaseFormat for a genome, evaluating it on a miss.
+
+        Args:
+            day: The day component of the date
+            month: The month component of the date
+            year: The year component of the date
+            format_type: The format of the date string
+            category_dict: Dictionary mapping category names to validation functions
+            validator: The validation function to use
+
+        Returns:
+            A shared TestCaseFormat object that must not be modified
+        """
+        key = (day, month, year, format_type, id(category_dict), id(validator))
+        entry = self._lookup(key)
+        if entry is None:
+            entry = self._store(key, TestCaseFormat(day, month, year, format_type, category_dict, validator))
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dictionary with size, maxsize, hits, misses, evictions and hit_rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        """Remove all cached test cases and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+# Process-wide cache shared by the GA operators, local searches and runners
+DEFAULT_CACHE = TestCaseCache()
+
+
+def make_test_case(day: int, month: int, year: int, category_dict=None, validator=None) -> TestCase:
+    """
+    Get a shared, evaluated TestCase from the default cache.
+
+    Args:
+        day: The day component of the date
+        month: The month component of the date
+        year: The year component of the date
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+
+    Returns:
+        A shared TestCase object
+    """
+    return DEFAULT_CACHE.get_test_case(day, month, year, category_dict, validator)
+
+
+def make_test_case_format(day: int, month: int, year: int, format_type: str,
+                          category_dict=None, validator=None) -> TestCaseFormat:
+    """
+    Get a shared, evaluated TestCaseFormat from the default cache.
+
+    Args:
+        day: The day component of the date
+        month: The month component of the date
+        year: The year component of the date
+        format_type: The format of the date string
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+
+    Returns:
+        A shared TestCaseFormat object
+    """
+    return DEFAULT_CACHE.get_test_case_format(day, month, year, format_type, category_dict, validator)
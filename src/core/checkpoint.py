@@ -0,0 +1,113 @@
+from typing import List, Dict, Any
+import json
+import os
+import tempfile
+import numpy as np
+from .schema import SCHEMAS, GenomeSchema
+from .genome_index import instance_fingerprint
+
+# Bump when the checkpoint layout changes so incompatible files are rejected
+CHECKPOINT_VERSION = 2
+
+
+def _encode_genes(schema: GenomeSchema, population: List[Any]) -> Dict[str, np.ndarray]:
+    """Store each gene of the population as an integer array (categorical genes as value codes)."""
+    arrays = {}
+    for gene in schema.genes:
+        values = [getattr(ind, gene["name"]) for ind in population]
+        if "values" in gene:
+            codes = {value: i for i, value in enumerate(gene["values"])}
+            arrays["gene_" + gene["name"]] = np.array([codes[value] for value in values], dtype=np.int8)
+        else:
+            arrays["gene_" + gene["name"]] = np.array(values, dtype=np.int64)
+    return arrays
+
+
+def _decode_genomes(schema: GenomeSchema, data) -> List[tuple]:
+    """Rebuild the genome tuples stored by _encode_genes."""
+    columns = []
+    for gene in schema.genes:
+        column = data["gene_" + gene["name"]].tolist()
+        if "values" in gene:
+            column = [gene["values"][code] for code in column]
+        columns.append(column)
+    return list(zip(*columns))
+
+
+def save_checkpoint(path: str, evolution) -> None:
+    """
+    Atomically write the state of a run to a compressed .npz file.
+
+    The file holds the population genomes, coverage and duplicate histories, generation
+    and evaluation counters, the run parameters and the state of the run's RNG, so a run resumed
+    from it continues exactly as the uninterrupted run would.
+
+    Args:
+        path: Destination file
+        evolution: The Evolution to save
+    """
+    selection = evolution.params["selection"]
+    params = dict(evolution.params, selection=selection if isinstance(selection, str) else None)
+
+    arrays = _encode_genes(evolution.schema, evolution.population)
+    arrays.update(
+        version=np.array(CHECKPOINT_VERSION),
+        schema=np.array(evolution.schema.name),
+        fingerprint=np.array(instance_fingerprint(evolution.category_dict, evolution.validator)),
+        params=np.array(json.dumps(params)),
+        generation=np.array(evolution.generation),
+        evaluations=np.array(evolution.evaluations),
+        coverages=np.array(evolution.coverages, dtype=float),
+        duplicates_avoided=np.array(evolution.duplicates_avoided, dtype=np.int64),
+        rng_state=np.array(json.dumps(evolution.rng.getstate())),
+    )
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix=".npz", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_checkpoint(path: str, category_dict=None, validator=None) -> Dict[str, Any]:
+    """
+    Read a checkpoint written by save_checkpoint.
+
+    Args:
+        path: Checkpoint file
+        category_dict: Dictionary mapping category names to validation functions of the run
+        validator: The validation function of the run
+
+    Returns:
+        Dictionary with the keys schema, genomes, params, generation, evaluations,
+        coverages, duplicates_avoided and rng_state (a state for RNG.setstate)
+
+    Raises:
+        ValueError: If the file has an unsupported version or was written for a
+            different instance definition
+    """
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data["version"])
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version} in {path} "
+                             f"(expected {CHECKPOINT_VERSION})")
+        if str(data["fingerprint"]) != instance_fingerprint(category_dict, validator):
+            raise ValueError(f"Checkpoint {path} was written for a different instance definition")
+
+        schema = SCHEMAS[str(data["schema"])]
+        return {
+            "schema": schema,
+            "genomes": _decode_genomes(schema, data),
+            "params": json.loads(str(data["params"])),
+            "generation": int(data["generation"]),
+            "evaluations": int(data["evaluations"]),
+            "coverages": data["coverages"].tolist(),
+            "duplicates_avoided": data["duplicates_avoided"].tolist(),
+            "rng_state": json.loads(str(data["rng_state"])),
+        }
@@ -1,6 +1,144 @@
-from typing import List, Set, Any
-import random
+from typing import List, Set, Any, Tuple, Union, Callable, Optional
+import numpy as np
 from .test_case import TestCase, TestCaseFormat
+from .selection import get_selection
+from .schema import DATE_SCHEMA
+from .rng import RNG, make_rng
+
+class FitnessState:
+    """
+    Incremental fitness bookkeeping for a population of test cases.
+
+    Works on integer category masks: the union of all masks gives the covered
+    categories and the sum of their popcounts the total number of category hits.
+    Per-category hit counts are built on the first single-individual replacement
+    query, so the fitness and coverage of a replacement can be answered from the
+    categories involved, without copying the population.
+    """
+
+    def __init__(self, population: List[Any]):
+        """
+        Initialize the state from a population.
+
+        Args:
+            population: List of TestCase or TestCaseFormat objects
+        """
+        self.population = list(population)
+        self.masks = [ind.category_mask for ind in self.population]
+        self.covered_mask = 0  # Union of all category masks
+        for mask in self.masks:
+            self.covered_mask |= mask
+        self.total_hits = sum(mask.bit_count() for mask in self.masks)
+        self._hits = None  # Bit -> number of individuals covering it, built on demand
+        self._single_mask = 0  # Categories covered by exactly one individual
+
+    @property
+    def hits(self) -> List[int]:
+        """Number of individuals covering each category, indexed by category bit."""
+        if self._hits is None:
+            self._hits = [0] * self.covered_mask.bit_length()
+            for mask in self.masks:
+                while mask:
+                    low = mask & -mask
+                    self._hits[low.bit_length() - 1] += 1
+                    mask ^= low
+            self._single_mask = sum(1 << bit for bit, count in enumerate(self._hits) if count == 1)
+        return self._hits
+
+    def _update_hits(self, mask: int, delta: int):
+        """Add delta to the hit count of each category of a mask."""
+        hits = self.hits
+        while mask:
+            low = mask & -mask
+            bit = low.bit_length() - 1
+            if bit >= len(hits):
+                hits.extend([0] * (bit + 1 - len(hits)))
+            hits[bit] += delta
+            count = hits[bit]
+            self.covered_mask = self.covered_mask | low if count else self.covered_mask & ~low
+            self._single_mask = self._single_mask | low if count == 1 else self._single_mask & ~low
+            mask ^= low
+
+    @property
+    def covered_count(self) -> int:
+        """Number of distinct categories covered by the population."""
+        return self.covered_mask.bit_count()
+
+    @property
+    def redundant_count(self) -> int:
+        """Number of category hits beyond the first hit of each category."""
+        return self.total_hits - self.covered_mask.bit_count()
+
+    def covered_categories(self) -> Set[str]:
+        """
+        Get the categories covered by the population.
+
+        Returns:
+            Set of covered category names
+        """
+        if not self.population:
+            return set()
+        return set(self.population[0]._context.names(self.covered_mask))
+
+    def fitness(self, i: int) -> float:
+        """
+        Get the fitness of a single individual.
+
+        Args:
+            i: Index of the individual
+
+        Returns:
+            Fitness value of the individual
+        """
+        return self.masks[i].bit_count() / (1 + self.redundant_count)
+
+    def fitness_values(self) -> List[float]:
+        """
+        Get the fitness of every individual.
+
+        Returns:
+            List of fitness values corresponding to each test case
+        """
+        denominator = 1 + self.redundant_count
+        return [mask.bit_count() / denominator for mask in self.masks]
+
+    def evaluate_replacement(self, i: int, neighbor: Any) -> Tuple[float, int]:
+        """
+        Evaluate replacing individual i by a neighbor without modifying the state.
+
+        Args:
+            i: Index of the individual to replace
+            neighbor: Candidate test case
+
+        Returns:
+            Tuple of (fitness, covered_count) the neighbor and the population would have
+        """
+        self.hits  # Make sure the single-hit mask is built
+        old_mask, new_mask = self.masks[i], neighbor.category_mask
+
+        lost = (old_mask & ~new_mask & self._single_mask).bit_count()
+        gained = (new_mask & ~old_mask & ~self.covered_mask).bit_count()
+        covered_count = self.covered_mask.bit_count() - lost + gained
+        new_count = new_mask.bit_count()
+        total_hits = self.total_hits - old_mask.bit_count() + new_count
+
+        return new_count / (1 + total_hits - covered_count), covered_count
+
+    def replace(self, i: int, neighbor: Any):
+        """
+        Replace individual i by a neighbor and update the state.
+
+        Args:
+            i: Index of the individual to replace
+            neighbor: Replacement test case
+        """
+        old_mask, new_mask = self.masks[i], neighbor.category_mask
+        self._update_hits(old_mask & ~new_mask, -1)
+        self._update_hits(new_mask & ~old_mask, 1)
+        self.total_hits += new_mask.bit_count() - old_mask.bit_count()
+        self.population[i] = neighbor
+        self.masks[i] = new_mask
+
 
 def calculate_fitness(population: List[TestCase]) -> List[float]:
     """
@@ -12,26 +150,7 @@ def calculate_fitness(population: List[TestCase]) -> List[float]:
     Returns:
         List of fitness values corresponding to each test case
     """
-    covered_categories = set()
-    redundant_count = 0
-    
-    # First pass to calculate coverage metrics
-    for ind in population:
-        new_cats = set(ind.categories) - covered_categories
-        covered_categories.update(new_cats)
-        redundant_count += len(set(ind.categories) & covered_categories) - len(new_cats)
-    
-    # Second pass to calculate fitness for each individual
-    fitness = []
-    for ind in population:
-        unique_cats = set(ind.categories) - (covered_categories - set(ind.categories))
-        if 1 + redundant_count > 0:
-            ind_fitness = len(unique_cats) / (1 + redundant_count)
-        else:
-            ind_fitness = len(unique_cats)
-        fitness.append(ind_fitness)
-    
-    return fitness
+    return FitnessState(population).fitness_values()
 
 def calculate_fitness_instance_4(population: List[TestCaseFormat], category_dict=None) -> List[float]:
     """
@@ -44,78 +163,56 @@ def calculate_fitness_instance_4(population: List[TestCaseFormat], category_dict
     Returns:
         List of fitness values corresponding to each test case
     """
-    covered_categories = set()
-    redundant_count = 0
-    
-    # First pass to calculate coverage metrics
-    for ind in population:
-        new_cats = set(ind.categories) - covered_categories
-        covered_categories.update(new_cats)
-        redundant_count += len(set(ind.categories) & covered_categories) - len(new_cats)
-    
-    # Second pass to calculate fitness for each individual
-    fitness = []
-    for ind in population:
-        unique_cats = set(ind.categories) - (covered_categories - set(ind.categories))
-        if 1 + redundant_count > 0:
-            ind_fitness = len(unique_cats) / (1 + redundant_count)
-        else:
-            ind_fitness = len(unique_cats)
-        fitness.append(ind_fitness)
-    
-    return fitness
+    return FitnessState(population).fitness_values()
 
-def select_parents(population: List[Any], fitness: List[float], num_parents: int) -> List[Any]:
+def select_parents(population: List[Any], fitness: List[float], num_parents: int,
+                   selection: Union[str, Callable] = "truncation", rng: Optional[RNG] = None) -> List[Any]:
     """
     Select parent test cases for reproduction based on fitness.
     
     Args:
         population: List of test case objects
-        fitness: List of fitness values corresponding to each test case
+        fitness: List or array of fitness values corresponding to each test case
         num_parents: Number of parents to select
+        selection: Selection strategy name ("truncation", "tournament" or "sus") or callable,
+            see src/core/selection.py
+        rng: RNG context used by stochastic strategies
         
     Returns:
         List of selected parent test cases
     """
-    ranked = sorted(zip(population, fitness), key=lambda x: x[1], reverse=True)
-    return [ind for ind, _ in ranked[:num_parents]]
+    indices = get_selection(selection)(fitness, num_parents, rng.generator if rng else None)
+    return [population[i] for i in np.asarray(indices).tolist()]
 
-def crossover(parent1: TestCase, parent2: TestCase) -> TestCase:
+def crossover(parent1: TestCase, parent2: TestCase, rng: Optional[RNG] = None) -> TestCase:
     """
     Perform crossover between two parent test cases.
     
     Args:
         parent1: First parent test case
         parent2: Second parent test case
+        rng: RNG context (derived from the random module if omitted)
         
     Returns:
         New test case resulting from crossover
     """
-    day = random.choice([parent1.day, parent2.day])
-    month = random.choice([parent1.month, parent2.month])
-    year = random.choice([parent1.year, parent2.year])
+    columns = DATE_SCHEMA.crossover_columns(DATE_SCHEMA.columns([parent1]), DATE_SCHEMA.columns([parent2]),
+                                            make_rng(rng))
     
     # Pass the category dictionary and validator from parent1
-    return TestCase(day, month, year, parent1.category_dict, parent1.validator)
+    return DATE_SCHEMA.build(DATE_SCHEMA.genomes(columns)[0], parent1.category_dict, parent1.validator)
 
-def mutate(individual: TestCase, mutation_rate: float = 0.15) -> TestCase:
+def mutate(individual: TestCase, mutation_rate: float = 0.15, rng: Optional[RNG] = None) -> TestCase:
     """
     Mutate a test case.
     
     Args:
         individual: The test case to mutate
         mutation_rate: Probability of mutation for each component
+        rng: RNG context (derived from the random module if omitted)
         
     Returns:
         Mutated test case
     """
-    day, month, year = individual.day, individual.month, individual.year
-    
-    if random.random() < mutation_rate:
-        day = random.choice([1, 28, 29, 30, 31, random.randint(32, 40)])
-    if random.random() < mutation_rate:
-        month = random.choice([1, 2, 4, 6, 9, 11, 12, random.randint(13, 15)])
-    if random.random() < mutation_rate:
-        year = random.choice([0, 9999, 2020, 2021, random.randint(0, 9999)])
-    
-    return TestCase(day, month, year, individual.category_dict, individual.validator)
+    columns = DATE_SCHEMA.mutate_columns(DATE_SCHEMA.columns([individual]), make_rng(rng), mutation_rate)
+    return DATE_SCHEMA.build(DATE_SCHEMA.genomes(columns)[0], individual.category_dict, individual.validator)
@@ -1,9 +1,15 @@
-from typing import List, Dict, Any, Tuple, Set
-import random
-from .test_case import TestCase, TestCaseFormat, initialize_population, initialize_population_instance_4
-from .fitness import calculate_fitness, calculate_fitness_instance_4, select_parents, crossover, mutate
+from typing import List, Dict, Any, Tuple, Set, Union, Callable, Optional
+import heapq
+from .test_case import TestCase, TestCaseFormat, InstanceContext, validate_population
+from .cache import make_test_case, make_test_case_format
+from .fitness import FitnessState, calculate_fitness, select_parents
+from .schema import GenomeSchema, DATE_SCHEMA, DATE_FORMAT_SCHEMA
+from .checkpoint import save_checkpoint, load_checkpoint
+from .rng import RNG, make_rng
+from .profiling import RunStats, NULL_STATS
 
-def local_search(population: List[TestCase], category_dict=None, validator=None, iterations=5) -> List[TestCase]:
+def local_search(population: List[TestCase], category_dict=None, validator=None, iterations=5,
+                 rng: Optional[RNG] = None) -> List[TestCase]:
     """
     Apply local search to refine a population of test cases.
     
@@ -12,46 +18,63 @@ def local_search(population: List[TestCase], category_dict=None, validator=None,
         category_dict: Dictionary mapping category names to validation functions
         validator: The validation function to use
         iterations: Number of iterations for each test case
+        rng: RNG context (derived from the random module if omitted)
         
     Returns:
         Refined list of TestCase objects
     """
-    refined_population = population.copy()
+    # Incremental fitness state over the population being refined
+    state = FitnessState(population)
+    refined_population = state.population
     
     # Calculate initial coverage to identify missing categories
-    covered_categories = set()
-    for ind in refined_population:
-        covered_categories.update(ind.categories)
-    
-    all_categories = set(category_dict.keys() if category_dict else [])
-    missing_categories = all_categories - covered_categories
+    context = InstanceContext.get(category_dict, validator)
+    missing_mask = context.all_mask & ~state.covered_mask
+
+    # Categories that bias the perturbations while they are missing
+    invalid_month_mask = context.mask_where(lambda cat: "Invalid Month > 12" in cat)
+    invalid_day_mask = context.mask_where(lambda cat: "Invalid Day > 31" in cat)
+    min_year_mask = context.mask_where(lambda cat: "Boundary Min Year" in cat)
+    max_year_mask = context.mask_where(lambda cat: "Boundary Max Year" in cat)
+    feb_29_mask = context.mask_where(lambda cat: "Invalid Feb 29" in cat)
+    leap_year_mask = context.mask_where(lambda cat: "Valid Leap Year" in cat)
+
+    # Draw the perturbations of every iteration of every individual at once
+    rng = make_rng(rng)
+    shape = (len(refined_population), iterations)
+    day_steps = rng.choice([-1, 0, 1], shape).tolist()
+    month_steps = rng.choice([-1, 0, 1], shape).tolist()
+    year_steps = rng.choice([-1, 0, 1, -100, 100], shape).tolist()
+    invalid_months = rng.randint(13, 15, shape).tolist()
+    invalid_days = rng.randint(32, 40, shape).tolist()
+    non_leap_years = rng.choice([1900, 2021], shape).tolist()
 
     for i in range(len(refined_population)):
         current = refined_population[i]
-        best_fitness = calculate_fitness(refined_population)[i]
+        best_fitness = state.fitness(i)
         
-        for _ in range(iterations):
+        for j in range(iterations):
             # Generate a neighbor by perturbing day, month, or year
-            day = current.day + random.choice([-1, 0, 1])
-            month = current.month + random.choice([-1, 0, 1])
-            year = current.year + random.choice([-1, 0, 1, -100, 100])
+            day = current.day + day_steps[i][j]
+            month = current.month + month_steps[i][j]
+            year = current.year + year_steps[i][j]
             
             # If there are missing categories, bias perturbations towards them
-            if missing_categories:
+            if missing_mask:
                 # Example: Bias towards invalid months (>12) or invalid days (>31) for certain categories
-                if any("Invalid Month > 12" in cat for cat in missing_categories):
-                    month = random.randint(13, 15)
-                if any("Invalid Day > 31" in cat for cat in missing_categories):
-                    day = random.randint(32, 40)
-                if any("Boundary Min Year" in cat for cat in missing_categories):
+                if missing_mask & invalid_month_mask:
+                    month = invalid_months[i][j]
+                if missing_mask & invalid_day_mask:
+                    day = invalid_days[i][j]
+                if missing_mask & min_year_mask:
                     year = 0
-                if any("Boundary Max Year" in cat for cat in missing_categories):
+                if missing_mask & max_year_mask:
                     year = 9999
-                if any("Invalid Feb 29" in cat for cat in missing_categories):
+                if missing_mask & feb_29_mask:
                     month = 2
                     day = 29
-                    year = random.choice([1900, 2021])  # Non-leap years
-                if any("Valid Leap Year" in cat for cat in missing_categories):
+                    year = non_leap_years[i][j]  # Non-leap years
+                if missing_mask & leap_year_mask:
                     month = 2
                     day = 29
                     year = 2020  # Leap year
@@ -61,31 +84,25 @@ def local_search(population: List[TestCase], category_dict=None, validator=None,
             month = max(1, min(15, month))
             year = max(0, min(9999, year))
             
-            neighbor = TestCase(day, month, year, category_dict, validator)
+            neighbor = make_test_case(day, month, year, category_dict, validator)
             
-            # Replace the current individual in the population temporarily
-            temp_population = refined_population.copy()
-            temp_population[i] = neighbor
-            neighbor_fitness = calculate_fitness(temp_population)[i]
+            # Evaluate the neighbor in place of the current individual
+            neighbor_fitness, temp_covered_count = state.evaluate_replacement(i, neighbor)
             
             # Check if the neighbor improves overall coverage
-            temp_covered = set()
-            for ind in temp_population:
-                temp_covered.update(ind.categories)
-            
-            temp_coverage = len(temp_covered) / len(category_dict if category_dict else []) * 100 if category_dict else 0
-            current_coverage = len(covered_categories) / len(category_dict if category_dict else []) * 100 if category_dict else 0
+            temp_coverage = temp_covered_count / len(category_dict) * 100 if category_dict else 0
+            current_coverage = state.covered_count / len(category_dict) * 100 if category_dict else 0
             
             # Keep the neighbor if it improves fitness or coverage
             if neighbor_fitness > best_fitness or temp_coverage > current_coverage:
-                refined_population[i] = neighbor
+                state.replace(i, neighbor)
                 best_fitness = neighbor_fitness
-                covered_categories = temp_covered  # Update covered categories
-                missing_categories = all_categories - covered_categories  # Update missing categories
+                missing_mask = context.all_mask & ~state.covered_mask  # Update missing categories
     
     return refined_population
 
-def local_search_instance_4(population: List[TestCaseFormat], category_dict=None, validator=None, iterations=5) -> List[TestCaseFormat]:
+def local_search_instance_4(population: List[TestCaseFormat], category_dict=None, validator=None, iterations=5,
+                            rng: Optional[RNG] = None) -> List[TestCaseFormat]:
     """
     Apply local search to refine a population of format-specific test cases.
     
@@ -94,135 +111,480 @@ def local_search_instance_4(population: List[TestCaseFormat], category_dict=None
         category_dict: Dictionary mapping category names to validation functions
         validator: The validation function to use
         iterations: Number of iterations for each test case
+        rng: RNG context (derived from the random module if omitted)
         
     Returns:
         Refined list of TestCaseFormat objects
     """
-    refined_population = population.copy()
+    # Incremental fitness state over the population being refined
+    state = FitnessState(population)
+    refined_population = state.population
     
     # Calculate initial coverage to identify missing categories
-    covered_categories = set()
-    for ind in refined_population:
-        covered_categories.update(ind.categories)
-    
-    all_categories = set(category_dict.keys() if category_dict else [])
-    missing_categories = all_categories - covered_categories
+    context = InstanceContext.get(category_dict, validator)
+    missing_mask = context.all_mask & ~state.covered_mask
 
     formats = ["DD/MM/YYYY", "MM/DD/YYYY", "YYYY/MM/DD"]
+    ambiguous_mask = context.mask_where(lambda cat: cat == "Invalid Ambiguous")
+    
+    # Draw the perturbations of every iteration of every individual at once
+    rng = make_rng(rng)
+    shape = (len(refined_population), iterations)
+    day_steps = rng.choice([-1, 0, 1], shape).tolist()
+    month_steps = rng.choice([-1, 0, 1], shape).tolist()
+    year_steps = rng.choice([-1, 0, 1, -100, 100], shape).tolist()
+    ambiguous_days = rng.randint(1, 12, shape).tolist()
+    ambiguous_months = rng.randint(1, 12, shape).tolist()
+    ambiguous_formats = rng.choice(formats[:2], shape).tolist()
+    random_formats = rng.choice(formats, shape).tolist()
     
     for i in range(len(refined_population)):
         current = refined_population[i]
-        best_fitness = calculate_fitness_instance_4(refined_population)[i]
+        best_fitness = state.fitness(i)
         
-        for _ in range(iterations):
+        for j in range(iterations):
             # Generate a neighbor by perturbing day, month, year, or format
-            day = current.day + random.choice([-1, 0, 1])
-            month = current.month + random.choice([-1, 0, 1])
-            year = current.year + random.choice([-1, 0, 1, -100, 100])
+            day = current.day + day_steps[i][j]
+            month = current.month + month_steps[i][j]
+            year = current.year + year_steps[i][j]
             
             # Bias towards missing categories
-            if missing_categories:
-                if "Invalid Ambiguous" in missing_categories:
-                    day = random.randint(1, 12)  # Ambiguous dates (e.g., 05/06 or 06/05)
-                    month = random.randint(1, 12)
-                    format_type = random.choice(["DD/MM/YYYY", "MM/DD/YYYY"])
-                else:
-                    format_type = random.choice(formats)
+            if missing_mask & ambiguous_mask:
+                day = ambiguous_days[i][j]  # Ambiguous dates (e.g., 05/06 or 06/05)
+                month = ambiguous_months[i][j]
+                format_type = ambiguous_formats[i][j]
             else:
-                format_type = random.choice(formats)
+                format_type = random_formats[i][j]
             
             # Ensure values are within valid ranges
             day = max(1, min(40, day))
             month = max(1, min(15, month))
             year = max(0, min(9999, year))
             
-            neighbor = TestCaseFormat(day, month, year, format_type, category_dict, validator)
+            neighbor = make_test_case_format(day, month, year, format_type, category_dict, validator)
             
-            # Replace the current individual in the population temporarily
-            temp_population = refined_population.copy()
-            temp_population[i] = neighbor
-            neighbor_fitness = calculate_fitness_instance_4(temp_population)[i]
+            # Evaluate the neighbor in place of the current individual
+            neighbor_fitness, temp_covered_count = state.evaluate_replacement(i, neighbor)
             
             # Check if the neighbor improves overall coverage
-            temp_covered = set()
-            for ind in temp_population:
-                temp_covered.update(ind.categories)
-            
-            temp_coverage = len(temp_covered) / len(category_dict if category_dict else []) * 100 if category_dict else 0
-            current_coverage = len(covered_categories) / len(category_dict if category_dict else []) * 100 if category_dict else 0
+            temp_coverage = temp_covered_count / len(category_dict) * 100 if category_dict else 0
+            current_coverage = state.covered_count / len(category_dict) * 100 if category_dict else 0
             
             # Keep the neighbor if it improves fitness or coverage
             if neighbor_fitness > best_fitness or temp_coverage > current_coverage:
-                refined_population[i] = neighbor
+                state.replace(i, neighbor)
                 best_fitness = neighbor_fitness
-                covered_categories = temp_covered  # Update covered categories
-                missing_categories = all_categories - covered_categories  # Update missing categories
+                missing_mask = context.all_mask & ~state.covered_mask  # Update missing categories
     
     return refined_population
 
-def genetic_algorithm(
-    pop_size: int = 50, 
-    generations: int = 100, 
-    category_dict=None,
-    validator=None,
-    use_local_search=False, 
-    instance_name="Original",
-    force_full_generations=False
-) -> Tuple[List[TestCase], List[float]]:
+def population_mask(population: List[Any]) -> int:
     """
-    Run the genetic algorithm to generate test cases.
+    Calculate the category mask covered by a population.
+
+    Args:
+        population: List of test case objects
+
+    Returns:
+        Bitwise OR of the category masks of all individuals
+    """
+    covered_mask = 0
+    for ind in population:
+        covered_mask |= ind.category_mask
+    return covered_mask
+
+def population_coverage(population: List[Any], category_dict=None) -> Tuple[Set[str], float]:
+    """
+    Calculate the categories covered by a population.
     
     Args:
+        population: List of test case objects
+        category_dict: Dictionary mapping category names to validation functions
+        
+    Returns:
+        Tuple of (covered, coverage) where covered is the set of covered category names
+        and coverage is the percentage of categories covered
+    """
+    covered_mask = population_mask(population)
+    covered = set(population[0]._context.names(covered_mask)) if population else set()
+    
+    coverage = covered_mask.bit_count() / len(category_dict) * 100 if category_dict else 0
+    return covered, coverage
+
+def breed_generation(population: List[Any], pop_size: int, schema: GenomeSchema,
+                     category_dict=None, validator=None,
+                     selection: Union[str, Callable] = "truncation",
+                     mutation_rate: float = 0.15, rng: Optional[RNG] = None,
+                     unique_genomes: bool = False, stats=NULL_STATS,
+                     parent_fraction: float = 0.5) -> Tuple[List[Any], List[Any], int]:
+    """
+    Select the parents of the next generation and build their offspring.
+    
+    Args:
+        population: Current list of test case objects
         pop_size: Size of the population
-        generations: Maximum number of generations
+        schema: Genome schema of the population
         category_dict: Dictionary mapping category names to validation functions
         validator: The validation function to use
-        use_local_search: Whether to apply local search to refine the population
-        instance_name: Name of the problem instance
-        force_full_generations: Whether to run all generations regardless of coverage
+        selection: Parent selection strategy name or callable
+        mutation_rate: Probability of mutation for each gene
+        rng: RNG context (derived from the random module if omitted)
+        unique_genomes: Whether the next generation must consist of distinct genomes.
+            Parents selected more than once are kept once, and offspring duplicating a
+            parent or another offspring are replaced before they are built
+        stats: RunStats receiving the fitness, selection and offspring phase timings
+        parent_fraction: Fraction of the population selected as parents
         
     Returns:
-        Tuple of (population, coverages) where population is the final list of TestCase objects
-        and coverages is a list of coverage values per generation
+        Tuple of (parents, offspring, duplicates_avoided)
     """
-    population = initialize_population(pop_size, category_dict, validator)
-    coverages = []  # List to store coverage values per generation
-
-    for gen in range(generations):
+    rng = make_rng(rng)
+    with stats.phase("fitness"):
         fitness = calculate_fitness(population)
-        parents = select_parents(population, fitness, pop_size // 2)
-        offspring = []
+    with stats.phase("selection"):
+        parents = select_parents(population, fitness, int(pop_size * parent_fraction), selection, rng)
+    with stats.phase("offspring"):
+        parents, genomes, duplicates_avoided = _breed_genomes(parents, pop_size, schema, rng,
+                                                              mutation_rate, unique_genomes)
+        offspring = [schema.build(genome, category_dict, validator) for genome in genomes]
+    
+    return parents, offspring, duplicates_avoided
+
+def _breed_genomes(parents: List[Any], pop_size: int, schema: GenomeSchema, rng: RNG,
+                   mutation_rate: float, unique_genomes: bool) -> Tuple[List[Any], List[tuple], int]:
+    """Breed the offspring genomes of a generation; see breed_generation."""
+    duplicates_avoided = 0
+    if unique_genomes:
+        # Genome hash index of the generation, seeded with the distinct parents
+        index = {}
+        for parent in parents:
+            index.setdefault(schema.genome(parent), parent)
+        duplicates_avoided = len(parents) - len(index)
+        parents = list(index.values())
+        genomes, duplicate_offspring = schema.breed_unique(parents, pop_size - len(parents), rng,
+                                                           mutation_rate, set(index))
+        duplicates_avoided += duplicate_offspring
+    else:
+        genomes = schema.breed(parents, pop_size - len(parents), rng, mutation_rate)
+    return parents, genomes, duplicates_avoided
+
+def next_generation_schema(population: List[Any], pop_size: int, schema: GenomeSchema,
+                           category_dict=None, validator=None,
+                           selection: Union[str, Callable] = "truncation",
+                           mutation_rate: float = 0.15, rng: Optional[RNG] = None,
+                           unique_genomes: bool = False) -> List[Any]:
+    """
+    Produce the next generation of test cases for any genome schema.
+    
+    The random draws of the whole generation are made in bulk, and each offspring is
+    built, and therefore evaluated, exactly once.
+    
+    Args:
+        population: Current list of test case objects
+        pop_size: Size of the population
+        schema: Genome schema of the population
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        selection: Parent selection strategy name or callable
+        mutation_rate: Probability of mutation for each gene
+        rng: RNG context (derived from the random module if omitted)
+        unique_genomes: Whether the next generation must consist of distinct genomes
         
-        for _ in range(pop_size - len(parents)):
-            p1, p2 = random.sample(parents, 2)
-            child = crossover(p1, p2)
-            child = mutate(child)
-            offspring.append(child)
+    Returns:
+        The next generation: the selected parents followed by their offspring
+    """
+    parents, offspring, _ = breed_generation(population, pop_size, schema, category_dict, validator,
+                                             selection, mutation_rate, rng, unique_genomes)
+    return parents + offspring
+
+def next_generation(population: List[TestCase], pop_size: int,
+                    selection: Union[str, Callable] = "truncation", rng: Optional[RNG] = None) -> List[TestCase]:
+    """
+    Produce the next generation of test cases.
+    
+    Args:
+        population: Current list of TestCase objects
+        pop_size: Size of the population
+        selection: Parent selection strategy name or callable
+        rng: RNG context (derived from the random module if omitted)
         
-        population = parents + offspring
+    Returns:
+        The next generation: the selected parents followed by their offspring
+    """
+    context = population[0]
+    return next_generation_schema(population, pop_size, DATE_SCHEMA, context.category_dict, context.validator,
+                                  selection, rng=rng)
+
+def next_generation_instance_4(population: List[TestCaseFormat], pop_size: int,
+                               category_dict=None, validator=None,
+                               selection: Union[str, Callable] = "truncation",
+                               rng: Optional[RNG] = None) -> List[TestCaseFormat]:
+    """
+    Produce the next generation of format-specific test cases.
+    
+    Args:
+        population: Current list of TestCaseFormat objects
+        pop_size: Size of the population
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        selection: Parent selection strategy name or callable
+        rng: RNG context (derived from the random module if omitted)
         
+    Returns:
+        The next generation: the selected parents followed by their offspring
+    """
+    return next_generation_schema(population, pop_size, DATE_FORMAT_SCHEMA, category_dict, validator, selection,
+                                  rng=rng)
+
+class Evolution:
+    """
+    Step-by-step genetic algorithm run that can be iterated generation by generation.
+
+    Iterating yields one snapshot dictionary per generation with the keys:
+        generation: Number of the generation (starting at 1)
+        coverage: Coverage percentage of the generation
+        new_categories: Sorted categories covered now but not by the previous generation
+        best: The num_best test cases with the most categories (the fittest individuals)
+        evaluations: Total number of individuals built so far, including the initial population
+        duplicates_avoided: Number of duplicate genomes replaced before evaluation in this
+            generation (always 0 unless unique_genomes is set)
+
+    Between generations the consumer can stop the run (stop() or simply leaving the
+    loop), change parameters (update()) or save the population. Iteration ends after
+    the generation budget, after stop(), or once coverage reaches the target unless
+    force_full_generations is set.
+    """
+
+    PARAMS = ("pop_size", "generations", "selection", "mutation_rate", "target_coverage",
+              "force_full_generations", "num_best", "unique_genomes", "parent_fraction")
+
+    def __init__(
+        self,
+        schema: GenomeSchema,
+        pop_size: int = 50,
+        generations: int = 100,
+        category_dict=None,
+        validator=None,
+        selection: Union[str, Callable] = "truncation",
+        mutation_rate: float = 0.15,
+        target_coverage: float = 95,
+        force_full_generations=False,
+        num_best: int = 5,
+        unique_genomes: bool = False,
+        parent_fraction: float = 0.5,
+        population: Optional[List[Any]] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_interval: int = 5,
+        rng: Union[None, int, RNG] = None,
+        stats: Optional[RunStats] = None
+    ):
+        """
+        Initialize a run and its initial population.
+
+        Args:
+            schema: Genome schema (DATE_SCHEMA or DATE_FORMAT_SCHEMA)
+            pop_size: Size of the population
+            generations: Maximum number of generations
+            category_dict: Dictionary mapping category names to validation functions
+            validator: The validation function to use
+            selection: Parent selection strategy name or callable
+            mutation_rate: Probability of mutation for each gene
+            target_coverage: Coverage percentage at which the run terminates
+            force_full_generations: Whether to run all generations regardless of coverage
+            num_best: Number of best individuals included in each snapshot
+            unique_genomes: Whether every generation must consist of distinct genomes
+            parent_fraction: Fraction of the population selected as parents each generation
+            population: Initial population (a new one is initialized if omitted)
+            checkpoint_path: File the run is checkpointed to (None disables checkpointing)
+            checkpoint_interval: Number of generations between checkpoints
+            rng: RNG context or seed of the run (derived from the random module if omitted)
+            stats: RunStats collecting per-phase timings (None disables instrumentation)
+        """
+        self.schema = schema
+        self.stats = stats if stats is not None else NULL_STATS
+        self.rng = make_rng(rng)
+        self.category_dict = category_dict
+        self.validator = validator
+        self.params = {}
+        self.update(pop_size=pop_size, generations=generations, selection=selection,
+                    mutation_rate=mutation_rate, target_coverage=target_coverage,
+                    force_full_generations=force_full_generations, num_best=num_best,
+                    unique_genomes=unique_genomes, parent_fraction=parent_fraction)
+
+        with self.stats.phase("initialization"):
+            if population is None:
+                population = schema.initialize_population(pop_size, category_dict, validator, self.rng,
+                                                          unique_genomes)
+            self.population = population
+            self._prevalidate(population)
+            self.covered_mask = population_mask(population)
+        self.generation = 0
+        self.coverages = []  # List to store coverage values per generation
+        self.duplicates_avoided = []  # Duplicate genomes replaced before evaluation per generation
+        self.evaluations = len(population)
+        self.stopped = False
+        self.target_reached = False
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+
+    @classmethod
+    def from_checkpoint(cls, path: str, category_dict=None, validator=None, **params) -> "Evolution":
+        """
+        Restore a run saved with save(), including the state of its RNG.
+
+        Iterating the restored run continues exactly as the original run would have.
+
+        Args:
+            path: Checkpoint file
+            category_dict: Dictionary mapping category names to validation functions of the run
+            validator: The validation function of the run
+            **params: Parameters overriding the saved ones, plus optionally checkpoint_path
+                (defaults to path) and checkpoint_interval
+
+        Returns:
+            The restored Evolution
+        """
+        state = load_checkpoint(path, category_dict, validator)
+        schema = state["schema"]
+        population = [schema.build(genome, category_dict, validator) for genome in state["genomes"]]
+        params = dict(state["params"], **params)
+        params.setdefault("checkpoint_path", path)
+        if params["selection"] is None:
+            raise ValueError("The run used a custom selection function; pass it as selection=")
+
+        evolution = cls(schema, category_dict=category_dict, validator=validator, population=population, **params)
+        evolution.generation = state["generation"]
+        evolution.evaluations = state["evaluations"]
+        evolution.coverages = state["coverages"]
+        evolution.duplicates_avoided = state["duplicates_avoided"]
+        evolution.target_reached = bool(evolution.coverages) and evolution.coverages[-1] >= params["target_coverage"]
+        evolution.rng.setstate(state["rng_state"])
+        return evolution
+
+    def save(self, path: Optional[str] = None):
+        """
+        Checkpoint the run, including the state of its RNG.
+
+        Args:
+            path: Checkpoint file (defaults to checkpoint_path)
+        """
+        save_checkpoint(path or self.checkpoint_path, self)
+
+    def update(self, **params):
+        """
+        Change run parameters; they apply from the next generation on.
+
+        Args:
+            **params: New values for any of pop_size, generations, selection, mutation_rate,
+                target_coverage, force_full_generations, num_best, unique_genomes and
+                parent_fraction
+        """
+        unknown = set(params) - set(self.PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown parameter(s): {', '.join(sorted(unknown))}")
+        self.params.update(params)
+
+    def _prevalidate(self, test_cases: List[Any]):
+        """Validate new test cases in one batch if the validator brings its own batch method."""
+        # Validator adapters such as AsyncValidator expose strings(); plain functions stay lazy
+        validator = InstanceContext.get(self.category_dict, self.validator).validator
+        if getattr(validator, "strings", None) is not None:
+            validate_population(test_cases)
+
+    def stop(self):
+        """Stop the run before the next generation."""
+        self.stopped = True
+
+    @property
+    def finished(self) -> bool:
+        """Whether the run has ended."""
+        params = self.params
+        return (self.stopped or self.generation >= params["generations"]
+                or (self.target_reached and not params["force_full_generations"]))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self.finished:
+            raise StopIteration
+        return self.step()
+
+    def step(self) -> Dict[str, Any]:
+        """
+        Evolve the population by one generation.
+
+        Returns:
+            The snapshot of the new generation
+        """
+        params = self.params
+        stats = self.stats
+        stats.start_generation()
+        parents, offspring, duplicates_avoided = breed_generation(
+            self.population, params["pop_size"], self.schema, self.category_dict, self.validator,
+            params["selection"], params["mutation_rate"], self.rng, params["unique_genomes"], stats,
+            params["parent_fraction"])
+        with stats.phase("evaluation"):
+            for ind in offspring:
+                ind.category_mask
+        with stats.phase("validation"):
+            self._prevalidate(offspring)
+        self.population = parents + offspring
+        self.generation += 1
+        self.evaluations += len(offspring)
+        self.duplicates_avoided.append(duplicates_avoided)
+
         # Calculate coverage for the current generation
-        covered = set()
-        for ind in population:
-            covered.update(ind.categories)
-        
-        coverage = len(covered) / len(category_dict) * 100 if category_dict else 0
-        coverages.append(coverage)  # Store the coverage for this generation
-        
-        if coverage >= 95 and not force_full_generations:
-            print(f"Terminated at generation {gen + 1} with {coverage:.2f}% coverage")
-            break
+        with stats.phase("coverage"):
+            covered_mask = population_mask(self.population)
+            new_mask = covered_mask & ~self.covered_mask
+            new_categories = sorted(InstanceContext.get(self.category_dict, self.validator).names(new_mask))
+            self.covered_mask = covered_mask
+            coverage = covered_mask.bit_count() / len(self.category_dict) * 100 if self.category_dict else 0
+            self.coverages.append(coverage)  # Store the coverage for this generation
+            self.target_reached = coverage >= params["target_coverage"]
+
+            # Fitness is proportional to the number of categories, so this ranks by fitness
+            best = heapq.nlargest(params["num_best"], self.population,
+                                  key=lambda ind: ind.category_mask.bit_count())
+
+        if self.checkpoint_path and self.generation % self.checkpoint_interval == 0:
+            with stats.phase("checkpoint"):
+                self.save()
+        stats.end_generation()
+        return {
+            "generation": self.generation,
+            "coverage": coverage,
+            "new_categories": new_categories,
+            "best": best,
+            "evaluations": self.evaluations,
+            "duplicates_avoided": duplicates_avoided,
+        }
+
+def _complete_run(evolution: Evolution, use_local_search=False,
+                  local_search_iterations: int = 5) -> Tuple[List[Any], List[float]]:
+    """Iterate a run to the end and apply local search if enabled."""
+    category_dict, validator = evolution.category_dict, evolution.validator
+    for snapshot in evolution:
+        if evolution.target_reached and not evolution.params["force_full_generations"]:
+            print(f"Terminated at generation {snapshot['generation']} with {snapshot['coverage']:.2f}% coverage")
+    if evolution.params["unique_genomes"]:
+        print(f"Duplicate genomes avoided: {sum(evolution.duplicates_avoided)} "
+              f"over {len(evolution.duplicates_avoided)} generations")
+    population, coverages = evolution.population, list(evolution.coverages)
     
     # Apply local search if enabled
     if use_local_search:
-        population = local_search(population, category_dict, validator)
-        
-        # Recalculate coverage after local search
-        covered = set()
-        for ind in population:
-            covered.update(ind.categories)
-        
-        coverage = len(covered) / len(category_dict) * 100 if category_dict else 0
+        with evolution.stats.phase("local_search"):
+            if evolution.schema.format_aware:
+                population = local_search_instance_4(population, category_dict, validator,
+                                                     local_search_iterations, evolution.rng)
+            else:
+                population = local_search(population, category_dict, validator, local_search_iterations,
+                                          evolution.rng)
+            
+            # Recalculate coverage after local search
+            _, coverage = population_coverage(population, category_dict)
         coverages.append(coverage)  # Add the final coverage after local search
         print(f"Coverage after local search: {coverage:.2f}%")
     
@@ -230,6 +592,138 @@ def genetic_algorithm(
     
     return population, coverages
 
+def run_genetic_algorithm(
+    schema: GenomeSchema,
+    pop_size: int = 50,
+    generations: int = 100,
+    category_dict=None,
+    validator=None,
+    use_local_search=False,
+    force_full_generations=False,
+    selection: Union[str, Callable] = "truncation",
+    checkpoint_path: Optional[str] = None,
+    checkpoint_interval: int = 5,
+    seed: Union[None, int, RNG] = None,
+    unique_genomes: bool = False,
+    profile: bool = False
+) -> Tuple[List[Any], List[float]]:
+    """
+    Run the genetic algorithm on populations described by a genome schema.
+    
+    Args:
+        schema: Genome schema (DATE_SCHEMA or DATE_FORMAT_SCHEMA)
+        pop_size: Size of the population
+        generations: Maximum number of generations
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        use_local_search: Whether to apply local search to refine the population
+        force_full_generations: Whether to run all generations regardless of coverage
+        selection: Parent selection strategy: "truncation", "tournament", "sus" or a callable
+            taking (fitness, num_parents, rng) and returning parent indices
+        checkpoint_path: File the run is checkpointed to (None disables checkpointing)
+        checkpoint_interval: Number of generations between checkpoints
+        seed: Seed or RNG context; runs with the same seed reproduce exactly (derived from
+            the random module if omitted)
+        unique_genomes: Whether every generation must consist of distinct genomes; duplicate
+            offspring are replaced before evaluation and their number is reported
+        profile: Whether to time every phase of the run (off by default, at near-zero cost)
+            and return a RunStats as third element
+        
+    Returns:
+        Tuple of (population, coverages) where population is the final list of test case objects
+        and coverages is a list of coverage values per generation, followed by the RunStats
+        of the run if profile is set
+    """
+    stats = RunStats() if profile else None
+    evolution = Evolution(schema, pop_size, generations, category_dict, validator, selection,
+                          force_full_generations=force_full_generations,
+                          unique_genomes=unique_genomes, checkpoint_path=checkpoint_path,
+                          checkpoint_interval=checkpoint_interval, rng=seed, stats=stats)
+    population, coverages = _complete_run(evolution, use_local_search)
+    return (population, coverages, stats) if profile else (population, coverages)
+
+def resume_genetic_algorithm(
+    checkpoint_path: str,
+    category_dict=None,
+    validator=None,
+    use_local_search=False,
+    profile=False,
+    **params
+) -> Tuple[List[Any], List[float]]:
+    """
+    Resume a checkpointed run of genetic_algorithm or genetic_algorithm_instance_4.
+    
+    The resumed run keeps checkpointing to the same file and produces the same result
+    as the uninterrupted run.
+    
+    Args:
+        checkpoint_path: Checkpoint file written by the interrupted run
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        use_local_search: Whether to apply local search to refine the population
+        profile: Whether to time the phases of the resumed part of the run and return a
+            RunStats as third element
+        **params: Run parameters overriding the saved ones (e.g. generations, or
+            selection if the run used a custom selection function)
+        
+    Returns:
+        Tuple of (population, coverages) where population is the final list of test case objects
+        and coverages is a list of coverage values per generation, including those
+        before the checkpoint, followed by the RunStats
+        of the run if profile is set
+    """
+    stats = RunStats() if profile else None
+    evolution = Evolution.from_checkpoint(checkpoint_path, category_dict, validator, stats=stats, **params)
+    population, coverages = _complete_run(evolution, use_local_search)
+    return (population, coverages, stats) if profile else (population, coverages)
+
+def genetic_algorithm(
+    pop_size: int = 50, 
+    generations: int = 100, 
+    category_dict=None,
+    validator=None,
+    use_local_search=False, 
+    instance_name="Original",
+    force_full_generations=False,
+    selection: Union[str, Callable] = "truncation",
+    checkpoint_path: Optional[str] = None,
+    checkpoint_interval: int = 5,
+    seed: Union[None, int, RNG] = None,
+    unique_genomes: bool = False,
+    profile: bool = False
+) -> Tuple[List[TestCase], List[float]]:
+    """
+    Run the genetic algorithm to generate test cases.
+    
+    Args:
+        pop_size: Size of the population
+        generations: Maximum number of generations
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        use_local_search: Whether to apply local search to refine the population
+        instance_name: Name of the problem instance
+        force_full_generations: Whether to run all generations regardless of coverage
+        selection: Parent selection strategy: "truncation", "tournament", "sus" or a callable
+            taking (fitness, num_parents, rng) and returning parent indices
+        checkpoint_path: File the run is checkpointed to every checkpoint_interval
+            generations (None disables checkpointing); resume with resume_genetic_algorithm
+        checkpoint_interval: Number of generations between checkpoints
+        seed: Seed or RNG context; runs with the same seed reproduce exactly (derived from
+            the random module if omitted)
+        unique_genomes: Whether every generation must consist of distinct genomes; duplicate
+            offspring are replaced before evaluation and their number is reported
+        profile: Whether to time every phase of the run (off by default, at near-zero cost)
+            and return a RunStats as third element
+        
+    Returns:
+        Tuple of (population, coverages) where population is the final list of TestCase objects
+        and coverages is a list of coverage values per generation, followed by the RunStats
+        of the run if profile is set
+    """
+    return run_genetic_algorithm(DATE_SCHEMA, pop_size, generations, category_dict, validator,
+                                 use_local_search, force_full_generations, selection,
+                                 checkpoint_path, checkpoint_interval, seed, unique_genomes, profile)
+
 def genetic_algorithm_instance_4(
     pop_size: int = 50, 
     generations: int = 100, 
@@ -237,7 +731,13 @@ def genetic_algorithm_instance_4(
     validator=None,
     use_local_search=False, 
     instance_name="Instance 4",
-    force_full_generations=False
+    force_full_generations=False,
+    selection: Union[str, Callable] = "truncation",
+    checkpoint_path: Optional[str] = None,
+    checkpoint_interval: int = 5,
+    seed: Union[None, int, RNG] = None,
+    unique_genomes: bool = False,
+    profile: bool = False
 ) -> Tuple[List[TestCaseFormat], List[float]]:
     """
     Run the genetic algorithm to generate format-specific test cases.
@@ -250,70 +750,83 @@ def genetic_algorithm_instance_4(
         use_local_search: Whether to apply local search to refine the population
         instance_name: Name of the problem instance
         force_full_generations: Whether to run all generations regardless of coverage
+        selection: Parent selection strategy: "truncation", "tournament", "sus" or a callable
+            taking (fitness, num_parents, rng) and returning parent indices
+        checkpoint_path: File the run is checkpointed to every checkpoint_interval
+            generations (None disables checkpointing); resume with resume_genetic_algorithm
+        checkpoint_interval: Number of generations between checkpoints
+        seed: Seed or RNG context; runs with the same seed reproduce exactly (derived from
+            the random module if omitted)
+        unique_genomes: Whether every generation must consist of distinct genomes; duplicate
+            offspring are replaced before evaluation and their number is reported
+        profile: Whether to time every phase of the run (off by default, at near-zero cost)
+            and return a RunStats as third element
         
     Returns:
         Tuple of (population, coverages) where population is the final list of TestCaseFormat objects
-        and coverages is a list of coverage values per generation
+        and coverages is a list of coverage values per generation, followed by the RunStats
+        of the run if profile is set
     """
-    population = initialize_population_instance_4(pop_size, category_dict, validator)
-    coverages = []  # List to store coverage values per generation
+    return run_genetic_algorithm(DATE_FORMAT_SCHEMA, pop_size, generations, category_dict, validator,
+                                 use_local_search, force_full_generations, selection,
+                                 checkpoint_path, checkpoint_interval, seed, unique_genomes, profile)
 
-    for gen in range(generations):
-        fitness = calculate_fitness_instance_4(population, category_dict)
-        parents = select_parents(population, fitness, pop_size // 2)
-        offspring = []
-        
-        for _ in range(pop_size - len(parents)):
-            p1, p2 = random.sample(parents, 2)
-            
-            # Crossover
-            day = random.choice([p1.day, p2.day])
-            month = random.choice([p1.month, p2.month])
-            year = random.choice([p1.year, p2.year])
-            format_type = random.choice([p1.format_type, p2.format_type])
-            
-            child = TestCaseFormat(day, month, year, format_type, category_dict, validator)
-            
-            # Mutation
-            if random.random() < 0.15:  # mutation rate
-                day = random.choice([1, 28, 29, 30, 31, random.randint(32, 40)])
-            if random.random() < 0.15:
-                month = random.choice([1, 2, 4, 6, 9, 11, 12, random.randint(13, 15)])
-            if random.random() < 0.15:
-                year = random.choice([0, 9999, 2020, 2021, random.randint(0, 9999)])
-            if random.random() < 0.15:
-                format_type = random.choice(["DD/MM/YYYY", "MM/DD/YYYY", "YYYY/MM/DD"])
-            
-            child = TestCaseFormat(day, month, year, format_type, category_dict, validator)
-            offspring.append(child)
-        
-        population = parents + offspring
-        
-        # Calculate coverage for the current generation
-        covered = set()
-        for ind in population:
-            covered.update(ind.categories)
-        
-        coverage = len(covered) / len(category_dict) * 100 if category_dict else 0
-        coverages.append(coverage)  # Store the coverage for this generation
-        
-        if coverage >= 95 and not force_full_generations:
-            print(f"Terminated at generation {gen + 1} with {coverage:.2f}% coverage")
-            break
-    
-    # Apply local search if enabled
-    if use_local_search:
-        population = local_search_instance_4(population, category_dict, validator, 5)
-        
-        # Recalculate coverage after local search
-        covered = set()
-        for ind in population:
-            covered.update(ind.categories)
-        
-        coverage = len(covered) / len(category_dict) * 100 if category_dict else 0
-        coverages.append(coverage)  # Add the final coverage after local search
-        print(f"Coverage after local search: {coverage:.2f}%")
-    
-    # The visualization is handled by the utility function in utils/visualization.py
-    
-    return population, coverages
+def genetic_algorithm_iter(
+    pop_size: int = 50,
+    generations: int = 100,
+    category_dict=None,
+    validator=None,
+    force_full_generations=False,
+    selection: Union[str, Callable] = "truncation",
+    **params
+) -> Evolution:
+    """
+    Start a genetic algorithm run that yields a snapshot after every generation.
+
+    Local search is not applied; call local_search on the final population if needed.
+
+    Args:
+        pop_size: Size of the population
+        generations: Maximum number of generations
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        force_full_generations: Whether to run all generations regardless of coverage
+        selection: Parent selection strategy name or callable
+        **params: Further Evolution parameters (mutation_rate, target_coverage, num_best,
+            unique_genomes, rng, ...)
+
+    Returns:
+        An Evolution to iterate over
+    """
+    return Evolution(DATE_SCHEMA, pop_size, generations, category_dict, validator, selection,
+                     force_full_generations=force_full_generations, **params)
+
+def genetic_algorithm_instance_4_iter(
+    pop_size: int = 50,
+    generations: int = 100,
+    category_dict=None,
+    validator=None,
+    force_full_generations=False,
+    selection: Union[str, Callable] = "truncation",
+    **params
+) -> Evolution:
+    """
+    Start a format-aware genetic algorithm run that yields a snapshot after every generation.
+
+    Local search is not applied; call local_search_instance_4 on the final population if needed.
+
+    Args:
+        pop_size: Size of the population
+        generations: Maximum number of generations
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        force_full_generations: Whether to run all generations regardless of coverage
+        selection: Parent selection strategy name or callable
+        **params: Further Evolution parameters (mutation_rate, target_coverage, num_best,
+            unique_genomes, rng, ...)
+
+    Returns:
+        An Evolution to iterate over
+    """
+    return Evolution(DATE_FORMAT_SCHEMA, pop_size, generations, category_dict, validator, selection,
+                     force_full_generations=force_full_generations, **params)
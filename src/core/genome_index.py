@@ -0,0 +1,477 @@
+from typing import List, Dict, Tuple, Any, Optional, Sequence
+import hashlib
+import inspect
+import os
+import re
+import tempfile
+import numpy as np
+from .test_case import InstanceContext
+from .predicates import compile_categories
+from ..utils.validation import get_batch_validator
+
+# Bump when the on-disk layout changes so stale index files are not reused
+INDEX_VERSION = 1
+
+# Genome space covered by the index
+DAY_RANGE = (1, 40)
+MONTH_RANGE = (1, 15)
+YEAR_RANGE = (0, 9999)
+FORMATS = ("DD/MM/YYYY", "MM/DD/YYYY", "YYYY/MM/DD")
+
+# Years at the edges of the genome space; genomes with them count as boundary test cases
+BOUNDARY_YEARS = YEAR_RANGE
+
+NUM_DAYS = DAY_RANGE[1] - DAY_RANGE[0] + 1
+NUM_MONTHS = MONTH_RANGE[1] - MONTH_RANGE[0] + 1
+NUM_YEARS = YEAR_RANGE[1] - YEAR_RANGE[0] + 1
+
+DEFAULT_INDEX_DIR = os.path.join("src", "assets", "index")
+
+
+def is_format_aware(category_dict) -> bool:
+    """
+    Check whether the category functions of an instance take a format argument.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+
+    Returns:
+        True if the categories are defined on (day, month, year, format_type)
+    """
+    for check in (category_dict or {}).values():
+        return check.__code__.co_argcount == 4
+    return False
+
+
+def boundary_category_mask(category_names: Sequence[str]) -> int:
+    """
+    Get the mask of the boundary categories (those whose name starts with "Boundary").
+
+    Args:
+        category_names: Category names in bit order
+
+    Returns:
+        Integer category bitmask
+    """
+    return sum(1 << i for i, name in enumerate(category_names) if name.startswith("Boundary"))
+
+
+def is_boundary(in_boundary_category, year):
+    """
+    Check whether genomes are boundary test cases.
+
+    A genome is a boundary test case if it belongs to a boundary category or has one of
+    the BOUNDARY_YEARS. Works elementwise on arrays.
+
+    Args:
+        in_boundary_category: Whether the genome belongs to a boundary category, e.g.
+            category_mask & boundary_category_mask(names)
+        year: The year component of the date
+
+    Returns:
+        A boolean, or a boolean array for array arguments
+    """
+    return np.logical_or(in_boundary_category, np.isin(year, BOUNDARY_YEARS))
+
+
+def _hash_function(func, digest, seen):
+    """Feed the code of a function, and of the functions and values it references, into a digest."""
+    func = inspect.unwrap(func)  # Validator adapters hash the function they wrap
+    code = getattr(func, "__code__", None)
+    if code is None:
+        digest.update(repr(func).encode())
+        return
+    if code in seen:
+        return
+    seen.add(code)
+    _hash_code(code, digest)
+    digest.update(repr(func.__defaults__).encode())
+    for name in code.co_names:
+        if name in func.__globals__:
+            digest.update(name.encode())
+            _hash_value(func.__globals__[name], digest, seen)
+    for cell in func.__closure__ or ():
+        try:
+            _hash_value(cell.cell_contents, digest, seen)
+        except ValueError:  # Empty cell
+            pass
+
+
+def _hash_value(value, digest, seen):
+    """Feed a global or closure value referenced by hashed code into a digest."""
+    if inspect.ismodule(value):
+        digest.update(value.__name__.encode())
+    elif hasattr(inspect.unwrap(value), "__code__"):
+        _hash_function(value, digest, seen)
+    elif isinstance(value, re.Pattern):
+        digest.update(repr((value.pattern, value.flags)).encode())
+    elif isinstance(value, (tuple, list)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _hash_value(item, digest, seen)
+    elif isinstance(value, (set, frozenset)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in sorted(value, key=repr):
+            _hash_value(item, digest, seen)
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for key, item in value.items():
+            _hash_value(key, digest, seen)
+            _hash_value(item, digest, seen)
+    elif value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        digest.update(repr(value).encode())
+    else:
+        # Classes, builtins and other objects: their repr may hold a memory address
+        digest.update(getattr(value, "__qualname__", type(value).__qualname__).encode())
+
+
+def _hash_code(code, digest):
+    """Feed a code object, including nested code objects, into a digest."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    digest.update(repr(code.co_varnames).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _hash_code(const, digest)
+        else:
+            digest.update(repr(const).encode())
+
+
+def instance_fingerprint(category_dict=None, validator=None) -> str:
+    """
+    Hash an instance definition (category names, category code and validator code).
+
+    The code of every function referenced by a category or the validator is hashed too,
+    along with the module constants and closure values they reference (e.g. compiled
+    date patterns), so rebinding any of them yields a new fingerprint.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+
+    Returns:
+        Hex digest identifying the instance definition
+    """
+    digest = hashlib.sha256(f"genome-index-v{INDEX_VERSION}".encode())
+    seen = set()
+    for name, check in (category_dict or {}).items():
+        digest.update(name.encode())
+        _hash_function(check, digest, seen)
+    digest.update(b"validator")
+    if validator is not None:
+        _hash_function(validator, digest, seen)
+    return digest.hexdigest()[:32]
+
+
+class GenomeIndex:
+    """
+    Precomputed category and validity bits for every genome of an instance.
+
+    Each genome owns a little-endian bit row: bit i is set when the genome belongs to
+    the i-th category of the category dictionary, and the bit after the last category
+    holds the validator result. Rows are stored in a memory-mapped .npy file so that
+    several processes can share one index without duplicating memory.
+    """
+
+    def __init__(self, path: str, category_names: List[str], format_aware: bool):
+        """
+        Open an existing index file read-only.
+
+        Args:
+            path: Path of the index file
+            category_names: Category names in bit order
+            format_aware: Whether the index includes the format gene
+        """
+        self.path = path
+        self.category_names = list(category_names)
+        self.format_aware = format_aware
+        self.valid_bit = len(self.category_names)
+        self.bits = np.load(path, mmap_mode="r")
+        self._names_by_mask: Dict[int, tuple] = {}
+
+    @staticmethod
+    def space_size(format_aware: bool) -> int:
+        """Number of genomes in the indexed space."""
+        return NUM_DAYS * NUM_MONTHS * NUM_YEARS * (len(FORMATS) if format_aware else 1)
+
+    @staticmethod
+    def row_bytes(num_categories: int) -> int:
+        """Number of bytes per genome row (categories plus the validity bit)."""
+        return (num_categories + 1 + 7) // 8
+
+    def offset(self, day: int, month: int, year: int, format_type: Optional[str] = None) -> Optional[int]:
+        """
+        Get the row of a genome in the index.
+
+        Args:
+            day: The day component of the date
+            month: The month component of the date
+            year: The year component of the date
+            format_type: The format of the date string (format-aware indexes only)
+
+        Returns:
+            The row number, or None if the genome lies outside the indexed space
+        """
+        if not (DAY_RANGE[0] <= day <= DAY_RANGE[1] and MONTH_RANGE[0] <= month <= MONTH_RANGE[1]
+                and YEAR_RANGE[0] <= year <= YEAR_RANGE[1]):
+            return None
+        row = ((day - DAY_RANGE[0]) * NUM_MONTHS + (month - MONTH_RANGE[0])) * NUM_YEARS + (year - YEAR_RANGE[0])
+        if self.format_aware:
+            if format_type not in FORMATS:
+                return None
+            row = row * len(FORMATS) + FORMATS.index(format_type)
+        return row
+
+    def mask(self, day: int, month: int, year: int, format_type: Optional[str] = None) -> Optional[int]:
+        """
+        Get the bit row of a genome as an integer.
+
+        Args:
+            day: The day component of the date
+            month: The month component of the date
+            year: The year component of the date
+            format_type: The format of the date string (format-aware indexes only)
+
+        Returns:
+            Integer bitmask, or None if the genome lies outside the indexed space
+        """
+        row = self.offset(day, month, year, format_type)
+        if row is None:
+            return None
+        return int.from_bytes(self.bits[row].tobytes(), "little")
+
+    def categories_from_mask(self, mask: int) -> tuple:
+        """
+        Decode the category bits of a mask into category names.
+
+        Args:
+            mask: Integer bitmask as returned by mask()
+
+        Returns:
+            Tuple of category names in category dictionary order
+        """
+        mask &= (1 << self.valid_bit) - 1
+        names = self._names_by_mask.get(mask)
+        if names is None:
+            names = tuple(name for i, name in enumerate(self.category_names) if mask >> i & 1)
+            self._names_by_mask[mask] = names
+        return names
+
+    def lookup(self, day: int, month: int, year: int, format_type: Optional[str] = None) -> Optional[Tuple[bool, tuple]]:
+        """
+        Look up the validity and categories of a genome.
+
+        Args:
+            day: The day component of the date
+            month: The month component of the date
+            year: The year component of the date
+            format_type: The format of the date string (format-aware indexes only)
+
+        Returns:
+            Tuple of (is_valid, categories), or None if the genome lies outside the indexed space
+        """
+        mask = self.mask(day, month, year, format_type)
+        if mask is None:
+            return None
+        return bool(mask >> self.valid_bit & 1), self.categories_from_mask(mask)
+
+
+def _evaluate_block(checks, kernel, validator, batch_validator, day: int, month: int, fmt: Optional[str],
+                    years: range) -> np.ndarray:
+    """Evaluate all categories and the validator for one (day, month, format) run of years."""
+    bits = np.zeros((len(years), len(checks) + 1), dtype=bool)
+    if kernel is not None:
+        year_array = np.arange(years.start, years.stop)
+        args = (day, month, year_array) if fmt is None else (day, month, year_array, fmt)
+        bits[:, :-1] = kernel.matrix(*args)
+    else:
+        for row, year in enumerate(years):
+            for col, check in enumerate(checks):
+                bits[row, col] = check(day, month, year) if fmt is None else check(day, month, year, fmt)
+
+    if batch_validator is not None:
+        year_array = np.arange(years.start, years.stop)
+        if fmt is None:
+            bits[:, -1] = batch_validator(day, month, year_array)
+        else:
+            bits[:, -1] = batch_validator(day, month, year_array, fmt)
+    elif validator:
+        for row, year in enumerate(years):
+            if fmt is None:
+                bits[row, -1] = validator(f"{day:02d}/{month:02d}/{year:04d}")
+            else:
+                date_str = {
+                    "DD/MM/YYYY": f"{day:02d}/{month:02d}/{year:04d}",
+                    "MM/DD/YYYY": f"{month:02d}/{day:02d}/{year:04d}",
+                    "YYYY/MM/DD": f"{year:04d}/{month:02d}/{day:02d}",
+                }[fmt]
+                bits[row, -1] = validator(date_str, fmt)
+    return bits
+
+
+def iter_genome_blocks(category_dict=None, validator=None, index: Optional[GenomeIndex] = None,
+                       blocks: Optional[Sequence[Tuple[int, int]]] = None):
+    """
+    Enumerate the bit rows of the whole genome space, one (day, month) block at a time.
+
+    Rows are read from the index if one is given; otherwise each block is evaluated
+    with the fused predicate kernel and the batch validator when they are available.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        index: Optional GenomeIndex of the instance to read the rows from
+        blocks: (day, month) pairs of the blocks to enumerate, in that order (defaults
+            to the whole space), or (day, month, years) triples to enumerate only a range
+            of years of a block
+
+    Yields:
+        Tuples of (day, month, rows) where rows is a uint8 array of packed bit rows in
+        index order: one per year, interleaved with the formats for format-aware instances
+    """
+    category_dict = category_dict or {}
+    format_aware = is_format_aware(category_dict)
+    num_formats = len(FORMATS) if format_aware else 1
+    all_years = range(YEAR_RANGE[0], YEAR_RANGE[1] + 1)
+    if index is None:
+        checks = list(category_dict.values())
+        kernel = compile_categories(category_dict)
+        batch_validator = get_batch_validator(validator) if validator else None
+
+    if blocks is None:
+        blocks = [(day, month) for day in range(DAY_RANGE[0], DAY_RANGE[1] + 1)
+                  for month in range(MONTH_RANGE[0], MONTH_RANGE[1] + 1)]
+
+    for day, month, *year_range in blocks:
+        years = year_range[0] if year_range else all_years
+        if index is not None:
+            start = (((day - DAY_RANGE[0]) * NUM_MONTHS + (month - MONTH_RANGE[0])) * NUM_YEARS
+                     + years.start - YEAR_RANGE[0]) * num_formats
+            yield day, month, np.asarray(index.bits[start:start + len(years) * num_formats])
+            continue
+        block = np.empty((len(years) * num_formats, len(checks) + 1), dtype=bool)
+        for f in range(num_formats):
+            fmt = FORMATS[f] if format_aware else None
+            block[f::num_formats] = _evaluate_block(checks, kernel, validator, batch_validator, day, month, fmt, years)
+        yield day, month, np.packbits(block, axis=1, bitorder="little")
+
+
+def build_genome_index(category_dict=None, validator=None, path: Optional[str] = None,
+                       index_dir: Optional[str] = None) -> GenomeIndex:
+    """
+    Evaluate every category and the validator over the whole genome space and store the bits.
+
+    Categories are evaluated with the fused predicate kernel and validity with the
+    validator's batch counterpart when they are available. The
+    file is written to a temporary name and atomically renamed, so concurrent builders
+    and readers never observe a partial index.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        path: Output path (defaults to <index_dir>/<fingerprint>.npy)
+        index_dir: Directory for index files
+
+    Returns:
+        The built GenomeIndex
+    """
+    category_dict = category_dict or {}
+    format_aware = is_format_aware(category_dict)
+    if path is None:
+        path = os.path.join(index_dir or DEFAULT_INDEX_DIR, instance_fingerprint(category_dict, validator) + ".npy")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".npy", dir=os.path.dirname(path) or ".")
+    os.close(fd)
+    try:
+        out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8,
+                                        shape=(GenomeIndex.space_size(format_aware), GenomeIndex.row_bytes(len(category_dict))))
+        start = 0
+        for _, _, rows in iter_genome_blocks(category_dict, validator):
+            out[start:start + len(rows)] = rows
+            start += len(rows)
+        out.flush()
+        del out
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return GenomeIndex(path, list(category_dict.keys()), format_aware)
+
+
+def load_genome_index(category_dict=None, validator=None, index_dir: Optional[str] = None,
+                      build: bool = True) -> Optional[GenomeIndex]:
+    """
+    Open the index for an instance, building it first if needed.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        index_dir: Directory for index files
+        build: Whether to build the index when no file exists for this instance definition
+
+    Returns:
+        The GenomeIndex, or None if it does not exist and build is False
+    """
+    path = os.path.join(index_dir or DEFAULT_INDEX_DIR, instance_fingerprint(category_dict, validator) + ".npy")
+    if os.path.exists(path):
+        return GenomeIndex(path, list((category_dict or {}).keys()), is_format_aware(category_dict))
+    if not build:
+        return None
+    return build_genome_index(category_dict, validator, path=path)
+
+
+def attach_genome_index(category_dict=None, validator=None, index_dir: Optional[str] = None,
+                        build: bool = True) -> Optional[GenomeIndex]:
+    """
+    Make test cases of an instance look up categories and validity in the genome index.
+
+    After attaching, TestCase evaluation, calculate_fitness and the local searches use
+    O(1) index lookups instead of calling the category functions and the validator.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        index_dir: Directory for index files
+        build: Whether to build the index when no file exists for this instance definition
+
+    Returns:
+        The attached GenomeIndex, or None if none was available
+    """
+    index = load_genome_index(category_dict, validator, index_dir, build)
+    InstanceContext.get(category_dict, validator).index = index
+    return index
+
+
+def detach_genome_index(category_dict=None, validator=None):
+    """
+    Stop using a genome index for an instance.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+    """
+    InstanceContext.get(category_dict, validator).index = None
+
+
+if __name__ == "__main__":
+    # Prebuild the indexes for all bundled instances
+    from ..instances.original import CATEGORIES as ORIGINAL_CATEGORIES
+    from ..instances.instance1 import CATEGORIES as CATEGORIES_INSTANCE_1
+    from ..instances.instance2 import CATEGORIES as CATEGORIES_INSTANCE_2
+    from ..instances.instance3 import CATEGORIES as CATEGORIES_INSTANCE_3
+    from ..instances.instance4 import CATEGORIES as CATEGORIES_INSTANCE_4
+    from ..utils.validation import (is_valid_date, validator_instance_1, validator_instance_2,
+                                    validator_instance_3, validator_instance_4)
+
+    for categories, validator in [
+        (ORIGINAL_CATEGORIES, is_valid_date),
+        (CATEGORIES_INSTANCE_1, validator_instance_1),
+        (CATEGORIES_INSTANCE_2, validator_instance_2),
+        (CATEGORIES_INSTANCE_3, validator_instance_3),
+        (CATEGORIES_INSTANCE_4, validator_instance_4),
+    ]:
+        index = load_genome_index(categories, validator)
+        print(f"{validator.__name__}: {index.path}")
@@ -0,0 +1,269 @@
+import multiprocessing
+import traceback
+from typing import List, Dict, Tuple, Any, Optional
+from .fitness import calculate_fitness
+from .rng import RNG
+from .schema import DATE_SCHEMA, DATE_FORMAT_SCHEMA
+from .genetic_algorithm import local_search, local_search_instance_4, next_generation_schema, population_coverage, population_mask
+from ..instances.registry import get_instance
+
+TOPOLOGIES = ("ring", "full")
+
+
+class Island:
+    """A sub-population evolving independently between migrations."""
+
+    def __init__(self, instance_key: str, pop_size: int, rng: RNG):
+        """
+        Initialize an island with its own population and random stream.
+
+        Args:
+            instance_key: Key of the problem instance in the instance registry
+            pop_size: Size of the island's population
+            rng: The island's own RNG stream
+        """
+        instance = get_instance(instance_key)
+        self.category_dict = instance["categories"]
+        self.validator = instance["validator"]
+        self.format_aware = instance["format_aware"]
+        self.schema = DATE_FORMAT_SCHEMA if self.format_aware else DATE_SCHEMA
+        self.pop_size = pop_size
+        self.rng = rng
+        self.population = self.schema.initialize_population(pop_size, self.category_dict, self.validator, rng)
+
+    def _build(self, genome: tuple):
+        """Build a test case from a (day, month, year, format_type) genome."""
+        return self.schema.build(genome[:len(self.schema.genes)], self.category_dict, self.validator)
+
+    def genomes(self, population: Optional[List[Any]] = None) -> List[tuple]:
+        """
+        Get the genomes of the island's population.
+
+        Args:
+            population: Individuals to convert (defaults to the whole population)
+
+        Returns:
+            List of (day, month, year, format_type) tuples
+        """
+        population = self.population if population is None else population
+        return [(ind.day, ind.month, ind.year, getattr(ind, "format_type", None)) for ind in population]
+
+    def step(self, immigrants: List[tuple], num_emigrants: int) -> Tuple[float, int, List[tuple]]:
+        """
+        Integrate immigrants and evolve the island by one generation.
+
+        Immigrants replace the least fit individuals.
+
+        Args:
+            immigrants: Genomes received from other islands
+            num_emigrants: Number of best genomes to return for migration (0 for none)
+
+        Returns:
+            Tuple of (coverage, covered_mask, emigrants) for the new generation
+        """
+        if immigrants:
+            fitness = calculate_fitness(self.population)
+            worst = sorted(range(len(self.population)), key=lambda i: fitness[i])[:len(immigrants)]
+            for i, genome in zip(worst, immigrants):
+                self.population[i] = self._build(genome)
+
+        self.population = next_generation_schema(self.population, self.pop_size, self.schema,
+                                                 self.category_dict, self.validator, rng=self.rng)
+
+        covered_mask = population_mask(self.population)
+        coverage = covered_mask.bit_count() / len(self.category_dict) * 100 if self.category_dict else 0
+        emigrants = []
+        if num_emigrants:
+            fitness = calculate_fitness(self.population)
+            best = sorted(range(len(self.population)), key=lambda i: fitness[i], reverse=True)[:num_emigrants]
+            emigrants = self.genomes([self.population[i] for i in best])
+        return coverage, covered_mask, emigrants
+
+
+def _island_worker(connection, instance_key: str, pop_size: int, rng: RNG):
+    """Serve step requests for one island over a pipe until asked to finish."""
+    try:
+        island = Island(instance_key, pop_size, rng)
+        while True:
+            command, *args = connection.recv()
+            if command == "step":
+                connection.send(("ok", island.step(*args)))
+            else:
+                connection.send(("ok", island.genomes()))
+                return
+    except BaseException:
+        # Report the failure with its traceback instead of just closing the pipe
+        try:
+            connection.send(("error", traceback.format_exc()))
+        except OSError:
+            pass
+    finally:
+        connection.close()
+
+
+def _receive(connection, process=None):
+    """
+    Receive the reply of an island.
+
+    Raises:
+        RuntimeError: If the island failed or its worker process exited
+    """
+    try:
+        status, payload = connection.recv()
+    except EOFError:
+        process.join(timeout=5)
+        raise RuntimeError(f"Island worker exited without replying (exit code {process.exitcode})") from None
+    if status == "error":
+        raise RuntimeError(f"Island worker failed:\n{payload}")
+    return payload
+
+
+class _LocalIsland:
+    """In-process stand-in for an island worker, exposing the same pipe protocol."""
+
+    def __init__(self, instance_key: str, pop_size: int, rng: RNG):
+        self.island = Island(instance_key, pop_size, rng)
+        self.reply = None
+
+    def send(self, message):
+        command, *args = message
+        self.reply = ("ok", self.island.step(*args) if command == "step" else self.island.genomes())
+
+    def recv(self):
+        return self.reply
+
+
+def migration_sources(num_islands: int, topology: str) -> List[List[int]]:
+    """
+    Get, for every island, the islands it receives migrants from.
+
+    Args:
+        num_islands: Number of islands
+        topology: "ring" (each island receives from its predecessor) or "full" (from every other island)
+
+    Returns:
+        List of source island indices per island
+    """
+    if topology == "ring":
+        return [[(i - 1) % num_islands] if num_islands > 1 else [] for i in range(num_islands)]
+    if topology == "full":
+        return [[j for j in range(num_islands) if j != i] for i in range(num_islands)]
+    raise ValueError(f"Unknown topology '{topology}', expected one of: {', '.join(TOPOLOGIES)}")
+
+
+def island_genetic_algorithm(
+    instance: str = "original",
+    num_islands: int = 4,
+    pop_size: int = 50,
+    generations: int = 100,
+    migration_interval: int = 5,
+    num_migrants: int = 2,
+    topology: str = "ring",
+    target_coverage: float = 95,
+    use_local_search=False,
+    force_full_generations=False,
+    seed: Optional[int] = None,
+    use_processes: bool = True
+) -> Tuple[List[Any], List[float], List[List[float]]]:
+    """
+    Run the genetic algorithm as an island model.
+
+    Each island evolves its own population in a separate process. Every
+    migration_interval generations the best individuals of each island migrate along
+    the topology and replace the least fit individuals of the receiving islands. All
+    islands stop together as soon as the union of their coverage reaches the target.
+
+    Args:
+        instance: Key of the problem instance in the instance registry; format-aware
+            instances run on TestCaseFormat populations
+        num_islands: Number of islands
+        pop_size: Size of each island's population
+        generations: Maximum number of generations
+        migration_interval: Number of generations between migrations
+        num_migrants: Number of individuals each island sends per migration
+        topology: Migration topology ("ring" or "full")
+        target_coverage: Union coverage percentage at which all islands stop
+        use_local_search: Whether to apply local search to the merged population
+        force_full_generations: Whether to run all generations regardless of coverage
+        seed: Base seed from which the per-island RNG streams are spawned (derived from the
+            random module if omitted)
+        use_processes: Whether to run islands in separate processes (False runs them in-process)
+
+    Returns:
+        Tuple of (population, coverages, island_coverages) where population is the merged
+        final population of all islands, coverages is the global (union) coverage per
+        generation and island_coverages holds the coverage curve of each island
+
+    Raises:
+        RuntimeError: If an island worker fails (with the worker's traceback) or exits
+    """
+    sources = migration_sources(num_islands, topology)
+    rng = RNG(seed)
+    island_rngs = rng.spawn(num_islands)
+
+    processes = []
+    if use_processes:
+        connections = []
+        for i in range(num_islands):
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_island_worker, args=(child_end, instance, pop_size, island_rngs[i]),
+                                              daemon=True)
+            process.start()
+            processes.append(process)
+            connections.append(parent_end)
+    else:
+        connections = [_LocalIsland(instance, pop_size, island_rngs[i]) for i in range(num_islands)]
+
+    owners = processes or [None] * num_islands
+    instance_spec = get_instance(instance)
+    category_dict, validator = instance_spec["categories"], instance_spec["validator"]
+    coverages = []  # Global coverage per generation
+    island_coverages = [[] for _ in range(num_islands)]
+    immigrants = [[] for _ in range(num_islands)]
+
+    try:
+        for gen in range(generations):
+            migrate = (gen + 1) % migration_interval == 0
+            for i, connection in enumerate(connections):
+                connection.send(("step", immigrants[i], num_migrants if migrate else 0))
+            replies = [_receive(connection, process) for connection, process in zip(connections, owners)]
+
+            covered_mask = 0
+            for i, (coverage, island_mask, _) in enumerate(replies):
+                island_coverages[i].append(coverage)
+                covered_mask |= island_mask
+            coverage = covered_mask.bit_count() / len(category_dict) * 100 if category_dict else 0
+            coverages.append(coverage)
+
+            # Route emigrants to their destination islands for the next generation
+            immigrants = [[genome for j in sources[i] for genome in replies[j][2]] for i in range(num_islands)]
+
+            if coverage >= target_coverage and not force_full_generations:
+                print(f"Terminated at generation {gen + 1} with {coverage:.2f}% coverage")
+                break
+
+        genomes = []
+        for connection, process in zip(connections, owners):
+            connection.send(("finish",))
+            genomes.extend(_receive(connection, process))
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    schema = DATE_FORMAT_SCHEMA if instance_spec["format_aware"] else DATE_SCHEMA
+    genomes = [genome[:len(schema.genes)] for genome in genomes]
+    population = [schema.build(genome, category_dict, validator) for genome in genomes]
+
+    # Apply local search to the merged population if enabled
+    if use_local_search:
+        if instance_spec["format_aware"]:
+            population = local_search_instance_4(population, category_dict, validator, 5, rng)
+        else:
+            population = local_search(population, category_dict, validator, rng=rng)
+        _, coverage = population_coverage(population, category_dict)
+        coverages.append(coverage)  # Add the final coverage after local search
+        print(f"Coverage after local search: {coverage:.2f}%")
+
+    return population, coverages, island_coverages
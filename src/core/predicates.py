@@ -0,0 +1,368 @@
+import ast
+import inspect
+import linecache
+from typing import List, Dict, Tuple, Any, Optional
+import numpy as np
+
+# Canonical argument names of category functions: day, month, year and format type
+ARGUMENT_NAMES = ("d", "m", "y", "f")
+
+_COMPARE_OPS = {
+    ast.Eq: "==", ast.NotEq: "!=", ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=",
+}
+_BINARY_OPS = {
+    ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Mod: "%", ast.FloorDiv: "//",
+}
+
+
+class PredicateCompileError(ValueError):
+    """Raised when a category function uses constructs the predicate compiler does not support."""
+
+
+# Parsed source files, keyed by filename
+_module_trees: Dict[str, ast.Module] = {}
+
+
+def _function_node(func) -> Tuple[ast.arguments, ast.expr]:
+    """
+    Find the arguments and expression of a lambda or single-expression function.
+
+    Single-expression functions are defs whose body is one return statement, optionally
+    preceded by a docstring.
+    """
+    try:
+        filename = inspect.getsourcefile(func)
+    except TypeError:
+        filename = None
+    tree = _module_trees.get(filename)
+    if tree is None:
+        source = "".join(linecache.getlines(filename)) if filename else ""
+        if not source:
+            raise PredicateCompileError(f"No source available for {func!r}")
+        tree = _module_trees[filename] = ast.parse(source, filename)
+
+    code = func.__code__
+    # Several functions can share a line; keep the one whose bytecode matches
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Lambda) and node.lineno == code.co_firstlineno:
+            compiled = compile(ast.Expression(body=node), filename, "eval")
+        elif (isinstance(node, ast.FunctionDef) and node.name == code.co_name
+              and min([node.lineno] + [d.lineno for d in node.decorator_list]) == code.co_firstlineno):
+            compiled = compile(ast.Module(body=[node], type_ignores=[]), filename, "exec")
+        else:
+            continue
+        for const in compiled.co_consts:
+            if hasattr(const, "co_code") and const.co_code == code.co_code and const.co_consts == code.co_consts:
+                if isinstance(node, ast.Lambda):
+                    return node.args, node.body
+                body = node.body[1:] if ast.get_docstring(node) is not None else node.body
+                if len(body) != 1 or not isinstance(body[0], ast.Return) or body[0].value is None:
+                    raise PredicateCompileError(f"Only single-expression functions are supported: {func!r}")
+                return node.args, body[0].value
+    raise PredicateCompileError(f"Could not locate the source of {func!r}")
+
+
+class _ExpressionGraph:
+    """Expression DAG shared by all categories, with common sub-expressions merged."""
+
+    def __init__(self, arity: int):
+        self.arity = arity
+        self.nodes: List[tuple] = []  # (kind, payload, operand ids)
+        self._ids: Dict[tuple, int] = {}
+        self._temps = set()  # Nodes stored in temporaries by the kernel being generated
+
+    def _add(self, node: tuple) -> int:
+        node_id = self._ids.get(node)
+        if node_id is None:
+            node_id = self._ids[node] = len(self.nodes)
+            self.nodes.append(node)
+        return node_id
+
+    def add_expression(self, expr: ast.expr, arguments: Dict[str, str]) -> int:
+        """Add an expression and return the id of its root node."""
+        if isinstance(expr, ast.Name):
+            if expr.id not in arguments:
+                raise PredicateCompileError(f"Unsupported name '{expr.id}'")
+            return self._add(("arg", arguments[expr.id], ()))
+
+        if isinstance(expr, ast.Constant):
+            if not isinstance(expr.value, (int, str, bool)):
+                raise PredicateCompileError(f"Unsupported constant {expr.value!r}")
+            return self._add(("const", expr.value, ()))
+
+        if isinstance(expr, ast.BoolOp):
+            kind = "and" if isinstance(expr.op, ast.And) else "or"
+            return self._add((kind, None, tuple(self.add_expression(v, arguments) for v in expr.values)))
+
+        if isinstance(expr, ast.UnaryOp):
+            operand = self.add_expression(expr.operand, arguments)
+            if isinstance(expr.op, ast.Not):
+                return self._add(("not", None, (operand,)))
+            if isinstance(expr.op, ast.USub):
+                return self._add(("neg", None, (operand,)))
+            raise PredicateCompileError(f"Unsupported unary operator {type(expr.op).__name__}")
+
+        if isinstance(expr, ast.BinOp):
+            op = _BINARY_OPS.get(type(expr.op))
+            if op is None:
+                raise PredicateCompileError(f"Unsupported operator {type(expr.op).__name__}")
+            # Division is only allowed by non-zero constants, so every node is safe to evaluate eagerly
+            if op in ("%", "//") and not (isinstance(expr.right, ast.Constant)
+                                          and isinstance(expr.right.value, int) and expr.right.value):
+                raise PredicateCompileError("Only division by non-zero integer constants is supported")
+            left = self.add_expression(expr.left, arguments)
+            right = self.add_expression(expr.right, arguments)
+            return self._add(("binop", op, (left, right)))
+
+        if isinstance(expr, ast.Compare):
+            # Chained comparisons become a conjunction of pairwise comparisons
+            parts = []
+            left = expr.left
+            for op, right in zip(expr.ops, expr.comparators):
+                parts.append(self._add_comparison(left, op, right, arguments))
+                left = right
+            return parts[0] if len(parts) == 1 else self._add(("and", None, tuple(parts)))
+
+        raise PredicateCompileError(f"Unsupported expression {type(expr).__name__}")
+
+    def _add_comparison(self, left: ast.expr, op: ast.cmpop, right: ast.expr, arguments: Dict[str, str]) -> int:
+        """Add a single comparison."""
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if not isinstance(right, (ast.Tuple, ast.List, ast.Set)) or not all(
+                    isinstance(e, ast.Constant) for e in right.elts):
+                raise PredicateCompileError("Membership tests need a literal collection of constants")
+            values = tuple(e.value for e in right.elts)
+            node = self._add(("in", values, (self.add_expression(left, arguments),)))
+            return node if isinstance(op, ast.In) else self._add(("not", None, (node,)))
+
+        symbol = _COMPARE_OPS.get(type(op))
+        if symbol is None:
+            raise PredicateCompileError(f"Unsupported comparison {type(op).__name__}")
+        return self._add(("compare", symbol, (self.add_expression(left, arguments),
+                                              self.add_expression(right, arguments))))
+
+    def render(self, node_id: int, vectorized: bool) -> str:
+        """Render the expression of one node over the temporaries of its operands."""
+        kind, payload, operands = self.nodes[node_id]
+        names = [self._name(o) for o in operands]
+        if kind == "arg":
+            return payload
+        if kind == "const":
+            return repr(payload)
+        if kind == "binop":
+            return f"({names[0]} {payload} {names[1]})"
+        if kind == "compare":
+            return f"({names[0]} {payload} {names[1]})"
+        if kind == "neg":
+            return f"(-{names[0]})"
+        if vectorized:
+            if kind == "and":
+                return f"_all(({', '.join(names)},))"
+            if kind == "or":
+                return f"_any(({', '.join(names)},))"
+            if kind == "not":
+                return f"_not({names[0]})"
+            return f"_isin({names[0]}, {payload!r})"
+        if kind == "and":
+            return "(" + " and ".join(names) + ")"
+        if kind == "or":
+            return "(" + " or ".join(names) + ")"
+        if kind == "not":
+            return f"(not {names[0]})"
+        return f"({names[0]} in {payload!r})"
+
+    def _name(self, node_id: int) -> str:
+        """Temporary holding a node's value, or the node's inlined expression."""
+        kind, payload, _ = self.nodes[node_id]
+        if kind == "arg":
+            return payload
+        if kind == "const":
+            return repr(payload)
+        if node_id in self._temps:
+            return f"_t{node_id}"
+        return self.render(node_id, vectorized=False)
+
+    def generate(self, roots: List[int], vectorized: bool) -> str:
+        """
+        Generate the source of a kernel evaluating the roots with shared sub-expressions computed once.
+
+        The array kernel stores every node in a temporary. The scalar kernel only stores
+        nodes used more than once and inlines the rest, so `and`/`or` keep short-circuiting.
+        """
+        args = ", ".join(ARGUMENT_NAMES[:self.arity])
+        name = "_array_kernel" if vectorized else "_scalar_kernel"
+        computed = [i for i, (kind, _, _) in enumerate(self.nodes) if kind not in ("arg", "const")]
+        if vectorized:
+            self._temps = set(computed)
+        else:
+            uses = [0] * len(self.nodes)
+            for _, _, operands in self.nodes:
+                for operand in set(operands):
+                    uses[operand] += 1
+            for root in roots:
+                uses[root] += 1
+            self._temps = {i for i in computed if uses[i] > 1}
+
+        lines = [f"def {name}({args}):"]
+        for node_id in computed:
+            if node_id in self._temps:
+                lines.append(f"    _t{node_id} = {self.render(node_id, vectorized)}")
+        if vectorized:
+            results = ", ".join(self._name(r) for r in roots)
+            lines.append(f"    return _stack(({results},), ({args},))")
+        else:
+            bits = " | ".join(f"(bool({self._name(r)}) << {i})" for i, r in enumerate(roots)) or "0"
+            lines.append(f"    return {bits}")
+        return "\n".join(lines)
+
+
+def _all(values):
+    """Element-wise logical AND of several operands."""
+    result = np.logical_and(values[0], values[1])
+    for value in values[2:]:
+        result = np.logical_and(result, value)
+    return result
+
+
+def _any(values):
+    """Element-wise logical OR of several operands."""
+    result = np.logical_or(values[0], values[1])
+    for value in values[2:]:
+        result = np.logical_or(result, value)
+    return result
+
+
+def _stack(results, args):
+    """Stack per-category results into an (individuals, categories) boolean matrix."""
+    shape = np.broadcast(*args).shape
+    return np.stack([np.broadcast_to(np.asarray(r, dtype=bool), shape) for r in results], axis=-1)
+
+
+class CompiledCategories:
+    """
+    A category dictionary compiled into one fused evaluator.
+
+    Shared sub-expressions (such as the leap-year test) are evaluated once per call.
+    Scalar arguments produce an integer bitmask (bit i set for the i-th category) and
+    NumPy array arguments produce a boolean matrix of shape (individuals, categories).
+    """
+
+    def __init__(self, category_dict):
+        """
+        Compile a category dictionary.
+
+        Args:
+            category_dict: Dictionary mapping category names to validation functions
+
+        Raises:
+            PredicateCompileError: If a category function cannot be compiled, e.g. one with
+                default, keyword-only or variadic arguments
+        """
+        self.names = list(category_dict.keys())
+        for check in category_dict.values():
+            code = getattr(check, "__code__", None)
+            if code is None:
+                raise PredicateCompileError(f"Not a Python function: {check!r}")
+            # Defaults, keyword-only and variadic arguments change the call shape
+            if (check.__defaults__ or check.__kwdefaults__ or code.co_kwonlyargcount
+                    or code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS)):
+                raise PredicateCompileError(f"Category functions must take exactly (d, m, y) or (d, m, y, f): {check!r}")
+        arities = {check.__code__.co_argcount for check in category_dict.values()}
+        if len(arities) > 1:
+            raise PredicateCompileError("All category functions must take the same arguments")
+        self.arity = arities.pop() if arities else 3
+        if self.arity not in (3, 4):
+            raise PredicateCompileError("Category functions must take (d, m, y) or (d, m, y, f)")
+
+        graph = _ExpressionGraph(self.arity)
+        roots = []
+        for check in category_dict.values():
+            if check.__code__.co_freevars:
+                raise PredicateCompileError(f"Closures are not supported: {check!r}")
+            args, body = _function_node(check)
+            arguments = {arg.arg: ARGUMENT_NAMES[i] for i, arg in enumerate(args.posonlyargs + args.args)}
+            roots.append(graph.add_expression(body, arguments))
+
+        self.scalar_source = graph.generate(roots, vectorized=False)
+        self.array_source = graph.generate(roots, vectorized=True)
+        namespace = {"_all": _all, "_any": _any, "_not": np.logical_not, "_isin": np.isin, "_stack": _stack}
+        exec(self.scalar_source, namespace)
+        exec(self.array_source, namespace)
+        self._scalar_kernel = namespace["_scalar_kernel"]
+        self._array_kernel = namespace["_array_kernel"]
+        self._names_by_mask: Dict[int, tuple] = {}
+
+    def mask(self, *args) -> int:
+        """
+        Evaluate all categories for one genome.
+
+        Args:
+            *args: day, month, year (and format type for format-aware instances)
+
+        Returns:
+            Integer bitmask with bit i set if the genome belongs to the i-th category
+        """
+        return self._scalar_kernel(*args)
+
+    def matrix(self, *args) -> np.ndarray:
+        """
+        Evaluate all categories for arrays of genomes.
+
+        Args:
+            *args: Arrays (or scalars, broadcast) of day, month, year (and format type strings)
+
+        Returns:
+            Boolean matrix of shape (individuals, categories)
+        """
+        if not self.names:
+            return np.zeros(np.broadcast(*args).shape + (0,), dtype=bool)
+        return self._array_kernel(*args)
+
+    def evaluate(self, *args):
+        """
+        Evaluate all categories on scalars or arrays.
+
+        Args:
+            *args: day, month, year (and format type) as scalars or arrays
+
+        Returns:
+            An integer bitmask for scalar arguments, or a boolean matrix for array arguments
+        """
+        if any(np.ndim(a) for a in args):
+            return self.matrix(*[np.asarray(a) for a in args])
+        return self.mask(*args)
+
+    def categories(self, *args) -> tuple:
+        """
+        Get the names of the categories a genome belongs to.
+
+        Args:
+            *args: day, month, year (and format type for format-aware instances)
+
+        Returns:
+            Tuple of category names in category dictionary order
+        """
+        mask = self._scalar_kernel(*args)
+        names = self._names_by_mask.get(mask)
+        if names is None:
+            names = tuple(name for i, name in enumerate(self.names) if mask >> i & 1)
+            self._names_by_mask[mask] = names
+        return names
+
+
+def compile_categories(category_dict) -> Optional[CompiledCategories]:
+    """
+    Compile a category dictionary, falling back to None if it is not supported.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+
+    Returns:
+        The CompiledCategories, or None if any category function cannot be compiled
+    """
+    if not category_dict:
+        return None
+    try:
+        return CompiledCategories(category_dict)
+    except (PredicateCompileError, SyntaxError):
+        return None
@@ -0,0 +1,110 @@
+import time
+from contextlib import contextmanager, nullcontext
+from typing import List, Dict, Any, Optional
+
+
+class RunStats:
+    """
+    Wall-clock time and call counts per phase of a GA run, in total and per generation.
+
+    Phases are timed with the monotonic perf_counter clock:
+
+        with stats.phase("fitness"):
+            fitness = calculate_fitness(population)
+
+    Time spent between start_generation() and end_generation() is also recorded for
+    that generation.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.times: Dict[str, float] = {}  # Seconds per phase
+        self.calls: Dict[str, int] = {}  # Number of timed calls per phase
+        self.generations: List[Dict[str, float]] = []  # Seconds per phase of every generation
+        self._generation: Optional[Dict[str, float]] = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of code as one call of a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.times[name] = self.times.get(name, 0.0) + elapsed
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if self._generation is not None:
+                self._generation[name] = self._generation.get(name, 0.0) + elapsed
+
+    def start_generation(self):
+        """Start recording the phases of a new generation."""
+        self._generation = {}
+        self.generations.append(self._generation)
+
+    def end_generation(self):
+        """Stop recording phases for the current generation."""
+        self._generation = None
+
+    def merge(self, other: "RunStats"):
+        """
+        Add the totals and generations of another run's statistics to these.
+
+        Args:
+            other: Statistics to merge, e.g. those of the engine into those of a runner
+        """
+        for name, seconds in other.times.items():
+            self.times[name] = self.times.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + other.calls[name]
+        self.generations.extend(other.generations)
+
+    @property
+    def total(self) -> float:
+        """Total seconds over all phases."""
+        return sum(self.times.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the statistics as plain data, e.g. for JSON output.
+
+        Returns:
+            Dictionary with the keys phases (seconds and calls per phase) and generations
+        """
+        return {
+            "phases": {name: {"seconds": self.times[name], "calls": self.calls[name]} for name in self.times},
+            "generations": [dict(generation) for generation in self.generations],
+        }
+
+    def summary(self) -> str:
+        """
+        Format the time breakdown as a table, slowest phase first.
+
+        Returns:
+            Multi-line string with seconds, share of the total, calls and mean time per call
+        """
+        total = self.total or 1.0
+        lines = [f"{'Phase':<16}{'Seconds':>10}{'Share':>9}{'Calls':>9}{'Per call':>12}"]
+        for name in sorted(self.times, key=self.times.get, reverse=True):
+            seconds, calls = self.times[name], self.calls[name]
+            lines.append(f"{name:<16}{seconds:>10.4f}{seconds / total:>8.1%}{calls:>9}"
+                         f"{seconds / calls * 1000:>10.3f}ms")
+        lines.append(f"{'total':<16}{self.total:>10.4f}   over {len(self.generations)} generations")
+        return "\n".join(lines)
+
+
+class _NullStats:
+    """Stand-in for RunStats when instrumentation is off; every method is a no-op."""
+
+    _context = nullcontext()
+
+    def phase(self, name: str):
+        return self._context
+
+    def start_generation(self):
+        pass
+
+    def end_generation(self):
+        pass
+
+
+# Shared no-op statistics used by runs without instrumentation
+NULL_STATS = _NullStats()
@@ -0,0 +1,87 @@
+from typing import List, Dict, Any, Sequence, Union
+import random
+import numpy as np
+
+
+class RNG:
+    """
+    Random number context of a GA run, backed by a NumPy Generator.
+
+    The engine draws whole generations at once (parent pairs, crossover and mutation
+    masks, mutation values) from this context instead of calling the random module
+    once per gene. Runs with the same seed reproduce exactly, and spawn() derives
+    statistically independent streams for parallel workers.
+    """
+
+    def __init__(self, seed: Union[None, int, Sequence[int], np.random.SeedSequence] = None):
+        """
+        Initialize an RNG context.
+
+        Args:
+            seed: Seed or SeedSequence. None derives the seed from the random module, so
+                code that calls random.seed() still gets reproducible runs
+        """
+        if seed is None:
+            seed = random.getrandbits(128)
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_sequence))
+
+    def spawn(self, count: int) -> List["RNG"]:
+        """
+        Derive independent child streams, e.g. one per worker process or island.
+
+        Args:
+            count: Number of streams
+
+        Returns:
+            List of RNG contexts
+        """
+        return [RNG(child) for child in self.seed_sequence.spawn(count)]
+
+    def random(self, size=None):
+        """Uniform floats in [0, 1)."""
+        return self.generator.random(size)
+
+    def randint(self, low: int, high: int, size=None):
+        """Integers in [low, high], inclusive like random.randint."""
+        if size is None:
+            return int(self.generator.integers(low, high + 1))
+        return self.generator.integers(low, high + 1, size)
+
+    def choice(self, values: Sequence[Any], size=None):
+        """Uniform draws from a sequence of values."""
+        if size is None:
+            return values[int(self.generator.integers(0, len(values)))]
+        return np.asarray(values)[self.generator.integers(0, len(values), size)]
+
+    def getstate(self) -> Dict[str, Any]:
+        """
+        Get the generator state, e.g. for checkpointing.
+
+        Returns:
+            The bit generator state dictionary
+        """
+        return self.generator.bit_generator.state
+
+    def setstate(self, state: Dict[str, Any]):
+        """
+        Restore a state returned by getstate().
+
+        Args:
+            state: A bit generator state dictionary
+        """
+        self.generator.bit_generator.state = state
+
+
+def make_rng(seed: Union[None, int, Sequence[int], np.random.SeedSequence, RNG] = None) -> RNG:
+    """
+    Get an RNG context for a seed.
+
+    Args:
+        seed: An existing RNG context (returned as is), a seed, or None to derive the
+            seed from the random module
+
+    Returns:
+        An RNG context
+    """
+    return seed if isinstance(seed, RNG) else RNG(seed)
@@ -0,0 +1,357 @@
+import math
+import time
+from collections import deque
+from typing import List, Dict, Tuple, Any, Optional, Sequence, Set, Callable
+import numpy as np
+from .test_case import TestCase, InstanceContext, validate_population
+from .schema import GenomeSchema
+from .rng import RNG
+from .genome_index import (iter_genome_blocks, load_genome_index, is_format_aware, boundary_category_mask,
+                           is_boundary, FORMATS, DAY_RANGE, MONTH_RANGE, YEAR_RANGE, BOUNDARY_YEARS)
+from ..utils.validation import get_batch_validator
+
+# Seconds a quota may take to fill before giving up
+FILL_TIME_LIMIT = 10.0
+
+# Years per chunk of a (day, month) block read at a time by GenomePools
+POOL_CHUNK_YEARS = 500
+
+# Regions with at most this many genomes are drawn from a full permutation, so running
+# out of candidates is detected exactly; larger regions are drawn from at random
+ENUMERATION_LIMIT = 1 << 16
+
+# Largest number of candidates built and validated at once
+MAX_SAMPLE_BATCH = 4096
+
+
+# Quotas filled by fill_quota. Boundary test cases belong to a category whose name starts
+# with "Boundary" or have a boundary year
+POOLS = ("valid", "invalid", "boundary")
+
+# Regions of (day, month, year) searched by the fallback sampler, for instances whose
+# genome space cannot be enumerated
+FALLBACK_REGIONS = {
+    "valid": (range(1, 29), range(1, 13), range(1, 9999)),
+    "invalid": (range(32, 41), range(1, 16), range(0, 10000)),
+    "boundary": (range(1, 32), range(1, 13), YEAR_RANGE),
+}
+
+
+class QuotaError(ValueError):
+    """A quota of test cases with a required property cannot be met."""
+
+
+class GenomePools:
+    """
+    Valid, invalid and boundary genomes of an instance, drawn chunk by chunk.
+
+    The genome space is read in chunks of POOL_CHUNK_YEARS years of a (day, month) block
+    (see iter_genome_blocks). A draw visits the chunks in random order and takes a random
+    member of the pool from each, so it usually reads only a few chunks; the whole space
+    is read only when the pool is small.
+    """
+
+    def __init__(self, category_dict=None, validator=None, index=None,
+                 formats: Optional[Sequence[str]] = None):
+        """
+        Initialize the pools of an instance.
+
+        Args:
+            category_dict: Dictionary mapping category names to validation functions
+            validator: The validation function to use
+            index: Optional GenomeIndex of the instance to read the bit rows from
+            formats: Formats the genomes may have (format-aware instances only, defaults to all)
+        """
+        self.category_dict = category_dict
+        self.validator = validator
+        self.index = index
+        context = InstanceContext.get(category_dict, validator)
+        self.valid_bit = len(context.category_names)
+        boundary_mask = boundary_category_mask(context.category_names)
+        self.boundary_columns = [i for i in range(self.valid_bit) if boundary_mask >> i & 1]
+        self.num_formats = len(FORMATS) if is_format_aware(category_dict) else 1
+        self.allowed_formats = (np.isin(np.arange(self.num_formats), [FORMATS.index(fmt) for fmt in formats])
+                                if formats is not None and self.num_formats > 1 else np.ones(self.num_formats, bool))
+        self.chunks = [(day, month, range(year, min(year + POOL_CHUNK_YEARS, YEAR_RANGE[1] + 1)))
+                       for day in range(DAY_RANGE[0], DAY_RANGE[1] + 1)
+                       for month in range(MONTH_RANGE[0], MONTH_RANGE[1] + 1)
+                       for year in range(YEAR_RANGE[0], YEAR_RANGE[1] + 1, POOL_CHUNK_YEARS)]
+
+    def _members(self, pool: str, years: range, rows: np.ndarray) -> np.ndarray:
+        """Get the rows of a chunk that belong to a pool."""
+        bits = np.unpackbits(rows, axis=1, bitorder="little")
+        if pool == "boundary":
+            year_of_row = np.repeat(np.arange(years.start, years.stop), self.num_formats)
+            members = is_boundary(bits[:, self.boundary_columns].any(axis=1), year_of_row)
+        else:
+            members = bits[:, self.valid_bit].astype(bool) == (pool == "valid")
+        return np.flatnonzero(members & np.tile(self.allowed_formats, len(years)))
+
+    def sample(self, schema: GenomeSchema, pool: str, count: int, rng: RNG, seen: Optional[Set[Any]] = None,
+               key: Callable[[TestCase], Any] = lambda tc: tc.date_str,
+               time_limit: float = FILL_TIME_LIMIT) -> List[TestCase]:
+        """
+        Draw distinct test cases from a pool.
+
+        Every visited chunk contributes one random member not in seen, so the test cases
+        spread over the genome space. Once every chunk has been visited, chunks with
+        members left are visited again in turn. For the boundary pool, the chunks holding
+        a boundary year are visited first.
+
+        Args:
+            schema: Genome schema building the test cases
+            pool: One of POOLS
+            count: Number of test cases to draw
+            rng: RNG context
+            seen: Keys of test cases already in the suite; keys of drawn test cases are added
+            key: Key identifying equal test cases
+            time_limit: Seconds the draw may take
+
+        Returns:
+            The drawn test cases, in draw order
+
+        Raises:
+            QuotaError: If the pool holds fewer than count test cases not in seen, or they
+                are not found within time_limit seconds
+        """
+        seen = set() if seen is None else seen
+        found: List[TestCase] = []
+        if count <= 0:
+            return found
+
+        if pool == "valid" and not self.validator:
+            raise QuotaError(f"No valid test cases exist without a validator, {count} are needed")
+
+        deadline = time.monotonic() + time_limit
+        order = [self.chunks[i] for i in rng.generator.permutation(len(self.chunks)).tolist()]
+        if pool == "boundary":
+            # Chunks holding a boundary year come first; the others can only hold boundary categories
+            order.sort(key=lambda chunk: not any(year in chunk[2] for year in BOUNDARY_YEARS))
+        unfinished = deque()  # (day, month, years, member rows not yet drawn) of chunks with members left
+
+        def draw(day: int, month: int, years: range, members: np.ndarray) -> np.ndarray:
+            """Take a random member not in seen and return the remaining ones."""
+            while len(members):
+                i = int(rng.generator.integers(len(members)))
+                row = int(members[i])
+                members = np.delete(members, i)
+                genome = (day, month, years.start + row // self.num_formats)
+                if self.num_formats > 1:
+                    genome += (FORMATS[row % self.num_formats],)
+                tc = schema.build(genome, self.category_dict, self.validator)
+                if key(tc) not in seen:
+                    seen.add(key(tc))
+                    found.append(tc)
+                    break
+            return members
+
+        chunks = iter_genome_blocks(self.category_dict, self.validator, self.index, order)
+        for (day, month, rows), (_, _, years) in zip(chunks, order):
+            members = draw(day, month, years, self._members(pool, years, rows))
+            if len(members):
+                unfinished.append((day, month, years, members))
+            if len(found) == count:
+                return found
+            if time.monotonic() > deadline:
+                break
+        while unfinished and len(found) < count and time.monotonic() <= deadline:
+            day, month, years, members = unfinished.popleft()
+            members = draw(day, month, years, members)
+            if len(members):
+                unfinished.append((day, month, years, members))
+        if len(found) == count:
+            return found
+
+        if time.monotonic() > deadline:
+            raise QuotaError(f"Found only {len(found)} of {count} {pool} test cases within {time_limit}s")
+        raise QuotaError(f"Only {len(found)} of {count} {pool} test cases exist outside the suite")
+
+
+def load_genome_pools(category_dict=None, validator=None,
+                      formats: Optional[Sequence[str]] = None) -> Optional[GenomePools]:
+    """
+    Get the valid, invalid and boundary pools of an instance if its space can be enumerated.
+
+    The bit rows are read from the instance's genome index when one is attached or
+    stored on disk, otherwise evaluated with the fused predicate kernel and the batch
+    validator.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        formats: Formats the genomes may have (format-aware instances only, defaults to all)
+
+    Returns:
+        The GenomePools, or None if there is no index and the categories do not compile
+        or the validator has no batch form
+    """
+    context = InstanceContext.get(category_dict, validator)
+    index = context.index
+    if index is None:
+        index = load_genome_index(category_dict, validator, build=False)
+    if index is None and ((category_dict and context.kernel is None)
+                          or (validator and get_batch_validator(validator) is None)):
+        return None
+    return GenomePools(category_dict, validator, index, formats)
+
+
+def region_size(region: Sequence[Sequence[Any]]) -> int:
+    """
+    Get the number of genomes in a region.
+
+    Args:
+        region: Allowed values of every gene, in schema order
+
+    Returns:
+        Product of the numbers of values per gene
+    """
+    return math.prod(len(values) for values in region)
+
+
+def _region_genomes(region: Sequence[Sequence[Any]], indices: np.ndarray) -> List[tuple]:
+    """Decode flat region indices into genomes."""
+    components = np.unravel_index(indices, tuple(len(values) for values in region))
+    genes = [[values[i] for i in component.tolist()] for values, component in zip(region, components)]
+    return list(zip(*genes))
+
+
+def _index_batches(size: int, rng: RNG, first_batch: int):
+    """Yield batches of distinct flat indices of a region, in random order."""
+    batch_size = first_batch
+    if size <= ENUMERATION_LIMIT:
+        order = rng.generator.permutation(size)
+        for start in range(0, size, batch_size):
+            yield order[start:start + batch_size]
+            batch_size = min(batch_size * 2, MAX_SAMPLE_BATCH)
+        return
+
+    tried: Set[int] = set()
+    while len(tried) < size:
+        draws = [i for i in dict.fromkeys(rng.generator.integers(0, size, batch_size).tolist()) if i not in tried]
+        tried.update(draws)
+        yield np.array(draws, dtype=np.int64)
+        batch_size = min(batch_size * 2, MAX_SAMPLE_BATCH)
+
+
+def sample_test_cases(
+    schema: GenomeSchema,
+    region: Sequence[Sequence[Any]],
+    count: int,
+    accept: Callable[[TestCase], bool],
+    category_dict=None,
+    validator=None,
+    rng: Optional[RNG] = None,
+    seen: Optional[Set[Any]] = None,
+    key: Callable[[TestCase], Any] = lambda tc: tc.date_str,
+    description: str = "test cases",
+    time_limit: float = FILL_TIME_LIMIT
+) -> List[TestCase]:
+    """
+    Draw distinct test cases with a required property from a region of the genome space.
+
+    Candidates are drawn without replacement in growing batches, validated in one call
+    per batch and kept if they pass accept and their key is not in seen. Unlike drawing
+    and discarding one test case at a time, the search never revisits a genome, stops
+    once the region is exhausted and is bounded in time.
+
+    Args:
+        schema: Genome schema building the test cases
+        region: Allowed values of every gene in schema order, e.g.
+            (range(1, 29), range(1, 13), range(1, 9999)) for dates with days 1 to 28
+        count: Number of test cases to draw
+        accept: Required property, e.g. lambda tc: tc.is_valid
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        rng: RNG context
+        seen: Keys of test cases already in the suite; keys of drawn test cases are added
+        key: Key identifying equal test cases
+        description: Name of the property for error messages, e.g. "valid test cases"
+        time_limit: Seconds the search may take
+
+    Returns:
+        The drawn test cases
+
+    Raises:
+        QuotaError: If the region holds fewer than count acceptable test cases, or they
+            are not found within time_limit seconds
+    """
+    seen = set() if seen is None else seen
+    found: List[TestCase] = []
+    if count <= 0:
+        return found
+
+    size = region_size(region)
+    deadline = time.monotonic() + time_limit
+    examined = 0
+    for indices in _index_batches(size, rng, max(16, 2 * count)):
+        batch = [schema.build(genome, category_dict, validator) for genome in _region_genomes(region, indices)]
+        validate_population(batch)
+        examined += len(batch)
+        for tc in batch:
+            if key(tc) not in seen and accept(tc):
+                seen.add(key(tc))
+                found.append(tc)
+                if len(found) == count:
+                    return found
+        if time.monotonic() > deadline:
+            raise QuotaError(f"Found only {len(found)} of {count} {description} within {time_limit}s "
+                             f"({examined} of {size} candidates examined)")
+
+    raise QuotaError(f"Found only {len(found)} of {count} {description}: all {size} candidates "
+                     f"were examined")
+
+
+def fill_quota(
+    schema: GenomeSchema,
+    pool: str,
+    count: int,
+    pools: Optional[GenomePools],
+    category_dict=None,
+    validator=None,
+    rng: Optional[RNG] = None,
+    seen: Optional[Set[Any]] = None,
+    key: Callable[[TestCase], Any] = lambda tc: tc.date_str,
+    formats: Sequence[str] = FORMATS,
+    time_limit: float = FILL_TIME_LIMIT
+) -> List[TestCase]:
+    """
+    Draw the missing test cases of a valid, invalid or boundary quota.
+
+    Test cases are drawn from the pool of the instance when its genome space can be
+    enumerated (see load_genome_pools); otherwise the fallback region of the pool is
+    searched with sample_test_cases.
+
+    Args:
+        schema: Genome schema building the test cases
+        pool: One of POOLS
+        count: Number of test cases to draw
+        pools: GenomePools of the instance, or None to search the fallback region
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        rng: RNG context
+        seen: Keys of test cases already in the suite; keys of drawn test cases are added
+        key: Key identifying equal test cases
+        formats: Formats searched by the fallback sampler (format-aware schemas only)
+        time_limit: Seconds the draw may take
+
+    Returns:
+        The drawn test cases
+
+    Raises:
+        QuotaError: If the instance does not hold count such test cases outside seen, or
+            they are not found within time_limit seconds
+    """
+    if count <= 0:
+        return []
+    if pools is not None:
+        return pools.sample(schema, pool, count, rng, seen, key, time_limit)
+
+    region = FALLBACK_REGIONS[pool] + ((tuple(formats),) if len(schema.genes) > 3 else ())
+    if pool == "valid":
+        accept = lambda tc: tc.is_valid
+    elif pool == "invalid":
+        accept = lambda tc: not tc.is_valid
+    else:
+        accept = lambda tc: True  # Every genome of the boundary region has a boundary year
+    return sample_test_cases(schema, region, count, accept, category_dict, validator, rng, seen, key,
+                             f"{pool} test cases", time_limit)
@@ -0,0 +1,345 @@
+from typing import List, Dict, Any, Optional, Sequence, Set, Tuple, Callable
+import numpy as np
+from .test_case import TestCase
+from .rng import RNG, make_rng
+from .cache import make_test_case, make_test_case_format
+
+FORMATS = ("DD/MM/YYYY", "MM/DD/YYYY", "YYYY/MM/DD")
+
+# Candidate batches drawn when replacing duplicate genomes: offspring bred as usual,
+# then offspring with every gene mutated, then random genomes
+UNIQUE_BREED_ROUNDS = 3
+UNIQUE_MUTATE_ROUNDS = 3
+UNIQUE_RANDOM_ROUNDS = 10
+
+
+class GenomeSchema:
+    """
+    Description of a genome: its genes, their domains and their mutation value pools.
+
+    Each gene is a dictionary with the keys:
+        name: Attribute of the test case holding the gene
+        domain: (low, high) inclusive integer range of an integer gene
+        values: Allowed values of a categorical gene (instead of domain)
+        init_pool: Optional values drawn at initialization, together with one random
+            draw from the domain (otherwise genes are drawn from the domain only)
+        mutation_pool: Values a mutation picks from
+        mutation_random: Optional (low, high) range of one extra random value added to
+            the mutation pool on every mutation
+    """
+
+    def __init__(self, name: str, genes: List[Dict[str, Any]], seeds: Sequence[tuple], format_aware: bool):
+        """
+        Initialize a genome schema.
+
+        Args:
+            name: Name of the schema
+            genes: Gene definitions, in genome order
+            seeds: Genomes always included at the start of an initial population
+            format_aware: Whether genomes carry a format type and build TestCaseFormat objects
+        """
+        self.name = name
+        self.genes = genes
+        self.gene_names = tuple(gene["name"] for gene in genes)
+        self.seeds = [tuple(seed) for seed in seeds]
+        self.format_aware = format_aware
+
+    def genome(self, individual: TestCase) -> tuple:
+        """
+        Get the genome of a test case.
+
+        Args:
+            individual: A test case built by this schema
+
+        Returns:
+            Tuple of gene values in schema order
+        """
+        return tuple(getattr(individual, name) for name in self.gene_names)
+
+    def build(self, genome: Sequence[Any], category_dict=None, validator=None) -> TestCase:
+        """
+        Get the shared, evaluated test case for a genome.
+
+        Args:
+            genome: Gene values in schema order
+            category_dict: Dictionary mapping category names to validation functions
+            validator: The validation function to use
+
+        Returns:
+            A shared TestCase or TestCaseFormat object
+        """
+        if self.format_aware:
+            return make_test_case_format(*genome, category_dict, validator)
+        return make_test_case(*genome, category_dict, validator)
+
+    def columns(self, population: Sequence[TestCase]) -> List[np.ndarray]:
+        """
+        Get the genes of a population as one integer array per gene.
+
+        Categorical genes are stored as indices into their values.
+
+        Args:
+            population: Test cases built by this schema
+
+        Returns:
+            List of gene arrays in schema order
+        """
+        columns = []
+        for gene in self.genes:
+            values = [getattr(ind, gene["name"]) for ind in population]
+            if "values" in gene:
+                codes = {value: i for i, value in enumerate(gene["values"])}
+                values = [codes[value] for value in values]
+            columns.append(np.array(values, dtype=np.int64))
+        return columns
+
+    def genomes(self, columns: Sequence[np.ndarray]) -> List[tuple]:
+        """
+        Convert gene arrays back to genome tuples.
+
+        Args:
+            columns: Gene arrays in schema order
+
+        Returns:
+            List of genomes
+        """
+        values = []
+        for gene, column in zip(self.genes, columns):
+            column = column.tolist()
+            if "values" in gene:
+                column = [gene["values"][code] for code in column]
+            values.append(column)
+        return list(zip(*values))
+
+    def random_columns(self, size: int, rng: RNG) -> List[np.ndarray]:
+        """
+        Draw random genes for the initial population.
+
+        Args:
+            size: Number of genomes
+            rng: RNG context
+
+        Returns:
+            List of gene arrays in schema order
+        """
+        columns = []
+        for gene in self.genes:
+            if "values" in gene:
+                columns.append(rng.generator.integers(0, len(gene["values"]), size))
+            elif gene.get("init_pool"):
+                columns.append(_draw_from_pool(gene["init_pool"], gene["domain"], size, rng))
+            else:
+                columns.append(rng.randint(*gene["domain"], size))
+        return columns
+
+    def initialize_population(self, size: int, category_dict=None, validator=None,
+                              rng: Optional[RNG] = None, unique: bool = False) -> List[TestCase]:
+        """
+        Initialize a population: the seed genomes followed by random genomes.
+
+        Args:
+            size: The size of the population
+            category_dict: Dictionary mapping category names to validation functions
+            validator: The validation function to use
+            rng: RNG context (derived from the random module if omitted)
+            unique: Whether every genome of the population must be distinct
+
+        Returns:
+            A list of test case objects
+        """
+        rng = make_rng(rng)
+        if unique:
+            genomes = list(dict.fromkeys(self.seeds))[:size]
+            random_genomes, _ = self.unique_genomes(size - len(genomes), set(genomes),
+                                                    [self._random_draw(rng)] * UNIQUE_RANDOM_ROUNDS)
+            genomes += random_genomes
+        else:
+            genomes = self.seeds + self.genomes(self.random_columns(max(0, size - len(self.seeds)), rng))
+        return [self.build(genome, category_dict, validator) for genome in genomes]
+
+    def crossover_columns(self, first: Sequence[np.ndarray], second: Sequence[np.ndarray],
+                          rng: RNG) -> List[np.ndarray]:
+        """
+        Uniform crossover: each gene is taken from either parent with equal probability.
+
+        Args:
+            first: Gene arrays of the first parents
+            second: Gene arrays of the second parents
+            rng: RNG context
+
+        Returns:
+            Gene arrays of the children
+        """
+        pick_first = rng.random((len(self.genes), len(first[0]))) < 0.5
+        return [np.where(pick, a, b) for pick, a, b in zip(pick_first, first, second)]
+
+    def mutate_columns(self, columns: Sequence[np.ndarray], rng: RNG, mutation_rate: float = 0.15) -> List[np.ndarray]:
+        """
+        Replace each gene by a value from its mutation pool with the given probability.
+
+        Args:
+            columns: Gene arrays
+            rng: RNG context
+            mutation_rate: Probability of mutation for each gene
+
+        Returns:
+            The mutated gene arrays
+        """
+        size = len(columns[0])
+        mutate = rng.random((len(self.genes), size)) < mutation_rate
+        mutated = []
+        for gene, column, mask in zip(self.genes, columns, mutate):
+            count = int(mask.sum())
+            if count:
+                column = column.copy()
+                if "values" in gene:
+                    codes = {value: i for i, value in enumerate(gene["values"])}
+                    pool = np.array([codes[value] for value in gene["mutation_pool"]])
+                    column[mask] = pool[rng.generator.integers(0, len(pool), count)]
+                else:
+                    column[mask] = _draw_from_pool(gene["mutation_pool"], gene.get("mutation_random"), count, rng)
+            mutated.append(column)
+        return mutated
+
+    def breed(self, parents: Sequence[TestCase], num_offspring: int, rng: RNG,
+              mutation_rate: float = 0.15) -> List[tuple]:
+        """
+        Produce the offspring genomes of a generation with batched draws.
+
+        Each offspring has two distinct parents; the parent pairs, crossover masks,
+        mutation masks and mutation values of all offspring are drawn at once.
+
+        Args:
+            parents: Selected parent test cases (at least two)
+            num_offspring: Number of offspring to produce
+            rng: RNG context
+            mutation_rate: Probability of mutation for each gene
+
+        Returns:
+            List of offspring genomes
+        """
+        first = rng.generator.integers(0, len(parents), num_offspring)
+        second = rng.generator.integers(0, len(parents) - 1, num_offspring)
+        second = second + (second >= first)
+
+        columns = self.columns(parents)
+        children = self.crossover_columns([c[first] for c in columns], [c[second] for c in columns], rng)
+        return self.genomes(self.mutate_columns(children, rng, mutation_rate))
+
+    def breed_unique(self, parents: Sequence[TestCase], num_offspring: int, rng: RNG,
+                     mutation_rate: float = 0.15, taken: Optional[Set[tuple]] = None) -> Tuple[List[tuple], int]:
+        """
+        Produce offspring genomes that are distinct from each other and from the taken genomes.
+
+        Duplicates are detected in a genome hash set before anything is built. They are
+        replaced by newly bred offspring, then by offspring with every gene mutated and
+        finally by random genomes.
+
+        Args:
+            parents: Selected parent test cases
+            num_offspring: Number of offspring to produce
+            rng: RNG context
+            mutation_rate: Probability of mutation for each gene
+            taken: Genomes the offspring must differ from, e.g. those of the parents; the
+                offspring genomes are added to it
+
+        Returns:
+            Tuple of (offspring genomes, number of duplicate genomes avoided)
+        """
+        taken = set() if taken is None else taken
+        draws = [self._random_draw(rng)] * UNIQUE_RANDOM_ROUNDS
+        if len(parents) >= 2:
+            draws = ([lambda count: self.breed(parents, count, rng, mutation_rate)] * UNIQUE_BREED_ROUNDS
+                     + [lambda count: self.breed(parents, count, rng, 1.0)] * UNIQUE_MUTATE_ROUNDS + draws)
+        return self.unique_genomes(num_offspring, taken, draws)
+
+    def unique_genomes(self, count: int, taken: Set[tuple],
+                       draws: Sequence[Callable[[int], List[tuple]]]) -> Tuple[List[tuple], int]:
+        """
+        Collect genomes not yet taken from successive batches of candidates.
+
+        Args:
+            count: Number of genomes to collect
+            taken: Genomes to avoid; the collected genomes are added to it
+            draws: Functions returning a given number of candidate genomes, called in turn
+                until enough distinct genomes are collected
+
+        Returns:
+            Tuple of (genomes, number of duplicate candidates rejected)
+
+        Raises:
+            ValueError: If the draws are exhausted before count distinct genomes are found
+        """
+        genomes = []
+        duplicates = 0
+        for draw in draws:
+            if len(genomes) == count:
+                break
+            for genome in draw(count - len(genomes)):
+                if genome in taken:
+                    duplicates += 1
+                else:
+                    taken.add(genome)
+                    genomes.append(genome)
+        if len(genomes) < count:
+            raise ValueError(f"Could not find {count} distinct {self.name} genomes; "
+                             f"the population is too large for the genome space")
+        return genomes, duplicates
+
+    def _random_draw(self, rng: RNG) -> Callable[[int], List[tuple]]:
+        """Candidate draw producing random genomes."""
+        return lambda count: self.genomes(self.random_columns(count, rng))
+
+
+def _draw_from_pool(pool: Sequence[int], random_range: Optional[Sequence[int]], size: int, rng: RNG) -> np.ndarray:
+    """Draw from a value pool extended by one random integer from random_range (inclusive), if given."""
+    pool = np.asarray(pool)
+    if random_range is None:
+        return pool[rng.generator.integers(0, len(pool), size)]
+    slot = rng.generator.integers(0, len(pool) + 1, size)
+    drawn = rng.randint(*random_range, size)
+    return np.where(slot == len(pool), drawn, pool[np.minimum(slot, len(pool) - 1)])
+
+
+# Day/month/year genomes used by the original instance and instances 1-3
+DATE_SCHEMA = GenomeSchema(
+    name="date",
+    genes=[
+        {"name": "day", "domain": (1, 40), "mutation_pool": (1, 28, 29, 30, 31), "mutation_random": (32, 40)},
+        {"name": "month", "domain": (1, 15), "mutation_pool": (1, 2, 4, 6, 9, 11, 12), "mutation_random": (13, 15)},
+        {"name": "year", "domain": (0, 9999), "init_pool": (0, 9999),
+         "mutation_pool": (0, 9999, 2020, 2021), "mutation_random": (0, 9999)},
+    ],
+    seeds=[
+        (29, 2, 2020),  # Valid Leap Year
+        (30, 4, 2023),  # Valid 30-Day Month
+        (31, 12, 9999),  # Valid 31-Day Month, Boundary Max Year
+        (32, 5, 2023),  # Invalid Day > 31
+        (15, 13, 2023),  # Invalid Month > 12
+        (29, 2, 2021),  # Invalid Feb 29 Non-Leap
+        (1, 1, 0),  # Boundary Min Year
+        (1, 1, 9999),  # Boundary Max Year
+    ],
+    format_aware=False,
+)
+
+# Day/month/year/format genomes used by Instance 4
+DATE_FORMAT_SCHEMA = GenomeSchema(
+    name="date_format",
+    genes=[
+        {"name": "day", "domain": (1, 40), "mutation_pool": (1, 28, 29, 30, 31), "mutation_random": (32, 40)},
+        {"name": "month", "domain": (1, 15), "mutation_pool": (1, 2, 4, 6, 9, 11, 12), "mutation_random": (13, 15)},
+        {"name": "year", "domain": (0, 9999), "mutation_pool": (0, 9999, 2020, 2021), "mutation_random": (0, 9999)},
+        {"name": "format_type", "values": FORMATS, "mutation_pool": FORMATS},
+    ],
+    seeds=[
+        (15, 5, 2023, "DD/MM/YYYY"),
+        (5, 15, 2023, "MM/DD/YYYY"),
+        (15, 5, 2023, "YYYY/MM/DD"),
+        (5, 6, 2023, "DD/MM/YYYY"),  # Ambiguous
+    ],
+    format_aware=True,
+)
+
+# Schemas by name, used to restore populations saved to disk
+SCHEMAS: Dict[str, GenomeSchema] = {schema.name: schema for schema in (DATE_SCHEMA, DATE_FORMAT_SCHEMA)}
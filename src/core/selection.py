@@ -0,0 +1,126 @@
+import random
+from typing import Dict, Callable, Optional, Sequence, Union
+import numpy as np
+
+FitnessValues = Union[Sequence[float], np.ndarray]
+
+
+def _default_rng(rng: Optional[np.random.Generator]) -> np.random.Generator:
+    """Use the given generator, or derive one from the global random module so random.seed() applies."""
+    return rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+
+
+def truncation_selection(fitness: FitnessValues, num_parents: int,
+                         rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Select the fittest individuals in linear time.
+
+    The cut-off fitness is found with a partition instead of a full sort. Ties at the
+    cut-off are broken in favour of earlier individuals, so the selected set matches
+    that of a stable sort by descending fitness.
+
+    Args:
+        fitness: Fitness values (list or array)
+        num_parents: Number of parents to select
+        rng: Unused; accepted for a uniform strategy signature
+
+    Returns:
+        Indices of the selected parents, in population order
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    n = len(fitness)
+    if num_parents >= n:
+        return np.arange(n)
+    if num_parents <= 0:
+        return np.arange(0)
+
+    cutoff = np.partition(fitness, n - num_parents)[n - num_parents]
+    selected = fitness > cutoff
+    ties = np.flatnonzero(fitness == cutoff)
+    selected[ties[:num_parents - int(selected.sum())]] = True
+    return np.flatnonzero(selected)
+
+
+def tournament_selection(fitness: FitnessValues, num_parents: int,
+                         rng: Optional[np.random.Generator] = None, tournament_size: int = 2) -> np.ndarray:
+    """
+    Select parents by tournaments between randomly drawn individuals.
+
+    All tournaments are drawn in one batch; each is won by its fittest contestant.
+
+    Args:
+        fitness: Fitness values (list or array)
+        num_parents: Number of parents to select
+        rng: NumPy random generator
+        tournament_size: Number of contestants per tournament
+
+    Returns:
+        Indices of the selected parents (an individual may be selected more than once)
+    """
+    fitness = np.asarray(fitness, dtype=float)
+    if len(fitness) == 0 or num_parents <= 0:
+        return np.arange(0)
+    rng = _default_rng(rng)
+    contestants = rng.integers(0, len(fitness), (num_parents, tournament_size))
+    winners = np.argmax(fitness[contestants], axis=1)
+    return contestants[np.arange(num_parents), winners]
+
+
+def stochastic_universal_sampling(fitness: FitnessValues, num_parents: int,
+                                  rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Select parents with stochastic universal sampling.
+
+    Equally spaced pointers with a single random offset sweep the cumulative fitness,
+    so each individual is selected in proportion to its fitness with minimal spread.
+    If every fitness is zero, individuals are selected uniformly.
+
+    Args:
+        fitness: Fitness values (list or array)
+        num_parents: Number of parents to select
+        rng: NumPy random generator
+
+    Returns:
+        Indices of the selected parents (an individual may be selected more than once)
+    """
+    fitness = np.clip(np.asarray(fitness, dtype=float), 0, None)
+    n = len(fitness)
+    if n == 0 or num_parents <= 0:
+        return np.arange(0)
+    rng = _default_rng(rng)
+
+    total = fitness.sum()
+    if total <= 0:
+        fitness = np.ones(n)
+        total = float(n)
+    step = total / num_parents
+    pointers = rng.random() * step + step * np.arange(num_parents)
+    indices = np.searchsorted(np.cumsum(fitness), pointers, side="right")
+    return np.minimum(indices, n - 1)
+
+
+SELECTION_STRATEGIES: Dict[str, Callable[..., np.ndarray]] = {
+    "truncation": truncation_selection,
+    "tournament": tournament_selection,
+    "sus": stochastic_universal_sampling,
+}
+
+
+def get_selection(selection: Union[str, Callable[..., np.ndarray]] = "truncation") -> Callable[..., np.ndarray]:
+    """
+    Resolve a selection strategy.
+
+    Args:
+        selection: Strategy name ("truncation", "tournament" or "sus") or a callable
+            taking (fitness, num_parents, rng) and returning parent indices
+
+    Returns:
+        The selection function
+    """
+    if callable(selection):
+        return selection
+    try:
+        return SELECTION_STRATEGIES[selection]
+    except KeyError:
+        raise ValueError(f"Unknown selection strategy '{selection}', "
+                         f"expected one of: {', '.join(SELECTION_STRATEGIES)}") from None
@@ -0,0 +1,234 @@
+from typing import List, Dict, Tuple, Any, Optional, Sequence
+import heapq
+import numpy as np
+from .test_case import InstanceContext
+from .genome_index import (iter_genome_blocks, load_genome_index, is_format_aware, boundary_category_mask,
+                           is_boundary, FORMATS, YEAR_RANGE, BOUNDARY_YEARS)
+
+# Largest number of categories the exact branch-and-bound search accepts
+MAX_EXACT_CATEGORIES = 32
+
+
+def greedy_set_cover(masks: Sequence[int], universe: int) -> List[int]:
+    """
+    Greedy set cover with lazy priority-queue updates.
+
+    The gain of a set only shrinks as elements get covered, so a popped set whose
+    recomputed gain still matches its queued gain is the best remaining choice; stale
+    entries are pushed back with their current gain instead of rescoring every set.
+
+    Args:
+        masks: Element bitmask of every set
+        universe: Bitmask of the elements to cover
+
+    Returns:
+        Indices of the chosen sets, in the order they were chosen
+    """
+    heap = [(-(mask & universe).bit_count(), i) for i, mask in enumerate(masks) if mask & universe]
+    heapq.heapify(heap)
+    uncovered = universe
+    chosen = []
+    while uncovered and heap:
+        queued_gain, i = heapq.heappop(heap)
+        gain = (masks[i] & uncovered).bit_count()
+        if gain == -queued_gain:
+            chosen.append(i)
+            uncovered &= ~masks[i]
+        elif gain:
+            heapq.heappush(heap, (-gain, i))
+    return chosen
+
+
+def exact_set_cover(masks: Sequence[int], universe: int) -> List[int]:
+    """
+    Minimum set cover by branch and bound.
+
+    Sets dominated by another set are dropped, the greedy cover is the initial upper
+    bound, and each node branches on the sets covering the lowest uncovered element.
+
+    Args:
+        masks: Element bitmask of every set
+        universe: Bitmask of the elements to cover (at most MAX_EXACT_CATEGORIES elements)
+
+    Returns:
+        Indices of the sets of a minimum cover of the coverable elements
+
+    Raises:
+        ValueError: If the universe has more than MAX_EXACT_CATEGORIES elements
+    """
+    if universe.bit_count() > MAX_EXACT_CATEGORIES:
+        raise ValueError(f"Exact set cover supports at most {MAX_EXACT_CATEGORIES} categories, "
+                         f"got {universe.bit_count()}")
+
+    # Keep one set per distinct restricted mask, and only those not contained in another
+    by_mask = {}
+    for i, mask in enumerate(masks):
+        by_mask.setdefault(mask & universe, i)
+    candidates = []
+    for mask in sorted(by_mask, key=lambda mask: mask.bit_count(), reverse=True):
+        if mask and not any(mask & ~kept == 0 for kept, _ in candidates):
+            candidates.append((mask, by_mask[mask]))
+
+    coverable = 0
+    for mask, _ in candidates:
+        coverable |= mask
+    best = greedy_set_cover([mask for mask, _ in candidates], coverable)
+
+    def search(uncovered: int, chosen: List[int]):
+        nonlocal best
+        if not uncovered:
+            if len(chosen) < len(best):
+                best = list(chosen)
+            return
+        largest = max((mask & uncovered).bit_count() for mask, _ in candidates)
+        if len(chosen) + -(-uncovered.bit_count() // largest) >= len(best):
+            return
+        element = uncovered & -uncovered
+        branches = [j for j, (mask, _) in enumerate(candidates) if mask & element]
+        branches.sort(key=lambda j: (candidates[j][0] & uncovered).bit_count(), reverse=True)
+        for j in branches:
+            chosen.append(j)
+            search(uncovered & ~candidates[j][0], chosen)
+            chosen.pop()
+
+    search(coverable, [])
+    return [candidates[j][1] for j in best]
+
+
+def genome_classes(category_dict=None, validator=None, per_class: int = 1) -> Dict[int, List[tuple]]:
+    """
+    Group the whole genome space into classes of genomes with identical bit rows.
+
+    The space is enumerated block by block, from the instance's genome index when one
+    is attached or stored on disk, otherwise with the fused predicate kernel. Each
+    class keeps its first genome of every block (distinct day and month pairs) until
+    per_class genomes are collected.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        per_class: Number of genomes to keep per class
+
+    Returns:
+        Dictionary mapping each bit row (category bits plus the validity bit after the
+        last category, as in GenomeIndex.mask, and a bit after it set for genomes with a
+        boundary year) to its genomes in index order
+    """
+    index = InstanceContext.get(category_dict, validator).index
+    if index is None:
+        index = load_genome_index(category_dict, validator, build=False)
+    num_formats = len(FORMATS) if is_format_aware(category_dict) else 1
+    year_bit = len(category_dict or {}) + 1
+    year_rows = np.flatnonzero(np.isin(YEAR_RANGE[0] + np.arange((YEAR_RANGE[1] - YEAR_RANGE[0] + 1) * num_formats)
+                                       // num_formats, BOUNDARY_YEARS))
+
+    classes: Dict[int, List[tuple]] = {}
+    for day, month, block in iter_genome_blocks(category_dict, validator, index):
+        rows = np.zeros((len(block), max(block.shape[1], year_bit // 8 + 1)), dtype=np.uint8)
+        rows[:, :block.shape[1]] = block
+        rows[year_rows, year_bit // 8] |= 1 << year_bit % 8
+        if rows.shape[1] <= 8:
+            padded = np.zeros((len(rows), 8), dtype=np.uint8)
+            padded[:, :rows.shape[1]] = rows
+            keys, first = np.unique(padded.view("<u8").ravel(), return_index=True)
+            keys = keys.tolist()
+        else:
+            unique_rows, first = np.unique(rows, axis=0, return_index=True)
+            keys = [int.from_bytes(row.tobytes(), "little") for row in unique_rows]
+        for key, row in zip(keys, first.tolist()):
+            genomes = classes.setdefault(key, [])
+            if len(genomes) < per_class:
+                year = YEAR_RANGE[0] + row // num_formats
+                genomes.append((day, month, year, FORMATS[row % num_formats]) if num_formats > 1
+                               else (day, month, year))
+    return classes
+
+
+def minimal_suite(category_dict=None, validator=None, valid_min: int = 10, invalid_min: int = 10,
+                  boundary_min: int = 5, exact: bool = False) -> Dict[str, Any]:
+    """
+    Find a smallest test suite covering every coverable category and meeting the quotas.
+
+    The categories are covered with one genome per chosen genome class (greedy set
+    cover, or a minimum cover by branch and bound if exact is set). Valid, invalid and
+    boundary quotas still unmet are then filled with genomes that count towards two
+    quotas at once (e.g. valid boundary dates) wherever possible. Boundary test cases
+    are those in a category whose name starts with "Boundary" or with a boundary year
+    (see is_boundary), as in run_instance.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        valid_min: Minimum number of valid test cases
+        invalid_min: Minimum number of invalid test cases
+        boundary_min: Minimum number of boundary test cases
+        exact: Whether to find a minimum category cover by branch and bound
+
+    Returns:
+        Dictionary with the keys:
+            genomes: Genomes of the suite, the category cover first
+            cover_size: Number of genomes in the category cover
+            cover_minimal: Whether the category cover is a proven minimum (set with exact)
+            covered_mask: Category mask covered by the suite
+            unreachable_mask: Category mask no genome of the space belongs to
+            proven_minimal: Whether no smaller suite exists, i.e. the suite is no larger
+                than the quotas require or than the category cover when it is a minimum
+
+    Raises:
+        ValueError: If the genome space does not hold enough valid, invalid or boundary
+            genomes to meet the quotas
+    """
+    context = InstanceContext.get(category_dict, validator)
+    valid_bit = 1 << len(context.category_names)
+    boundary_mask = boundary_category_mask(context.category_names)
+    classes = genome_classes(category_dict, validator, max(valid_min, invalid_min, boundary_min, 1))
+    rows = list(classes)
+    # All genomes of a class share their boundary categories and whether their year is a boundary
+    is_boundary_row = {row: bool(is_boundary(row & boundary_mask, classes[row][0][2])) for row in rows}
+
+    masks = [row & context.all_mask for row in rows]
+    coverable = 0
+    for mask in masks:
+        coverable |= mask
+    cover = exact_set_cover(masks, coverable) if exact else greedy_set_cover(masks, coverable)
+
+    # Genomes by (valid, boundary) kind, excluding those already in the cover
+    genomes = [classes[rows[i]][0] for i in cover]
+    cover_rows = {rows[i] for i in cover}
+    kinds: Dict[Tuple[bool, bool], List[tuple]] = {}
+    for row in rows:
+        kind = (bool(row & valid_bit), is_boundary_row[row])
+        kinds.setdefault(kind, []).extend(classes[row][1 if row in cover_rows else 0:])
+    for kind in kinds:
+        kinds[kind].reverse()  # Pop from the end in index order
+
+    counts = {"valid": valid_min, "invalid": invalid_min, "boundary": boundary_min}
+    for i in cover:
+        counts["valid" if rows[i] & valid_bit else "invalid"] -= 1
+        counts["boundary"] -= is_boundary_row[rows[i]]
+
+    def quotas_served(kind: Tuple[bool, bool]) -> int:
+        valid, boundary = kind
+        return (counts["valid" if valid else "invalid"] > 0) + (boundary and counts["boundary"] > 0)
+
+    while any(count > 0 for count in counts.values()):
+        available = [kind for kind, pool in kinds.items() if pool and quotas_served(kind)]
+        if not available:
+            missing = ", ".join(f"{count} {quota}" for quota, count in counts.items() if count > 0)
+            raise ValueError(f"The genome space does not hold enough test cases to meet the quotas "
+                             f"(missing {missing})")
+        kind = max(available, key=quotas_served)
+        genomes.append(kinds[kind].pop())
+        counts["valid" if kind[0] else "invalid"] -= 1
+        counts["boundary"] -= kind[1]
+
+    # Every test case is valid or invalid, and a minimum cover needs len(cover) of them
+    lower_bound = max(len(cover) if exact else 0, valid_min + invalid_min, boundary_min)
+    return {
+        "genomes": genomes,
+        "cover_size": len(cover),
+        "cover_minimal": exact,
+        "covered_mask": coverable,
+        "unreachable_mask": context.all_mask & ~coverable,
+        "proven_minimal": len(genomes) == lower_bound,
+    }
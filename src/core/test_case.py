@@ -1,12 +1,122 @@
-from typing import List, Dict, Callable, Any
-import random
+import inspect
+from collections import OrderedDict
+from typing import List, Dict, Callable, Any, Sequence
+from .predicates import compile_categories
+from ..utils.validation import get_string_batch_validator
+from ..utils.async_validator import AsyncValidator
+
+class InstanceContext:
+    """Problem instance (categories and validator) shared by all of its test cases."""
+
+    __slots__ = ("category_dict", "validator", "index", "category_names", "all_mask", "_names_by_mask",
+                 "_kernel", "_kernel_compiled")
+
+    # Largest number of shared contexts kept; the least recently used one without an
+    # attached genome index is dropped first
+    MAX_CONTEXTS = 256
+
+    # Shared contexts keyed on the identity of their category dictionary and validator
+    _contexts: "OrderedDict[tuple, InstanceContext]" = OrderedDict()
+
+    def __init__(self, category_dict=None, validator=None):
+        """
+        Initialize an instance context.
+
+        Args:
+            category_dict: Dictionary mapping category names to validation functions
+            validator: The validation function to use
+        """
+        self.category_dict = category_dict
+        # Coroutine validators are run through an event loop, concurrently for whole batches
+        self.validator = AsyncValidator(validator) if inspect.iscoroutinefunction(validator) else validator
+        self.index = None  # Optional precomputed GenomeIndex for O(1) evaluation
+
+        # Category table: bit i of a category mask stands for the i-th category name
+        self.category_names = tuple(category_dict) if category_dict else ()
+        self.all_mask = (1 << len(self.category_names)) - 1
+        self._names_by_mask = {0: ()}
+        self._kernel = None
+        self._kernel_compiled = False
+
+    @property
+    def kernel(self):
+        """The fused category evaluator, compiled on first use (None if the categories cannot be compiled)."""
+        if not self._kernel_compiled:
+            self._kernel = compile_categories(self.category_dict)
+            self._kernel_compiled = True
+        return self._kernel
+
+    def names(self, mask: int) -> tuple:
+        """
+        Decode a category mask into category names.
+
+        Args:
+            mask: Integer category bitmask
+
+        Returns:
+            Tuple of category names in category dictionary order (shared between equal masks)
+        """
+        names = self._names_by_mask.get(mask)
+        if names is None:
+            names = tuple(name for i, name in enumerate(self.category_names) if mask >> i & 1)
+            self._names_by_mask[mask] = names
+        return names
+
+    def mask_where(self, predicate: Callable[[str], bool]) -> int:
+        """
+        Get the mask of the categories whose name satisfies a predicate.
+
+        Args:
+            predicate: Function taking a category name
+
+        Returns:
+            Integer category bitmask
+        """
+        return sum(1 << i for i, name in enumerate(self.category_names) if predicate(name))
+
+    @classmethod
+    def get(cls, category_dict=None, validator=None) -> "InstanceContext":
+        """
+        Get the shared context for a category dictionary and validator.
+
+        At most MAX_CONTEXTS contexts are kept, so instances created per run (e.g. validator
+        wrappers) do not stay alive for the whole process. Contexts with an attached genome
+        index are never dropped.
+
+        Args:
+            category_dict: Dictionary mapping category names to validation functions
+            validator: The validation function to use
+
+        Returns:
+            The InstanceContext shared by every test case of this instance
+        """
+        # The context keeps both objects alive, so their ids stay unique while registered
+        key = (id(category_dict), id(validator))
+        context = cls._contexts.get(key)
+        if context is not None:
+            cls._contexts.move_to_end(key)
+            return context
+
+        context = cls._contexts[key] = cls(category_dict, validator)
+        if len(cls._contexts) > cls.MAX_CONTEXTS:
+            # Dropped contexts live on only through the test cases that still use them
+            for old_key, old_context in cls._contexts.items():
+                if old_context.index is None:
+                    del cls._contexts[old_key]
+                    break
+        return context
+
 
 class TestCase:
     """Base TestCase class for date validation test cases."""
+
+    __slots__ = ("day", "month", "year", "_context", "_date_str", "_is_valid", "_mask")
     
     def __init__(self, day: int, month: int, year: int, category_dict=None, validator=None):
         """
         Initialize a test case for date validation.
+
+        The date string, validity and categories are computed on first access.
         
         Args:
             day: The day component of the date
@@ -18,12 +128,78 @@ class TestCase:
         self.day = day
         self.month = month
         self.year = year
-        self.date_str = f"{day:02d}/{month:02d}/{year:04d}"
-        self.category_dict = category_dict
-        self.validator = validator
-        self.is_valid = self.validator(self.date_str) if self.validator else False
-        self.categories = [cat for cat, check in self.category_dict.items() 
-                          if check(day, month, year)] if self.category_dict else []
+        self._context = InstanceContext.get(category_dict, validator)
+        self._date_str = None
+        self._is_valid = None
+        self._mask = None
+
+    @property
+    def category_dict(self):
+        """Dictionary mapping category names to validation functions."""
+        return self._context.category_dict
+
+    @property
+    def validator(self):
+        """The validation function of the instance."""
+        return self._context.validator
+
+    @property
+    def date_str(self) -> str:
+        """The formatted date string."""
+        if self._date_str is None:
+            self._date_str = self._format_date()
+        return self._date_str
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether the validator accepts the date string."""
+        if self._is_valid is None and not self._load_from_index():
+            self._is_valid = bool(self._validate()) if self.validator else False
+        return self._is_valid
+
+    @property
+    def category_mask(self) -> int:
+        """Bitmask of the categories this test case belongs to, indexed by the instance's category table."""
+        if self._mask is None and not self._load_from_index():
+            self._mask = self._classify() if self.category_dict else 0
+        return self._mask
+
+    @property
+    def categories(self) -> tuple:
+        """Names of the categories this test case belongs to."""
+        return self._context.names(self.category_mask)
+
+    def _load_from_index(self) -> bool:
+        """Fill validity and categories from the instance's genome index, if one is attached."""
+        index = self._context.index
+        if index is None:
+            return False
+        mask = self._index_entry(index)
+        if mask is None:
+            return False
+        self._is_valid = bool(mask >> index.valid_bit & 1)
+        self._mask = mask & self._context.all_mask
+        return True
+
+    def _index_entry(self, index):
+        """Look up the bit row of this genome in a genome index."""
+        return index.mask(self.day, self.month, self.year)
+
+    def _format_date(self) -> str:
+        """Format the date as DD/MM/YYYY."""
+        return f"{self.day:02d}/{self.month:02d}/{self.year:04d}"
+
+    def _validate(self) -> bool:
+        """Run the validator on the date string."""
+        return self.validator(self.date_str)
+
+    def _classify(self) -> int:
+        """Evaluate every category check on the date components into a category mask."""
+        day, month, year = self.day, self.month, self.year
+        kernel = self._context.kernel
+        if kernel is not None:
+            return kernel.mask(day, month, year)
+        return sum(1 << i for i, check in enumerate(self.category_dict.values()) if check(day, month, year))
 
     def __str__(self):
         """String representation of the test case."""
@@ -35,9 +211,15 @@ class TestCase:
         """Compare two test cases for equality."""
         return self.date_str == other.date_str
 
+    def __hash__(self):
+        """Hash consistent with equality, so shared test cases can be used in sets."""
+        return hash(self.date_str)
+
 
 class TestCaseFormat(TestCase):
     """TestCase class for format variation (Instance 4)."""
+
+    __slots__ = ("format_type",)
     
     def __init__(self, day: int, month: int, year: int, format_type: str, 
                  category_dict=None, validator=None):
@@ -52,32 +234,36 @@ class TestCaseFormat(TestCase):
             category_dict: Dictionary mapping category names to validation functions
             validator: The validation function to use
         """
-        self.day = day
-        self.month = month
-        self.year = year
+        super().__init__(day, month, year, category_dict, validator)
         self.format_type = format_type
-        
-        # Format the date string according to the format type
-        if format_type == "DD/MM/YYYY":
-            self.date_str = f"{day:02d}/{month:02d}/{year:04d}"
-        elif format_type == "MM/DD/YYYY":
-            self.date_str = f"{month:02d}/{day:02d}/{year:04d}"
-        elif format_type == "YYYY/MM/DD":
-            self.date_str = f"{year:04d}/{month:02d}/{day:02d}"
-        
-        self.category_dict = category_dict
-        self.validator = validator
-        
-        # Validate the date if a validator is provided
-        self.is_valid = False
-        if self.validator:
-            self.is_valid = self.validator(self.date_str, format_type)
-        
-        # Check which categories this test case belongs to
-        self.categories = []
-        if self.category_dict:
-            self.categories = [cat for cat, check in self.category_dict.items() 
-                              if check(day, month, year, format_type)]
+
+    def _format_date(self) -> str:
+        """Format the date string according to the format type."""
+        day, month, year = self.day, self.month, self.year
+        if self.format_type == "DD/MM/YYYY":
+            return f"{day:02d}/{month:02d}/{year:04d}"
+        elif self.format_type == "MM/DD/YYYY":
+            return f"{month:02d}/{day:02d}/{year:04d}"
+        elif self.format_type == "YYYY/MM/DD":
+            return f"{year:04d}/{month:02d}/{day:02d}"
+        return ""
+
+    def _index_entry(self, index):
+        """Look up the bit row of this genome, including its format, in a genome index."""
+        return index.mask(self.day, self.month, self.year, self.format_type)
+
+    def _validate(self) -> bool:
+        """Run the validator on the date string and format type."""
+        return self.validator(self.date_str, self.format_type)
+
+    def _classify(self) -> int:
+        """Evaluate every category check on the date components and format type into a category mask."""
+        day, month, year, format_type = self.day, self.month, self.year, self.format_type
+        kernel = self._context.kernel
+        if kernel is not None:
+            return kernel.mask(day, month, year, format_type)
+        return sum(1 << i for i, check in enumerate(self.category_dict.values())
+                   if check(day, month, year, format_type))
 
     def __str__(self):
         """String representation of the test case with format type."""
@@ -89,42 +275,69 @@ class TestCaseFormat(TestCase):
         """Compare two test cases for equality, including format type."""
         return self.date_str == other.date_str and self.format_type == other.format_type
 
+    def __hash__(self):
+        """Hash consistent with equality, including format type."""
+        return hash((self.date_str, self.format_type))
+
+
+def validate_population(test_cases: Sequence[TestCase]) -> int:
+    """
+    Validate all test cases whose validity is not known yet, in one batch per instance.
+
+    Instances whose validator has a string batch counterpart (see
+    get_string_batch_validator) are validated with a single call per batch, so slow
+    validators such as an AsyncValidator overlap their latency; others are validated
+    one test case at a time. Equal test cases are validated once.
+
+    Args:
+        test_cases: Test cases, possibly of several instances
+
+    Returns:
+        Number of distinct test cases validated
+    """
+    pending: Dict[InstanceContext, Dict[TestCase, List[TestCase]]] = {}
+    for tc in test_cases:
+        if tc._is_valid is None and not tc._load_from_index():
+            pending.setdefault(tc._context, {}).setdefault(tc, []).append(tc)
+
+    for context, groups in pending.items():
+        batch = get_string_batch_validator(context.validator) if context.validator else None
+        if batch is None:
+            for tc in groups:
+                tc.is_valid
+            verdicts = [tc._is_valid for tc in groups]
+        elif isinstance(next(iter(groups)), TestCaseFormat):
+            verdicts = batch([tc.date_str for tc in groups], [tc.format_type for tc in groups])
+        else:
+            verdicts = batch([tc.date_str for tc in groups])
+        for equal_cases, verdict in zip(groups.values(), verdicts):
+            for tc in equal_cases:
+                tc._is_valid = bool(verdict)
+    return sum(len(groups) for groups in pending.values())
+
 
 # Population initialization functions
-def initialize_population(size: int, category_dict=None, validator=None) -> List[TestCase]:
+def initialize_population(size: int, category_dict=None, validator=None, rng=None) -> List[TestCase]:
     """
     Initialize a population of test cases.
     
+    The population starts with the seed genomes of DATE_SCHEMA (one per key category)
+    followed by random genomes.
+    
     Args:
         size: The size of the population
         category_dict: Dictionary mapping category names to validation functions
         validator: The validation function to use
+        rng: RNG context (derived from the random module if omitted)
         
     Returns:
         A list of TestCase objects
     """
-    population = [
-        TestCase(29, 2, 2020, category_dict, validator),  # Valid Leap Year
-        TestCase(30, 4, 2023, category_dict, validator),  # Valid 30-Day Month
-        TestCase(31, 12, 9999, category_dict, validator),  # Valid 31-Day Month, Boundary Max Year
-        TestCase(32, 5, 2023, category_dict, validator),  # Invalid Day > 31
-        TestCase(15, 13, 2023, category_dict, validator),  # Invalid Month > 12
-        TestCase(29, 2, 2021, category_dict, validator),  # Invalid Feb 29 Non-Leap
-        TestCase(1, 1, 0, category_dict, validator),  # Boundary Min Year
-        TestCase(1, 1, 9999, category_dict, validator),  # Boundary Max Year
-    ]
-    
-    # Add random test cases
-    for _ in range(size - 8):
-        day = random.randint(1, 40)
-        month = random.randint(1, 15)
-        year = random.choice([0, 9999, random.randint(0, 9999)])
-        population.append(TestCase(day, month, year, category_dict, validator))
-    
-    return population
+    from .schema import DATE_SCHEMA  # The schema module builds on this one
+    return DATE_SCHEMA.initialize_population(size, category_dict, validator, rng)
 
 
-def initialize_population_instance_4(size: int, category_dict=None, validator=None) -> List[TestCaseFormat]:
+def initialize_population_instance_4(size: int, category_dict=None, validator=None, rng=None) -> List[TestCaseFormat]:
     """
     Initialize a population of test cases for Instance 4 (format variations).
     
@@ -132,23 +345,10 @@ def initialize_population_instance_4(size: int, category_dict=None, validator=No
         size: The size of the population
         category_dict: Dictionary mapping category names to validation functions
         validator: The validation function to use
+        rng: RNG context (derived from the random module if omitted)
         
     Returns:
         A list of TestCaseFormat objects
     """
-    population = [
-        TestCaseFormat(15, 5, 2023, "DD/MM/YYYY", category_dict, validator),
-        TestCaseFormat(5, 15, 2023, "MM/DD/YYYY", category_dict, validator),
-        TestCaseFormat(15, 5, 2023, "YYYY/MM/DD", category_dict, validator),
-        TestCaseFormat(5, 6, 2023, "DD/MM/YYYY", category_dict, validator),  # Ambiguous
-    ]
-    
-    formats = ["DD/MM/YYYY", "MM/DD/YYYY", "YYYY/MM/DD"]
-    for _ in range(size - 4):
-        day = random.randint(1, 40)
-        month = random.randint(1, 15)
-        year = random.randint(0, 9999)
-        format_type = random.choice(formats)
-        population.append(TestCaseFormat(day, month, year, format_type, category_dict, validator))
-    
-    return population
+    from .schema import DATE_FORMAT_SCHEMA  # The schema module builds on this one
+    return DATE_FORMAT_SCHEMA.initialize_population(size, category_dict, validator, rng)
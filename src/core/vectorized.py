@@ -0,0 +1,484 @@
+from typing import List, Dict, Any, Tuple, Optional, Union, Callable
+import numpy as np
+from .test_case import TestCase, TestCaseFormat, InstanceContext
+from .cache import make_test_case, make_test_case_format
+from .genetic_algorithm import local_search, local_search_instance_4, population_mask
+from .selection import get_selection
+from .schema import DATE_SCHEMA
+from .rng import make_rng
+from .profiling import RunStats, NULL_STATS
+
+# Date formats used by Instance 4, indexed by format code
+FORMATS = ("DD/MM/YYYY", "MM/DD/YYYY", "YYYY/MM/DD")
+FORMAT_NAMES = np.array(FORMATS)
+
+# Mutation value pools of the date schema (the last slot of each pool is replaced by a random draw)
+DAY_POOL, MONTH_POOL, YEAR_POOL = (np.array(gene["mutation_pool"] + (0,)) for gene in DATE_SCHEMA.genes)
+
+
+class PopulationArrays:
+    """Struct-of-arrays representation of a population of date genomes."""
+
+    def __init__(self, day: np.ndarray, month: np.ndarray, year: np.ndarray, fmt: Optional[np.ndarray] = None):
+        """
+        Initialize a population from parallel gene arrays.
+
+        Args:
+            day: Array of day components
+            month: Array of month components
+            year: Array of year components
+            fmt: Array of format codes (indices into FORMATS), or None for date-only instances
+        """
+        self.day = np.asarray(day, dtype=np.int64)
+        self.month = np.asarray(month, dtype=np.int64)
+        self.year = np.asarray(year, dtype=np.int64)
+        self.fmt = np.asarray(fmt, dtype=np.int64) if fmt is not None else None
+
+    def __len__(self):
+        """Number of individuals in the population."""
+        return len(self.day)
+
+    @property
+    def format_aware(self) -> bool:
+        """Whether the population carries a format gene."""
+        return self.fmt is not None
+
+    def keys(self) -> np.ndarray:
+        """
+        Encode every genome as a single integer key.
+
+        Returns:
+            Array of integer keys, one per individual
+        """
+        keys = (self.day * 16 + self.month) * 10000 + self.year
+        if self.fmt is not None:
+            keys = keys * len(FORMATS) + self.fmt
+        return keys
+
+    def take(self, indices: np.ndarray) -> "PopulationArrays":
+        """
+        Select individuals by index.
+
+        Args:
+            indices: Indices of the individuals to keep
+
+        Returns:
+            A new PopulationArrays containing the selected individuals
+        """
+        fmt = self.fmt[indices] if self.fmt is not None else None
+        return PopulationArrays(self.day[indices], self.month[indices], self.year[indices], fmt)
+
+    def concatenate(self, other: "PopulationArrays") -> "PopulationArrays":
+        """
+        Append another population to this one.
+
+        Args:
+            other: Population to append
+
+        Returns:
+            A new PopulationArrays with the individuals of both populations
+        """
+        fmt = np.concatenate([self.fmt, other.fmt]) if self.fmt is not None else None
+        return PopulationArrays(
+            np.concatenate([self.day, other.day]),
+            np.concatenate([self.month, other.month]),
+            np.concatenate([self.year, other.year]),
+            fmt
+        )
+
+    def to_test_cases(self, category_dict=None, validator=None) -> List[TestCase]:
+        """
+        Materialize the population as TestCase (or TestCaseFormat) objects.
+
+        Args:
+            category_dict: Dictionary mapping category names to validation functions
+            validator: The validation function to use
+
+        Returns:
+            A list of test case objects in population order
+        """
+        if self.fmt is None:
+            return [make_test_case(int(d), int(m), int(y), category_dict, validator)
+                    for d, m, y in zip(self.day, self.month, self.year)]
+        return [make_test_case_format(int(d), int(m), int(y), FORMATS[f], category_dict, validator)
+                for d, m, y, f in zip(self.day, self.month, self.year, self.fmt)]
+
+
+class CategoryEvaluator:
+    """Batched category evaluation producing an individuals x categories boolean matrix."""
+
+    def __init__(self, category_dict=None, format_aware: bool = False):
+        """
+        Initialize the evaluator for a category dictionary.
+
+        Args:
+            category_dict: Dictionary mapping category names to validation functions
+            format_aware: Whether the category functions take a format argument
+        """
+        self.category_dict = category_dict or {}
+        self.names = list(self.category_dict.keys())
+        self.checks = list(self.category_dict.values())
+        self.format_aware = format_aware
+        # Fused evaluator for the whole population, if the categories can be compiled
+        self.kernel = InstanceContext.get(category_dict).kernel if category_dict else None
+        # Rows already evaluated, keyed by genome key
+        self._rows: Dict[int, np.ndarray] = {}
+        # Whether each category function evaluates gene arrays elementwise (None until tried)
+        self._accepts_arrays: List[Optional[bool]] = [None] * len(self.checks)
+
+    def _evaluate_column(self, col: int, args: tuple) -> np.ndarray:
+        """Evaluate one category for the genomes given as gene arrays."""
+        check = self.checks[col]
+        size = len(args[0])
+        if self._accepts_arrays[col] is not False:
+            try:
+                result = check(*args)
+            except Exception:  # e.g. "and" or "in" applied to arrays
+                result = None
+            # Scalar results mean the function did not operate elementwise (e.g. str(d))
+            if isinstance(result, np.ndarray) and result.shape == (size,):
+                self._accepts_arrays[col] = True
+                return result.astype(bool)
+            self._accepts_arrays[col] = False
+        return np.fromiter((bool(check(*genome)) for genome in zip(*(arg.tolist() for arg in args))),
+                           dtype=bool, count=size)
+
+    def evaluate(self, population: PopulationArrays) -> np.ndarray:
+        """
+        Evaluate all categories for a population.
+
+        Compiled categories are evaluated in one fused call over the gene arrays. Otherwise
+        genomes are deduplicated first, so each distinct genome is evaluated at most once
+        over the lifetime of the evaluator, and each category function is called once with
+        the gene arrays of the new genomes if it evaluates them elementwise (one call per
+        genome otherwise).
+
+        Args:
+            population: Population to evaluate
+
+        Returns:
+            Boolean matrix of shape (len(population), number of categories)
+        """
+        if not self.checks or len(population) == 0:
+            return np.zeros((len(population), len(self.checks)), dtype=bool)
+
+        if self.kernel is not None:
+            if self.format_aware:
+                return self.kernel.matrix(population.day, population.month, population.year,
+                                          FORMAT_NAMES[population.fmt])
+            return self.kernel.matrix(population.day, population.month, population.year)
+
+        unique_keys, first, inverse = np.unique(population.keys(), return_index=True, return_inverse=True)
+        unique_keys = unique_keys.tolist()
+        missing = [row for row, key in enumerate(unique_keys) if key not in self._rows]
+        if missing:
+            new = population.take(first[missing])
+            args = (new.day, new.month, new.year)
+            if self.format_aware:
+                args += (FORMAT_NAMES[new.fmt],)
+            columns = np.column_stack([self._evaluate_column(col, args) for col in range(len(self.checks))])
+            for row, evaluated in zip(missing, columns):
+                self._rows[unique_keys[row]] = evaluated
+        table = np.array([self._rows[key] for key in unique_keys], dtype=bool)
+        return table[inverse.reshape(-1)]
+
+
+def calculate_fitness_matrix(coverage_matrix: np.ndarray) -> np.ndarray:
+    """
+    Calculate fitness values from a coverage matrix.
+
+    Equivalent to calculate_fitness: each individual scores its number of categories
+    divided by one plus the redundancy of the whole population.
+
+    Args:
+        coverage_matrix: Boolean matrix of shape (individuals, categories)
+
+    Returns:
+        Array of fitness values corresponding to each individual
+    """
+    counts = coverage_matrix.sum(axis=1)
+    redundant_count = int(counts.sum()) - int(coverage_matrix.any(axis=0).sum())
+    return counts / (1 + redundant_count)
+
+
+def matrix_coverage(coverage_matrix: np.ndarray) -> float:
+    """
+    Calculate the percentage of categories covered by a population.
+
+    Args:
+        coverage_matrix: Boolean matrix of shape (individuals, categories)
+
+    Returns:
+        Coverage percentage
+    """
+    if coverage_matrix.shape[1] == 0:
+        return 0
+    return coverage_matrix.any(axis=0).sum() / coverage_matrix.shape[1] * 100
+
+
+def initialize_population_arrays(size: int, format_aware: bool, rng: np.random.Generator) -> PopulationArrays:
+    """
+    Initialize a population as gene arrays.
+
+    The seeded individuals match initialize_population and initialize_population_instance_4.
+
+    Args:
+        size: The size of the population
+        format_aware: Whether to include a format gene (Instance 4)
+        rng: NumPy random generator
+
+    Returns:
+        A PopulationArrays of the requested size
+    """
+    if format_aware:
+        seeds = np.array([
+            (15, 5, 2023, 0),
+            (5, 15, 2023, 1),
+            (15, 5, 2023, 2),
+            (5, 6, 2023, 0),  # Ambiguous
+        ])
+    else:
+        seeds = np.array([
+            (29, 2, 2020),  # Valid Leap Year
+            (30, 4, 2023),  # Valid 30-Day Month
+            (31, 12, 9999),  # Valid 31-Day Month, Boundary Max Year
+            (32, 5, 2023),  # Invalid Day > 31
+            (15, 13, 2023),  # Invalid Month > 12
+            (29, 2, 2021),  # Invalid Feb 29 Non-Leap
+            (1, 1, 0),  # Boundary Min Year
+            (1, 1, 9999),  # Boundary Max Year
+        ])
+
+    n = max(size - len(seeds), 0)
+    day = rng.integers(1, 41, n)
+    month = rng.integers(1, 16, n)
+    if format_aware:
+        year = rng.integers(0, 10000, n)
+        fmt = rng.integers(0, len(FORMATS), n)
+        return PopulationArrays(
+            np.concatenate([seeds[:, 0], day]),
+            np.concatenate([seeds[:, 1], month]),
+            np.concatenate([seeds[:, 2], year]),
+            np.concatenate([seeds[:, 3], fmt])
+        )
+
+    # Years are biased towards the boundaries like the object-based initializer
+    year = np.choose(rng.integers(0, 3, n), [np.zeros(n, dtype=np.int64), np.full(n, 9999), rng.integers(0, 10000, n)])
+    return PopulationArrays(
+        np.concatenate([seeds[:, 0], day]),
+        np.concatenate([seeds[:, 1], month]),
+        np.concatenate([seeds[:, 2], year])
+    )
+
+
+def select_parents_arrays(fitness: np.ndarray, num_parents: int, rng: Optional[np.random.Generator] = None,
+                          selection: Union[str, Callable] = "truncation") -> np.ndarray:
+    """
+    Select the indices of the parents.
+
+    Args:
+        fitness: Array of fitness values
+        num_parents: Number of parents to select
+        rng: NumPy random generator used by stochastic strategies
+        selection: Selection strategy name or callable, see src/core/selection.py
+
+    Returns:
+        Indices of the selected parents
+    """
+    return get_selection(selection)(fitness, num_parents, rng)
+
+
+def _draw_from_pool(pool: np.ndarray, low: int, high: int, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Draw n values from a mutation pool whose last slot is a random integer in [low, high)."""
+    idx = rng.integers(0, len(pool), n)
+    return np.where(idx == len(pool) - 1, rng.integers(low, high, n), pool[idx])
+
+
+def breed_offspring(parents: PopulationArrays, num_offspring: int, rng: np.random.Generator,
+                    mutation_rate: float = 0.15) -> PopulationArrays:
+    """
+    Produce offspring with batched crossover and mutation.
+
+    Args:
+        parents: Parent population
+        num_offspring: Number of offspring to produce
+        rng: NumPy random generator
+        mutation_rate: Probability of mutation for each component
+
+    Returns:
+        A PopulationArrays containing the offspring
+    """
+    n_parents = len(parents)
+
+    # Two distinct parents per offspring
+    first = rng.integers(0, n_parents, num_offspring)
+    second = rng.integers(0, n_parents - 1, num_offspring)
+    second = second + (second >= first)
+    p1 = parents.take(first)
+    p2 = parents.take(second)
+
+    # Uniform crossover: each gene comes from either parent with equal probability
+    n_genes = 4 if parents.format_aware else 3
+    pick_first = rng.random((n_genes, num_offspring)) < 0.5
+    day = np.where(pick_first[0], p1.day, p2.day)
+    month = np.where(pick_first[1], p1.month, p2.month)
+    year = np.where(pick_first[2], p1.year, p2.year)
+    fmt = np.where(pick_first[3], p1.fmt, p2.fmt) if parents.format_aware else None
+
+    # Mutation biased towards boundary values
+    mutate_mask = rng.random((n_genes, num_offspring)) < mutation_rate
+    day = np.where(mutate_mask[0], _draw_from_pool(DAY_POOL, 32, 41, num_offspring, rng), day)
+    month = np.where(mutate_mask[1], _draw_from_pool(MONTH_POOL, 13, 16, num_offspring, rng), month)
+    year = np.where(mutate_mask[2], _draw_from_pool(YEAR_POOL, 0, 10000, num_offspring, rng), year)
+    if parents.format_aware:
+        fmt = np.where(mutate_mask[3], rng.integers(0, len(FORMATS), num_offspring), fmt)
+
+    return PopulationArrays(day, month, year, fmt)
+
+
+def _run_vectorized(
+    pop_size: int,
+    generations: int,
+    category_dict,
+    validator,
+    use_local_search: bool,
+    force_full_generations: bool,
+    format_aware: bool,
+    seed=None,
+    selection: Union[str, Callable] = "truncation",
+    profile: bool = False
+) -> Tuple[Any, ...]:
+    """Shared loop for the vectorized genetic algorithms."""
+    stats = RunStats() if profile else NULL_STATS
+    context = make_rng(seed)
+    rng = context.generator
+    with stats.phase("initialization"):
+        evaluator = CategoryEvaluator(category_dict, format_aware)
+        population = initialize_population_arrays(pop_size, format_aware, rng)
+        matrix = evaluator.evaluate(population)
+    coverages = []  # List to store coverage values per generation
+
+    for gen in range(generations):
+        stats.start_generation()
+        with stats.phase("fitness"):
+            fitness = calculate_fitness_matrix(matrix)
+        with stats.phase("selection"):
+            parent_idx = select_parents_arrays(fitness, pop_size // 2, rng, selection)
+        with stats.phase("offspring"):
+            parents = population.take(parent_idx)
+            offspring = breed_offspring(parents, pop_size - len(parent_idx), rng)
+            population = parents.concatenate(offspring)
+
+        with stats.phase("evaluation"):
+            matrix = np.concatenate([matrix[parent_idx], evaluator.evaluate(offspring)])
+
+        # Calculate coverage for the current generation
+        with stats.phase("coverage"):
+            coverage = matrix_coverage(matrix) if category_dict else 0
+        coverages.append(coverage)  # Store the coverage for this generation
+        stats.end_generation()
+
+        if coverage >= 95 and not force_full_generations:
+            print(f"Terminated at generation {gen + 1} with {coverage:.2f}% coverage")
+            break
+
+    with stats.phase("test_cases"):
+        test_cases = population.to_test_cases(category_dict, validator)
+
+    # Apply local search if enabled
+    if use_local_search:
+        with stats.phase("local_search"):
+            if format_aware:
+                test_cases = local_search_instance_4(test_cases, category_dict, validator, 5, context)
+            else:
+                test_cases = local_search(test_cases, category_dict, validator, rng=context)
+
+            # Recalculate coverage after local search
+            covered_mask = population_mask(test_cases)
+            coverage = covered_mask.bit_count() / len(category_dict) * 100 if category_dict else 0
+        coverages.append(coverage)  # Add the final coverage after local search
+        print(f"Coverage after local search: {coverage:.2f}%")
+
+    return (test_cases, coverages, stats) if profile else (test_cases, coverages)
+
+
+def genetic_algorithm_vectorized(
+    pop_size: int = 50,
+    generations: int = 100,
+    category_dict=None,
+    validator=None,
+    use_local_search=False,
+    instance_name="Original",
+    force_full_generations=False,
+    seed=None,
+    selection: Union[str, Callable] = "truncation",
+    profile: bool = False
+) -> Tuple[List[TestCase], List[float]]:
+    """
+    Run the genetic algorithm on a struct-of-arrays population.
+
+    Drop-in replacement for genetic_algorithm: crossover, mutation, selection and
+    category evaluation run as batched array operations, and TestCase objects are
+    only built for the final population.
+
+    Args:
+        pop_size: Size of the population
+        generations: Maximum number of generations
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        use_local_search: Whether to apply local search to refine the population
+        instance_name: Name of the problem instance
+        force_full_generations: Whether to run all generations regardless of coverage
+        seed: Seed or RNG context; runs with the same seed reproduce exactly (derived from
+            the random module if omitted)
+        selection: Parent selection strategy: "truncation", "tournament", "sus" or a callable
+        profile: Whether to time every phase of the run (off by default, at near-zero cost)
+
+    Returns:
+        Tuple of (population, coverages) where population is the final list of TestCase objects
+        and coverages is a list of coverage values per generation, followed by the RunStats
+        of the run if profile is set
+    """
+    return _run_vectorized(pop_size, generations, category_dict, validator,
+                           use_local_search, force_full_generations, False, seed, selection,
+                           profile)
+
+
+def genetic_algorithm_instance_4_vectorized(
+    pop_size: int = 50,
+    generations: int = 100,
+    category_dict=None,
+    validator=None,
+    use_local_search=False,
+    instance_name="Instance 4",
+    force_full_generations=False,
+    seed=None,
+    selection: Union[str, Callable] = "truncation",
+    profile: bool = False
+) -> Tuple[List[TestCaseFormat], List[float]]:
+    """
+    Run the format-aware genetic algorithm on a struct-of-arrays population.
+
+    Drop-in replacement for genetic_algorithm_instance_4.
+
+    Args:
+        pop_size: Size of the population
+        generations: Maximum number of generations
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        use_local_search: Whether to apply local search to refine the population
+        instance_name: Name of the problem instance
+        force_full_generations: Whether to run all generations regardless of coverage
+        seed: Seed or RNG context; runs with the same seed reproduce exactly (derived from
+            the random module if omitted)
+        selection: Parent selection strategy: "truncation", "tournament", "sus" or a callable
+        profile: Whether to time every phase of the run (off by default, at near-zero cost)
+
+    Returns:
+        Tuple of (population, coverages) where population is the final list of TestCaseFormat objects
+        and coverages is a list of coverage values per generation, followed by the RunStats
+        of the run if profile is set
+    """
+    return _run_vectorized(pop_size, generations, category_dict, validator,
+                           use_local_search, force_full_generations, True, seed, selection,
+                           profile)
@@ -0,0 +1,58 @@
+from typing import Dict, Any
+from ..utils.validation import is_valid_date, validator_instance_1, validator_instance_2, validator_instance_3, validator_instance_4
+from .original import CATEGORIES as ORIGINAL_CATEGORIES, DEFAULT_PARAMS as ORIGINAL_PARAMS
+from .instance1 import CATEGORIES as CATEGORIES_INSTANCE_1, DEFAULT_PARAMS as INSTANCE1_PARAMS
+from .instance2 import CATEGORIES as CATEGORIES_INSTANCE_2, DEFAULT_PARAMS as INSTANCE2_PARAMS
+from .instance3 import CATEGORIES as CATEGORIES_INSTANCE_3, DEFAULT_PARAMS as INSTANCE3_PARAMS
+from .instance4 import CATEGORIES as CATEGORIES_INSTANCE_4, DEFAULT_PARAMS as INSTANCE4_PARAMS
+
+# Problem instances by key. Category functions are lambdas and cannot be pickled, so
+# worker processes resolve instances through this registry instead of receiving them.
+INSTANCES: Dict[str, Dict[str, Any]] = {
+    "original": {
+        "categories": ORIGINAL_CATEGORIES,
+        "validator": is_valid_date,
+        "params": ORIGINAL_PARAMS,
+        "format_aware": False,
+    },
+    "instance1": {
+        "categories": CATEGORIES_INSTANCE_1,
+        "validator": validator_instance_1,
+        "params": INSTANCE1_PARAMS,
+        "format_aware": False,
+    },
+    "instance2": {
+        "categories": CATEGORIES_INSTANCE_2,
+        "validator": validator_instance_2,
+        "params": INSTANCE2_PARAMS,
+        "format_aware": False,
+    },
+    "instance3": {
+        "categories": CATEGORIES_INSTANCE_3,
+        "validator": validator_instance_3,
+        "params": INSTANCE3_PARAMS,
+        "format_aware": False,
+    },
+    "instance4": {
+        "categories": CATEGORIES_INSTANCE_4,
+        "validator": validator_instance_4,
+        "params": INSTANCE4_PARAMS,
+        "format_aware": True,
+    },
+}
+
+
+def get_instance(key: str) -> Dict[str, Any]:
+    """
+    Look up a problem instance by key.
+
+    Args:
+        key: Instance key ("original", "instance1", ..., "instance4")
+
+    Returns:
+        Dictionary with the instance's categories, validator, default params and format_aware flag
+    """
+    try:
+        return INSTANCES[key]
+    except KeyError:
+        raise ValueError(f"Unknown instance '{key}', expected one of: {', '.join(INSTANCES)}") from None
@@ -0,0 +1,143 @@
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional
+import numpy as np
+from ..core.cache import make_test_case, make_test_case_format
+from ..core.profiling import RunStats
+from ..instances.registry import get_instance
+from ..utils.visualization import PlotBatch
+from .run_instance import run_instance
+from .run_instance4 import run_instance_4
+
+
+def derive_seeds(base_seed: Optional[int], count: int) -> List[int]:
+    """
+    Derive independent, deterministic per-run seeds from a base seed.
+
+    Args:
+        base_seed: Base seed (None draws fresh entropy)
+        count: Number of seeds to derive
+
+    Returns:
+        List of integer seeds, one per run
+    """
+    children = np.random.SeedSequence(base_seed).spawn(count)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def run_configuration(config: Dict[str, Any], seed: int, profile: bool = False,
+                      plots: bool = True) -> Tuple[float, List[tuple], str, Optional[RunStats], List[Dict[str, Any]]]:
+    """
+    Run a single GA configuration with its own seed and captured output.
+
+    Test cases are returned as plain genome tuples because their category functions
+    cannot be pickled back to the parent process.
+
+    Args:
+        config: Run configuration (instance key, run_name, use_local_search, force_full_generations,
+            and optionally pop_size and generations overriding the instance's defaults)
+        seed: Seed for this run
+        profile: Whether to time every phase of the run
+        plots: Whether to collect the run's coverage plot; it is returned unrendered
+
+    Returns:
+        Tuple of (coverage, genomes, output, stats, plot_jobs) where genomes are (day, month,
+        year, format_type) tuples, output is everything the run printed, stats is the RunStats
+        of the run (None unless profile is set) and plot_jobs are the jobs of a PlotBatch
+    """
+    instance = get_instance(config["instance"])
+    params = {k: v for k, v in instance["params"].items() if k not in ['instance_name']}
+    params.update({k: config[k] for k in ("pop_size", "generations") if k in config})
+    runner = run_instance_4 if instance["format_aware"] else run_instance
+    plot_batch = PlotBatch() if plots else False
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = runner(
+            category_dict=instance["categories"],
+            validator=instance["validator"],
+            instance_name=config["run_name"],
+            use_local_search=config.get("use_local_search", False),
+            force_full_generations=config.get("force_full_generations", False),
+            seed=seed,
+            profile=profile,
+            plots=plot_batch,
+            **params
+        )
+    coverage, test_cases = result[:2]
+    stats = result[2] if profile else None
+
+    genomes = [(tc.day, tc.month, tc.year, getattr(tc, "format_type", None)) for tc in test_cases]
+    return coverage, genomes, output.getvalue(), stats, plot_batch.jobs if plots else []
+
+
+def _rebuild_test_cases(instance_key: str, genomes: List[tuple]) -> List[Any]:
+    """Rebuild test case objects from genome tuples returned by a worker."""
+    instance = get_instance(instance_key)
+    categories, validator = instance["categories"], instance["validator"]
+    if instance["format_aware"]:
+        return [make_test_case_format(d, m, y, f, categories, validator) for d, m, y, f in genomes]
+    return [make_test_case(d, m, y, categories, validator) for d, m, y, _ in genomes]
+
+
+def run_configurations(
+    configs: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    profile: bool = False,
+    plots=True
+) -> Dict[str, Tuple[float, List[Any]]]:
+    """
+    Run several GA configurations, optionally in a process pool.
+
+    Every configuration gets a seed derived from the base seed and its position, and
+    results and output are collected in configuration order, so a parallel run yields
+    the same results as a serial run with the same seed. Coverage plots are not rendered
+    during the runs, so they do not slow the GA down.
+
+    Args:
+        configs: Run configurations, each with label, title, instance, run_name,
+            use_local_search and force_full_generations keys (optionally pop_size and generations)
+        workers: Number of worker processes (None uses all cores, 1 runs serially in-process)
+        seed: Base seed for the per-run seeds
+        profile: Whether to time every phase of each run
+        plots: True to render the coverage plots of all runs in parallel once the runs are
+            finished, a PlotBatch to add them to, or False to skip them
+
+    Returns:
+        Dictionary mapping run labels to tuples of (coverage, test_cases), extended by the
+        RunStats of the run if profile is set
+    """
+    seeds = derive_seeds(seed, len(configs))
+    profiles = [profile] * len(configs)
+    collect_plots = [isinstance(plots, PlotBatch) or bool(plots)] * len(configs)
+    plot_batch = plots if isinstance(plots, PlotBatch) else PlotBatch()
+    workers = workers or os.cpu_count() or 1
+
+    # A single run (or worker) runs in-process, without the cost of starting a pool
+    if min(workers, len(configs)) == 1:
+        outcomes = map(run_configuration, configs, seeds, profiles, collect_plots)
+        instance_results = _collect(configs, outcomes, plot_batch)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(configs))) as executor:
+            outcomes = executor.map(run_configuration, configs, seeds, profiles, collect_plots)
+            instance_results = _collect(configs, outcomes, plot_batch)
+
+    # Render the plots of all runs together, off the runs' critical path
+    if plots is True:
+        plot_batch.render(workers)
+    return instance_results
+
+
+def _collect(configs: List[Dict[str, Any]], outcomes, plot_batch: PlotBatch) -> Dict[str, Tuple[float, List[Any]]]:
+    """Print each run's output and gather its results and plots in configuration order."""
+    instance_results = {}
+    for config, (coverage, genomes, output, stats, plot_jobs) in zip(configs, outcomes):
+        print(f"\n=== {config['title']} ===")
+        print(output, end="")
+        result = (coverage, _rebuild_test_cases(config["instance"], genomes))
+        instance_results[config["label"]] = result if stats is None else result + (stats,)
+        plot_batch.jobs.extend(plot_jobs)
+    return instance_results
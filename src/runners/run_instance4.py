@@ -1,9 +1,13 @@
-import random
 from typing import List, Dict, Tuple, Any, Optional, Set
-from ..core.test_case import TestCaseFormat
-from ..core.genetic_algorithm import genetic_algorithm_instance_4
+from ..core.test_case import TestCaseFormat, validate_population
+from ..core.schema import DATE_FORMAT_SCHEMA, FORMATS
+from ..core.sampling import fill_quota, load_genome_pools, FILL_TIME_LIMIT
+from ..core.genetic_algorithm import genetic_algorithm_instance_4, population_mask
+from ..core.vectorized import genetic_algorithm_instance_4_vectorized
+from ..core.rng import make_rng
+from ..core.profiling import NULL_STATS
 from ..core.fitness import calculate_fitness_instance_4
-from ..utils.visualization import plot_coverage, print_test_cases
+from ..utils.visualization import render_plot, print_test_cases
 from ..instances.instance4 import CATEGORIES as CATEGORIES_INSTANCE_4
 
 def run_instance_4(
@@ -15,7 +19,12 @@ def run_instance_4(
     use_local_search=False,
     pop_size=50,
     generations=100,
-    force_full_generations=False
+    force_full_generations=False,
+    vectorized=False,
+    seed=None,
+    profile=False,
+    fill_time_limit=FILL_TIME_LIMIT,
+    plots=True
 ) -> Tuple[float, List[TestCaseFormat]]:
     """
     Run the genetic algorithm on the format variation problem instance.
@@ -30,84 +39,87 @@ def run_instance_4(
         pop_size: Size of the population
         generations: Maximum number of generations
         force_full_generations: Whether to run all generations regardless of coverage
+        vectorized: Whether to use the struct-of-arrays (NumPy) engine
+        seed: Seed or RNG context of the run (derived from the random module if omitted)
+        profile: Whether to time every phase of the run, including test selection and plotting
+        fill_time_limit: Seconds allowed to draw the missing test cases of each quota (see
+            src/core/sampling.py)
+        plots: True to render the coverage plot now, a PlotBatch to defer it to (see
+            src/utils/visualization.py), or False to skip it
         
     Returns:
         Tuple of (coverage, test_cases) where coverage is the percentage coverage achieved
-        and test_cases is the list of generated test cases
+        and test_cases is the list of generated test cases, followed by the RunStats of the
+        run if profile is set
+
+    Raises:
+        QuotaError: If the population and the instance do not hold enough valid or
+            invalid test cases
     """
     # Use provided category dictionary or default to CATEGORIES_INSTANCE_4
     cat_dict = category_dict if category_dict else CATEGORIES_INSTANCE_4
     
+    rng = make_rng(seed)
+    
     # Run the genetic algorithm
-    population, coverages = genetic_algorithm_instance_4(
+    engine = genetic_algorithm_instance_4_vectorized if vectorized else genetic_algorithm_instance_4
+    result = engine(
         pop_size=pop_size,
         generations=generations,
         category_dict=cat_dict, 
         validator=validator, 
         use_local_search=use_local_search, 
         instance_name=instance_name,
-        force_full_generations=force_full_generations
+        force_full_generations=force_full_generations,
+        seed=rng,
+        profile=profile
     )
+    population, coverages = result[:2]
+    stats = result[2] if profile else NULL_STATS
     
-    # Calculate fitness for selecting the best test cases
-    fitness = calculate_fitness_instance_4(population, cat_dict)
-    best_cases = sorted(zip(population, fitness), key=lambda x: x[1], reverse=True)
-    
-    # Separate the test cases into different categories
-    valid_cases = []
-    invalid_cases = []
-    seen = set()
-    
-    for tc, _ in best_cases:
-        if (tc.date_str, tc.format_type) not in seen:
-            seen.add((tc.date_str, tc.format_type))
-            if tc.is_valid and len(valid_cases) < valid_min:
-                valid_cases.append(tc)
-            elif not tc.is_valid and len(invalid_cases) < invalid_min:
-                invalid_cases.append(tc)
-    
-    # If we don't have enough of each type, generate random ones
-    formats = ["DD/MM/YYYY", "MM/DD/YYYY", "YYYY/MM/DD"]
-    
-    while len(valid_cases) < valid_min:
-        format_type = random.choice(formats) if category_dict else "DD/MM/YYYY"
-        tc = TestCaseFormat(
-            random.randint(1, 28), 
-            random.randint(1, 12), 
-            random.randint(1, 9998), 
-            format_type,
-            cat_dict, 
-            validator
-        )
-        if (tc.date_str, tc.format_type) not in seen and tc.is_valid:
-            seen.add((tc.date_str, tc.format_type))
-            valid_cases.append(tc)
-    
-    while len(invalid_cases) < invalid_min:
-        format_type = random.choice(formats) if category_dict else "DD/MM/YYYY"
-        tc = TestCaseFormat(
-            random.randint(32, 40), 
-            random.randint(1, 15), 
-            random.randint(0, 9999), 
-            format_type,
-            cat_dict, 
-            validator
-        )
-        if (tc.date_str, tc.format_type) not in seen and not tc.is_valid:
-            seen.add((tc.date_str, tc.format_type))
-            invalid_cases.append(tc)
+    with stats.phase("test_selection"):
+        # Validate the whole population in one batch before splitting it by validity
+        validate_population(population)
+
+        # Calculate fitness for selecting the best test cases
+        fitness = calculate_fitness_instance_4(population, cat_dict)
+        best_cases = sorted(zip(population, fitness), key=lambda x: x[1], reverse=True)
+
+        # Separate the test cases into different categories
+        valid_cases = []
+        invalid_cases = []
+        seen = set()
+
+        for tc, _ in best_cases:
+            if (tc.date_str, tc.format_type) not in seen:
+                seen.add((tc.date_str, tc.format_type))
+                if tc.is_valid and len(valid_cases) < valid_min:
+                    valid_cases.append(tc)
+                elif not tc.is_valid and len(invalid_cases) < invalid_min:
+                    invalid_cases.append(tc)
+
+        # If we don't have enough of each type, draw the missing ones from the genome space
+        formats = FORMATS if category_dict else ("DD/MM/YYYY",)
+        key = lambda tc: (tc.date_str, tc.format_type)
+        missing = {"valid": valid_min - len(valid_cases), "invalid": invalid_min - len(invalid_cases)}
+        pools = load_genome_pools(cat_dict, validator, formats) if max(missing.values()) > 0 else None
+
+        valid_cases += fill_quota(DATE_FORMAT_SCHEMA, "valid", missing["valid"], pools, cat_dict, validator, rng,
+                                  seen, key, formats, fill_time_limit)
+        invalid_cases += fill_quota(DATE_FORMAT_SCHEMA, "invalid", missing["invalid"], pools, cat_dict, validator,
+                                    rng, seen, key, formats, fill_time_limit)
 
     # Print the results
     print_test_cases(valid_cases, invalid_cases, None, instance_name)
     
     # Plot the coverage
-    plot_coverage(coverages, instance_name, use_local_search)
+    with stats.phase("plotting"):
+        render_plot(coverages, instance_name, use_local_search, plots)
     
     # Calculate the final coverage
-    covered = set()
-    for tc, _ in best_cases:
-        covered.update(tc.categories)
-    coverage = len(covered) / len(cat_dict) * 100
+    covered_mask = population_mask(population)
+    coverage = covered_mask.bit_count() / len(cat_dict) * 100
     print(f"\nCoverage Achieved: {coverage:.2f}%")
     
-    return coverage, valid_cases + invalid_cases 
\ No newline at end of file
+    test_cases = valid_cases + invalid_cases
+    return (coverage, test_cases, stats) if profile else (coverage, test_cases)
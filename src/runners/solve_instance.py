@@ -0,0 +1,68 @@
+from typing import List, Dict, Tuple, Any, Optional
+from ..core.test_case import TestCase, InstanceContext, validate_population
+from ..core.cache import make_test_case, make_test_case_format
+from ..core.set_cover import minimal_suite
+from ..core.genome_index import is_format_aware, boundary_category_mask, is_boundary
+from ..utils.visualization import print_test_cases
+from ..instances.original import CATEGORIES
+
+
+def solve_instance(
+    category_dict=None,
+    validator=None,
+    instance_name="Original",
+    valid_min=10,
+    invalid_min=10,
+    boundary_min=5,
+    exact=False
+) -> Tuple[float, List[TestCase]]:
+    """
+    Solve a problem instance for a minimal test suite instead of evolving one.
+
+    The whole genome space is enumerated, so the coverage is the best achievable rather
+    than a stochastic result, and the suite is as small as the category cover and the
+    quotas allow. Format-aware instances produce TestCaseFormat objects.
+
+    Args:
+        category_dict: Dictionary mapping category names to validation functions
+        validator: The validation function to use
+        instance_name: Name of the problem instance
+        valid_min: Minimum number of valid test cases to generate
+        invalid_min: Minimum number of invalid test cases to generate
+        boundary_min: Minimum number of boundary test cases to generate
+        exact: Whether to find a minimum category cover by branch and bound (for small
+            category counts) instead of the greedy cover
+
+    Returns:
+        Tuple of (coverage, test_cases) where coverage is the percentage coverage achieved
+        and test_cases is the list of generated test cases
+    """
+    # Use provided category dictionary or default to CATEGORIES
+    cat_dict = category_dict if category_dict else CATEGORIES
+
+    suite = minimal_suite(cat_dict, validator, valid_min, invalid_min, boundary_min, exact)
+    build = make_test_case_format if is_format_aware(cat_dict) else make_test_case
+    test_cases = [build(*genome, cat_dict, validator) for genome in suite["genomes"]]
+    validate_population(test_cases)
+
+    # Print the results
+    context = InstanceContext.get(cat_dict, validator)
+    boundary_mask = boundary_category_mask(context.category_names)
+    print_test_cases([tc for tc in test_cases if tc.is_valid],
+                     [tc for tc in test_cases if not tc.is_valid],
+                     [tc for tc in test_cases if is_boundary(tc.category_mask & boundary_mask, tc.year)],
+                     instance_name)
+
+    # The cover and the quota fill are reported separately: a minimum cover does not make
+    # the whole suite minimal once the quotas add test cases beyond their lower bound
+    cover = "minimum" if suite["cover_minimal"] else "greedy"
+    minimal = "proven minimal" if suite["proven_minimal"] else "suite not proven minimal"
+    print(f"\nSuite size: {len(test_cases)} ({cover} category cover of {suite['cover_size']}; {minimal})")
+    if suite["unreachable_mask"]:
+        print(f"Unreachable categories: {', '.join(context.names(suite['unreachable_mask']))}")
+
+    # Calculate the final coverage
+    coverage = suite["covered_mask"].bit_count() / len(cat_dict) * 100
+    print(f"\nCoverage Achieved: {coverage:.2f}%")
+
+    return coverage, test_cases
@@ -0,0 +1,299 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Tuple, Any, Optional, Sequence, Union
+import numpy as np
+from ..core.cache import DEFAULT_CACHE
+from ..core.genetic_algorithm import (genetic_algorithm_iter, genetic_algorithm_instance_4_iter, local_search,
+                                      local_search_instance_4, population_coverage)
+from ..instances.registry import INSTANCES, get_instance
+from .parallel import derive_seeds
+
+# Settings searched by default: each maps to the values tried in a grid search. Random
+# search draws from the same values, or uniformly from a (low, high) range given instead.
+# local_search_iterations of 0 runs without local search.
+SWEEP_SPACE = {
+    "pop_size": [25, 50, 100, 200],
+    "mutation_rate": [0.05, 0.15, 0.3],
+    "parent_fraction": [0.25, 0.5, 0.75],
+    "local_search_iterations": [0, 5, 10],
+}
+
+# Coverage percentage a run has to reach
+TARGET_COVERAGE = 95
+
+
+def grid_search(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """
+    Enumerate every combination of the values of a search space.
+
+    Args:
+        space: Values to try for every setting
+
+    Returns:
+        List of settings dictionaries
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_search(space: Dict[str, Union[Sequence[Any], Tuple[Any, Any]]], count: int,
+                  seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Draw random settings from a search space.
+
+    If every setting has a list of values, distinct combinations are drawn (at most the
+    whole grid).
+
+    Args:
+        space: For every setting, a list of values to pick from or a (low, high) tuple to
+            draw from uniformly (integers if both bounds are integers)
+        count: Number of settings to draw
+        seed: Seed of the draws
+
+    Returns:
+        List of settings dictionaries
+    """
+    generator = np.random.default_rng(seed)
+    if not any(isinstance(values, tuple) for values in space.values()):
+        grid = grid_search(space)
+        return [grid[i] for i in generator.choice(len(grid), min(count, len(grid)), replace=False).tolist()]
+
+    configs = []
+    for _ in range(count):
+        settings = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    settings[name] = int(generator.integers(low, high + 1))
+                else:
+                    settings[name] = float(generator.uniform(low, high))
+            else:
+                settings[name] = values[int(generator.integers(0, len(values)))]
+        configs.append(settings)
+    return configs
+
+
+def run_trial(instance_key: str, settings: Dict[str, Any], seed: int, generations: int = 100,
+              target_coverage: float = TARGET_COVERAGE) -> Dict[str, Any]:
+    """
+    Run the GA once with the given settings and measure the cost of reaching the target.
+
+    The test case cache is cleared first, so every trial pays for its own evaluations.
+    Evaluations count every individual built, including the initial population and the
+    pop_size * local_search_iterations candidates of local search.
+
+    Args:
+        instance_key: Instance key, see src/instances/registry.py
+        settings: Values of pop_size, mutation_rate, parent_fraction and local_search_iterations
+            (defaults 50, 0.15, 0.5 and 0)
+        seed: Seed of the run
+        generations: Generation budget
+        target_coverage: Coverage percentage to reach
+
+    Returns:
+        Dictionary with the keys coverage (final coverage), reached (whether the target
+        was reached), generations (generations run), seconds (total run time), and
+        seconds_to_target and evaluations_to_target (None if the target was not reached)
+    """
+    instance = get_instance(instance_key)
+    categories, validator = instance["categories"], instance["validator"]
+    start_iter = genetic_algorithm_instance_4_iter if instance["format_aware"] else genetic_algorithm_iter
+    iterations = settings.get("local_search_iterations", 0)
+    DEFAULT_CACHE.clear()
+
+    start = time.perf_counter()
+    evolution = start_iter(settings.get("pop_size", 50), generations, categories, validator,
+                           mutation_rate=settings.get("mutation_rate", 0.15),
+                           parent_fraction=settings.get("parent_fraction", 0.5),
+                           target_coverage=target_coverage, rng=seed)
+    seconds_to_target = evaluations_to_target = None
+    coverage = population_coverage(evolution.population, categories)[1]
+    for snapshot in evolution:
+        coverage = snapshot["coverage"]
+        if coverage >= target_coverage and seconds_to_target is None:
+            seconds_to_target = time.perf_counter() - start
+            evaluations_to_target = snapshot["evaluations"]
+
+    evaluations = evolution.evaluations
+    if iterations and seconds_to_target is None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if instance["format_aware"]:
+                population = local_search_instance_4(evolution.population, categories, validator, iterations,
+                                                     evolution.rng)
+            else:
+                population = local_search(evolution.population, categories, validator, iterations, evolution.rng)
+        evaluations += len(population) * iterations
+        coverage = population_coverage(population, categories)[1]
+        if coverage >= target_coverage:
+            seconds_to_target = time.perf_counter() - start
+            evaluations_to_target = evaluations
+
+    return {
+        "coverage": coverage,
+        "reached": seconds_to_target is not None,
+        "generations": evolution.generation,
+        "seconds": time.perf_counter() - start,
+        "seconds_to_target": seconds_to_target,
+        "evaluations_to_target": evaluations_to_target,
+    }
+
+
+def _run_trial(job: Tuple[str, Dict[str, Any], int, int, float]) -> Dict[str, Any]:
+    """Run one (instance, settings, seed) trial of a sweep."""
+    return run_trial(*job)
+
+
+def summarize_trials(trials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate the trials of one configuration over its seeds.
+
+    Args:
+        trials: Results of run_trial
+
+    Returns:
+        Dictionary with the keys runs, success_rate, mean_coverage, and the median and mean
+        seconds_to_target and evaluations_to_target over the runs that reached the target
+        (None if none did)
+    """
+    reached = [trial for trial in trials if trial["reached"]]
+    summary = {
+        "runs": len(trials),
+        "success_rate": len(reached) / len(trials),
+        "mean_coverage": statistics.fmean(trial["coverage"] for trial in trials),
+    }
+    for metric in ("seconds_to_target", "evaluations_to_target"):
+        values = [trial[metric] for trial in reached]
+        summary[f"median_{metric}"] = statistics.median(values) if values else None
+        summary[f"mean_{metric}"] = statistics.fmean(values) if values else None
+    return summary
+
+
+def run_sweep(
+    instance_keys: Sequence[str],
+    configs: List[Dict[str, Any]],
+    seeds: int = 5,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    generations: int = 100,
+    target_coverage: float = TARGET_COVERAGE
+) -> List[Dict[str, Any]]:
+    """
+    Run every configuration on every instance with several seeds, in a process pool.
+
+    Every trial gets a seed derived from the base seed, and the seeds are shared by all
+    configurations of an instance, so configurations are compared on the same draws.
+    Results are collected in a fixed order, so a parallel sweep reports the same
+    coverages and evaluation counts as a serial one.
+
+    Args:
+        instance_keys: Instances to sweep
+        configs: Settings to try, e.g. from grid_search or random_search
+        seeds: Number of seeded runs per configuration and instance
+        workers: Number of worker processes (None uses all cores, 1 runs serially in-process)
+        seed: Base seed of the trial seeds
+        generations: Generation budget of every run
+        target_coverage: Coverage percentage to reach
+
+    Returns:
+        One dictionary per (instance, configuration) with the keys instance, settings,
+        trials (the run_trial results) and the summarize_trials keys
+    """
+    trial_seeds = derive_seeds(seed, seeds)
+    jobs = [(key, settings, trial_seed, generations, target_coverage)
+            for key in instance_keys for settings in configs for trial_seed in trial_seeds]
+    workers = workers or os.cpu_count() or 1
+
+    if min(workers, len(jobs)) == 1:
+        trials = [_run_trial(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            trials = list(executor.map(_run_trial, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    results = []
+    for i, (key, settings) in enumerate((key, settings) for key in instance_keys for settings in configs):
+        config_trials = trials[i * seeds:(i + 1) * seeds]
+        results.append({"instance": key, "settings": settings, "trials": config_trials,
+                        **summarize_trials(config_trials)})
+    return results
+
+
+def rank_configurations(results: List[Dict[str, Any]], metric: str = "evaluations") -> List[Dict[str, Any]]:
+    """
+    Order sweep results from cheapest to most expensive.
+
+    Configurations that reach the target more often rank first, then those with the
+    lower median cost to reach it, then those with the higher mean coverage.
+
+    Args:
+        results: Results of run_sweep
+        metric: Cost to compare, "evaluations" or "seconds"
+
+    Returns:
+        The results in rank order
+    """
+    cost = f"median_{metric}_to_target"
+    return sorted(results, key=lambda result: (-result["success_rate"],
+                                               result[cost] if result[cost] is not None else float("inf"),
+                                               -result["mean_coverage"]))
+
+
+def print_sweep_report(results: List[Dict[str, Any]], metric: str = "evaluations", top: int = 10):
+    """
+    Print the cheapest configurations of every instance.
+
+    Args:
+        results: Results of run_sweep
+        metric: Cost the configurations are ranked by, "evaluations" or "seconds"
+        top: Number of configurations printed per instance
+    """
+    names = list(results[0]["settings"]) if results else []
+    for key in dict.fromkeys(result["instance"] for result in results):
+        ranked = rank_configurations([result for result in results if result["instance"] == key], metric)
+        print(f"\n=== {key}: cheapest settings ===")
+        print("".join(f"{name:>24}" for name in names) + f"{'success':>9}{'coverage':>10}"
+              f"{'evals':>10}{'seconds':>10}")
+        for result in ranked[:top]:
+            evaluations, seconds = result["median_evaluations_to_target"], result["median_seconds_to_target"]
+            print("".join(f"{result['settings'][name]!s:>24}" for name in names)
+                  + f"{result['success_rate']:>9.0%}{result['mean_coverage']:>9.1f}%"
+                  + (f"{evaluations:>10.0f}{seconds:>10.4f}" if evaluations is not None else f"{'-':>10}{'-':>10}"))
+
+
+def main(argv=None):
+    """Parse the command line and run a sweep."""
+    parser = argparse.ArgumentParser(description="Sweep GA settings and rank them by their cost to reach "
+                                                 f"{TARGET_COVERAGE}% coverage.")
+    parser.add_argument("--instances", nargs="+", choices=list(INSTANCES), default=list(INSTANCES))
+    parser.add_argument("--random", type=int, default=None, metavar="COUNT",
+                        help="Try COUNT random settings instead of the full grid")
+    parser.add_argument("--seeds", type=int, default=5, help="Seeded runs per configuration")
+    parser.add_argument("--generations", type=int, default=100, help="Generation budget of every run")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: all cores, 1 runs in-process)")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed of the sweep")
+    parser.add_argument("--metric", choices=["evaluations", "seconds"], default="evaluations",
+                        help="Cost the configurations are ranked by")
+    parser.add_argument("--output", default=None, help="JSON file the full results are written to")
+    args = parser.parse_args(argv)
+
+    configs = grid_search(SWEEP_SPACE) if args.random is None else random_search(SWEEP_SPACE, args.random, args.seed)
+    results = run_sweep(args.instances, configs, args.seeds, args.workers, args.seed, args.generations)
+    print_sweep_report(results, args.metric)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
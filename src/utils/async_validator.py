@@ -0,0 +1,89 @@
+import asyncio
+from typing import List, Any, Optional, Sequence, Union, Callable, Awaitable
+import numpy as np
+
+
+class AsyncValidator:
+    """
+    Adapter for an async validator, e.g. a call into a service under test.
+
+    Whole populations are validated concurrently: the engine passes the date strings of
+    each generation's new test cases to strings(), which keeps up to concurrency calls
+    in flight on an event loop, so their round-trip latencies overlap instead of adding
+    up. The adapter is also a plain synchronous validator for single test cases.
+    """
+
+    def __init__(self, validator: Callable[..., Awaitable[bool]], concurrency: int = 32,
+                 timeout: Optional[float] = None, timeout_result: Optional[bool] = None):
+        """
+        Initialize the adapter.
+
+        Args:
+            validator: Coroutine function taking a date string (and the format type for
+                format-aware instances) and returning whether the date is valid
+            concurrency: Maximum number of calls in flight
+            timeout: Seconds allowed per call (None waits indefinitely)
+            timeout_result: Verdict recorded for calls that time out; None raises TimeoutError
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self.validator = validator
+        self.__wrapped__ = validator  # Instance fingerprints hash the wrapped validator
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.timeout_result = timeout_result
+        self.timeouts = 0  # Number of calls that timed out
+
+    def __call__(self, date_str: str, *format_type: str) -> bool:
+        """Validate a single date string (and format type) synchronously."""
+        return bool(self.strings([date_str], [format_type[0]] if format_type else None)[0])
+
+    def strings(self, date_strs: Sequence[str], format_types: Union[None, str, Sequence[str]] = None) -> np.ndarray:
+        """
+        Validate many date strings concurrently.
+
+        Must be called outside a running event loop; await validate_many() inside one.
+
+        Args:
+            date_strs: Date strings
+            format_types: Format type of all strings, or one per string, for format-aware validators
+
+        Returns:
+            Boolean array, True where the date is valid
+        """
+        return np.array(asyncio.run(self.validate_many(date_strs, format_types)), dtype=bool)
+
+    async def validate_many(self, date_strs: Sequence[str],
+                            format_types: Union[None, str, Sequence[str]] = None) -> List[bool]:
+        """
+        Validate many date strings concurrently on the running event loop.
+
+        Args:
+            date_strs: Date strings
+            format_types: Format type of all strings, or one per string, for format-aware validators
+
+        Returns:
+            List of verdicts in input order
+
+        Raises:
+            TimeoutError: If a call exceeds the timeout and timeout_result is None
+        """
+        if isinstance(format_types, str):
+            format_types = [format_types] * len(date_strs)
+        calls = [(date_str,) for date_str in date_strs] if format_types is None else list(zip(date_strs, format_types))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def validate(args: tuple) -> bool:
+            async with semaphore:
+                try:
+                    return bool(await asyncio.wait_for(self.validator(*args), self.timeout))
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    if self.timeout_result is None:
+                        raise TimeoutError(f"Validator timed out after {self.timeout}s on {args[0]!r}") from None
+                    return self.timeout_result
+
+        return list(await asyncio.gather(*(validate(args) for args in calls)))
+
+    def __repr__(self):
+        return f"AsyncValidator({getattr(self.validator, '__qualname__', self.validator)})"
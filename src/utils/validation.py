@@ -1,78 +1,96 @@
 import re
+from typing import Optional, Tuple, Sequence, Union
+import numpy as np
 
-def is_valid_date(date_str: str) -> bool:
+# Date string patterns, compiled once
+DATE_PATTERN = re.compile(r"^(\d{2})/(\d{2})/(\d{4})$")
+ISO_DATE_PATTERN = re.compile(r"^(\d{4})/(\d{2})/(\d{2})$")
+
+FORMATS = ("DD/MM/YYYY", "MM/DD/YYYY", "YYYY/MM/DD")
+
+ArrayLike = Union[int, Sequence[int], np.ndarray]
+
+
+def parse_date(date_str: str, format_type: str = "DD/MM/YYYY") -> Optional[Tuple[int, int, int]]:
     """
-    Validate if a date string in the format DD/MM/YYYY is a valid date.
-    
+    Parse a date string into its components.
+
     Args:
-        date_str: A string representing a date in DD/MM/YYYY format
-        
+        date_str: A string representing a date in the given format
+        format_type: The format of the date string ("DD/MM/YYYY", "MM/DD/YYYY", or "YYYY/MM/DD")
+
     Returns:
-        bool: True if the date is valid, False otherwise
+        Tuple of (day, month, year), or None if the string does not match the format
     """
-    if not re.match(r"^\d{2}/\d{2}/\d{4}$", date_str):
-        return False
-    
-    day_str, month_str, year_str = date_str.split("/")
+    match = (ISO_DATE_PATTERN if format_type == "YYYY/MM/DD" else DATE_PATTERN).match(date_str)
+    if not match or format_type not in FORMATS:
+        return None
+
     try:
-        day, month, year = int(day_str), int(month_str), int(year_str)
+        first, second, third = (int(part) for part in match.groups())
     except ValueError:
-        return False
-    
+        return None
+
+    if format_type == "DD/MM/YYYY":
+        return first, second, third
+    elif format_type == "MM/DD/YYYY":
+        return second, first, third
+    return third, second, first
+
+
+def _is_valid_dmy(day: int, month: int, year: int, check_leap: bool = True) -> bool:
+    """Scalar calendar rules shared by the string validators."""
     if year < 0 or year > 9999 or month < 1 or month > 12 or day < 1:
         return False
-    
+
     if month in (4, 6, 9, 11) and day > 30:
         return False
-    elif month == 2:
+    elif month == 2 and check_leap:
         is_leap = (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
         max_day = 29 if is_leap else 28
         if day > max_day:
             return False
     elif day > 31:
         return False
-    
+
     return True
 
+
+def is_valid_date(date_str: str) -> bool:
+    """
+    Validate if a date string in the format DD/MM/YYYY is a valid date.
+
+    Args:
+        date_str: A string representing a date in DD/MM/YYYY format
+
+    Returns:
+        bool: True if the date is valid, False otherwise
+    """
+    parts = parse_date(date_str)
+    return parts is not None and _is_valid_dmy(*parts)
+
 def validator_instance_1(date_str: str) -> bool:
     """
     Basic date validation function for Instance 1.
     Simpler than the original - doesn't check for leap years.
-    
+
     Args:
         date_str: A string representing a date in DD/MM/YYYY format
-        
+
     Returns:
         bool: True if the date is valid according to Instance 1 rules, False otherwise
     """
-    if not re.match(r"^\d{2}/\d{2}/\d{4}$", date_str):
-        return False
-    
-    day_str, month_str, year_str = date_str.split("/")
-    try:
-        day, month, year = int(day_str), int(month_str), int(year_str)
-    except ValueError:
-        return False
-    
-    if year < 0 or year > 9999 or month < 1 or month > 12 or day < 1:
-        return False
-    
-    if month in (4, 6, 9, 11) and day > 30:
-        return False
-    
-    if day > 31:
-        return False
-    
-    return True
+    parts = parse_date(date_str)
+    return parts is not None and _is_valid_dmy(*parts, check_leap=False)
 
 def validator_instance_2(date_str: str) -> bool:
     """
     Validation function for Instance 2.
     Same as the original validator, with focus on leap years.
-    
+
     Args:
         date_str: A string representing a date in DD/MM/YYYY format
-        
+
     Returns:
         bool: True if the date is valid, False otherwise
     """
@@ -82,10 +100,10 @@ def validator_instance_3(date_str: str) -> bool:
     """
     Validation function for Instance 3.
     Same as the original validator, with focus on month-day combinations.
-    
+
     Args:
         date_str: A string representing a date in DD/MM/YYYY format
-        
+
     Returns:
         bool: True if the date is valid, False otherwise
     """
@@ -95,32 +113,187 @@ def validator_instance_4(date_str: str, format_type: str) -> bool:
     """
     Validation function for Instance 4.
     Validates dates with different formats.
-    
+
     Args:
         date_str: A string representing a date in the specified format
         format_type: The format of the date string ("DD/MM/YYYY", "MM/DD/YYYY", or "YYYY/MM/DD")
-        
+
     Returns:
         bool: True if the date is valid in the specified format, False otherwise
     """
-    if format_type == "DD/MM/YYYY":
-        return is_valid_date(date_str)
-    elif format_type == "MM/DD/YYYY":
-        if not re.match(r"^\d{2}/\d{2}/\d{4}$", date_str):
-            return False
-        month_str, day_str, year_str = date_str.split("/")
-        try:
-            day, month, year = int(day_str), int(month_str), int(year_str)
-        except ValueError:
-            return False
-        return is_valid_date(f"{day:02d}/{month:02d}/{year:04d}")
-    elif format_type == "YYYY/MM/DD":
-        if not re.match(r"^\d{4}/\d{2}/\d{2}$", date_str):
-            return False
-        year_str, month_str, day_str = date_str.split("/")
-        try:
-            day, month, year = int(day_str), int(month_str), int(year_str)
-        except ValueError:
-            return False
-        return is_valid_date(f"{day:02d}/{month:02d}/{year:04d}")
-    return False
+    parts = parse_date(date_str, format_type)
+    return parts is not None and _is_valid_dmy(*parts)
+
+
+# Batch validators
+
+def is_valid_date_batch(day: ArrayLike, month: ArrayLike, year: ArrayLike, check_leap: bool = True) -> np.ndarray:
+    """
+    Validate many dates given as component arrays.
+
+    Agrees exactly with is_valid_date applied to each date formatted as DD/MM/YYYY.
+
+    Args:
+        day: Array of day components
+        month: Array of month components
+        year: Array of year components
+        check_leap: Whether February is limited by leap years (False allows up to 31 days)
+
+    Returns:
+        Boolean array, True where the date is valid
+    """
+    day, month, year = np.asarray(day), np.asarray(month), np.asarray(year)
+
+    thirty_day = (month == 4) | (month == 6) | (month == 9) | (month == 11)
+    max_day = np.where(thirty_day, 30, 31)
+    if check_leap:
+        is_leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+        max_day = np.where(month == 2, np.where(is_leap, 29, 28), max_day)
+
+    return (year >= 0) & (year <= 9999) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= max_day)
+
+def validator_instance_1_batch(day: ArrayLike, month: ArrayLike, year: ArrayLike) -> np.ndarray:
+    """
+    Batch version of validator_instance_1 on component arrays.
+
+    Args:
+        day: Array of day components
+        month: Array of month components
+        year: Array of year components
+
+    Returns:
+        Boolean array, True where the date is valid according to Instance 1 rules
+    """
+    return is_valid_date_batch(day, month, year, check_leap=False)
+
+def validator_instance_4_batch(day: ArrayLike, month: ArrayLike, year: ArrayLike,
+                               format_type: Union[str, Sequence[str], np.ndarray]) -> np.ndarray:
+    """
+    Batch version of validator_instance_4 on component arrays.
+
+    Agrees exactly with validator_instance_4 applied to each date formatted in its
+    format type, as TestCaseFormat does.
+
+    Args:
+        day: Array of day components
+        month: Array of month components
+        year: Array of year components
+        format_type: Format type, or array of format types, of each date
+
+    Returns:
+        Boolean array, True where the date is valid in its format
+    """
+    return is_valid_date_batch(day, month, year) & np.isin(np.asarray(format_type), FORMATS)
+
+def parse_date_strings(date_strs: Sequence[str], format_type: Union[str, Sequence[str]] = "DD/MM/YYYY"
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse many date strings into component arrays.
+
+    Args:
+        date_strs: Date strings
+        format_type: Format type of all strings, or one format type per string
+
+    Returns:
+        Tuple of (day, month, year, parsed) arrays, where parsed is False for strings that
+        do not match their format (their components are set to 0)
+    """
+    formats = [format_type] * len(date_strs) if isinstance(format_type, str) else format_type
+    components = np.zeros((len(date_strs), 3), dtype=np.int64)
+    parsed = np.zeros(len(date_strs), dtype=bool)
+    for i, (date_str, fmt) in enumerate(zip(date_strs, formats)):
+        parts = parse_date(date_str, fmt)
+        if parts is not None:
+            components[i] = parts
+            parsed[i] = True
+    return components[:, 0], components[:, 1], components[:, 2], parsed
+
+def is_valid_date_strings(date_strs: Sequence[str]) -> np.ndarray:
+    """
+    Batch version of is_valid_date on an array of DD/MM/YYYY strings.
+
+    Args:
+        date_strs: Date strings in DD/MM/YYYY format
+
+    Returns:
+        Boolean array, True where the date is valid
+    """
+    day, month, year, parsed = parse_date_strings(date_strs)
+    return parsed & is_valid_date_batch(day, month, year)
+
+def validator_instance_1_strings(date_strs: Sequence[str]) -> np.ndarray:
+    """
+    Batch version of validator_instance_1 on an array of DD/MM/YYYY strings.
+
+    Args:
+        date_strs: Date strings in DD/MM/YYYY format
+
+    Returns:
+        Boolean array, True where the date is valid according to Instance 1 rules
+    """
+    day, month, year, parsed = parse_date_strings(date_strs)
+    return parsed & validator_instance_1_batch(day, month, year)
+
+def validator_instance_4_strings(date_strs: Sequence[str], format_types: Union[str, Sequence[str]]) -> np.ndarray:
+    """
+    Batch version of validator_instance_4 on an array of date strings.
+
+    Args:
+        date_strs: Date strings
+        format_types: Format type of all strings, or one format type per string
+
+    Returns:
+        Boolean array, True where the date is valid in its format
+    """
+    day, month, year, parsed = parse_date_strings(date_strs, format_types)
+    return parsed & is_valid_date_batch(day, month, year)
+
+
+# Batch counterparts of the scalar validators, used by code that evaluates whole populations
+BATCH_VALIDATORS = {
+    is_valid_date: is_valid_date_batch,
+    validator_instance_1: validator_instance_1_batch,
+    validator_instance_2: is_valid_date_batch,
+    validator_instance_3: is_valid_date_batch,
+    validator_instance_4: validator_instance_4_batch,
+}
+
+def get_batch_validator(validator):
+    """
+    Get the batch counterpart of a scalar validator.
+
+    Args:
+        validator: A scalar validation function
+
+    Returns:
+        The batch validator taking component arrays, or None if the validator has no batch version
+    """
+    return getattr(validator, "batch", None) or BATCH_VALIDATORS.get(validator)
+
+
+# String batch counterparts of the scalar validators, taking the date strings (and format
+# types) of many test cases at once
+STRING_VALIDATORS = {
+    is_valid_date: is_valid_date_strings,
+    validator_instance_1: validator_instance_1_strings,
+    validator_instance_2: is_valid_date_strings,
+    validator_instance_3: is_valid_date_strings,
+    validator_instance_4: validator_instance_4_strings,
+}
+
+
+def get_string_batch_validator(validator):
+    """
+    Get the string batch counterpart of a scalar validator.
+
+    Validator adapters for slow validators (services, external programs) provide one as
+    their strings attribute, so a whole population is validated in one call.
+
+    Args:
+        validator: A scalar validation function or validator adapter
+
+    Returns:
+        The batch validator taking a sequence of date strings (and, for format-aware
+        validators, their format types), or None if the validator has none
+    """
+    return getattr(validator, "strings", None) or STRING_VALIDATORS.get(validator)
@@ -1,10 +1,47 @@
-import matplotlib
-matplotlib.use('Agg')  # Use Agg backend (non-interactive)
-import matplotlib.pyplot as plt
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Sequence
+import json
 import os
 
-def plot_coverage(coverages: List[float], instance_name: str, use_local_search: bool = False) -> str:
+# Default output directories
+IMAGES_DIR = os.path.join("src", "assets", "images")
+DATA_DIR = os.path.join("src", "assets", "data")
+
+# Most generation numbers labelled on the x-axis of a coverage plot
+MAX_GENERATION_TICKS = 20
+
+def generation_ticks(num_generations: int, max_ticks: int = MAX_GENERATION_TICKS) -> List[int]:
+    """
+    Choose the generation numbers labelled on the x-axis of a coverage plot.
+    
+    Every generation is labelled for short runs; longer runs are labelled at the first
+    generation and at multiples of a 1, 2 or 5 times power-of-ten step.
+    
+    Args:
+        num_generations: Number of plotted generations
+        max_ticks: Most ticks to return
+        
+    Returns:
+        Sorted generation numbers
+    """
+    if num_generations <= max_ticks:
+        return list(range(1, num_generations + 1))
+    magnitude = 1
+    while True:
+        for step in (magnitude, 2 * magnitude, 5 * magnitude):
+            if 1 + num_generations // step <= max_ticks:
+                return [1] + list(range(step, num_generations + 1, step))
+        magnitude *= 10
+
+def _pyplot():
+    """Import pyplot on first use, so runs without plots never load matplotlib."""
+    import matplotlib
+    matplotlib.use('Agg')  # Use Agg backend (non-interactive)
+    import matplotlib.pyplot as plt
+    return plt
+
+def plot_coverage(coverages: List[float], instance_name: str, use_local_search: bool = False,
+                  images_dir: str = IMAGES_DIR) -> str:
     """
     Plot coverage over generations and save the plot to a file.
     
@@ -12,10 +49,12 @@ def plot_coverage(coverages: List[float], instance_name: str, use_local_search:
         coverages: List of coverage values per generation
         instance_name: Name of the problem instance
         use_local_search: Whether local search was used
+        images_dir: Directory the plot is saved in
         
     Returns:
         The filename of the saved plot
     """
+    plt = _pyplot()
     plt.figure(figsize=(10, 6))
     
     # Plot the main GA evolution line
@@ -29,12 +68,11 @@ def plot_coverage(coverages: List[float], instance_name: str, use_local_search:
     plt.ylabel("Coverage (%)")
     plt.title(f"Coverage vs Generation ({instance_name})")
     plt.grid(True)
-    plt.xticks(range(1, len(coverages) + 1))  # Show all generation numbers on x-axis
+    plt.xticks(generation_ticks(len(coverages)))  # Label all generations of short runs, fewer of long runs
     plt.ylim(0, 100)  # Set y-axis range from 0 to 100
     plt.legend()  # Add a legend to distinguish between GA evolution and post local search
     
     # Ensure directory exists
-    images_dir = os.path.join("src", "assets", "images")
     os.makedirs(images_dir, exist_ok=True)
     
     # Save plot with instance-specific filename
@@ -45,6 +83,81 @@ def plot_coverage(coverages: List[float], instance_name: str, use_local_search:
     
     return full_path
 
+def _render_plot(job: Dict[str, Any], images_dir: str = IMAGES_DIR) -> str:
+    """Render one deferred coverage plot."""
+    return plot_coverage(job["coverages"], job["instance_name"], job["use_local_search"], images_dir)
+
+class PlotBatch:
+    """
+    Coverage plots collected during runs and rendered together afterwards.
+    
+    Runners given a batch add their plot to it instead of rendering it, which keeps
+    matplotlib out of the GA's wall-clock time. The jobs are plain data, so batches
+    filled in worker processes can be sent back and merged.
+    """
+    
+    def __init__(self, jobs: Optional[Sequence[Dict[str, Any]]] = None):
+        """
+        Initialize a batch.
+        
+        Args:
+            jobs: Plot jobs to start with, e.g. collected in another process
+        """
+        self.jobs: List[Dict[str, Any]] = list(jobs or [])
+    
+    def __len__(self):
+        return len(self.jobs)
+    
+    def add(self, coverages: List[float], instance_name: str, use_local_search: bool = False):
+        """
+        Add a coverage plot, with the arguments of plot_coverage.
+        
+        Args:
+            coverages: List of coverage values per generation
+            instance_name: Name of the problem instance
+            use_local_search: Whether local search was used
+        """
+        self.jobs.append({"coverages": list(coverages), "instance_name": instance_name,
+                          "use_local_search": use_local_search})
+    
+    def render(self, workers: Optional[int] = None, images_dir: str = IMAGES_DIR) -> List[str]:
+        """
+        Render all plots, in parallel worker processes, and empty the batch.
+        
+        Args:
+            workers: Number of worker processes (None uses all cores, 1 renders in-process)
+            images_dir: Directory the plots are saved in
+            
+        Returns:
+            The filenames of the saved plots, in the order the plots were added
+        """
+        jobs, self.jobs = self.jobs, []
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            return [_render_plot(job, images_dir) for job in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_render_plot, jobs, [images_dir] * len(jobs)))
+
+def render_plot(coverages: List[float], instance_name: str, use_local_search: bool = False,
+                plots=True) -> Optional[str]:
+    """
+    Render a coverage plot now, defer it to a batch or skip it.
+    
+    Args:
+        coverages: List of coverage values per generation
+        instance_name: Name of the problem instance
+        use_local_search: Whether local search was used
+        plots: True to render the plot now, a PlotBatch to add it to, or False to skip it
+        
+    Returns:
+        The filename of the saved plot if it was rendered now, otherwise None
+    """
+    if isinstance(plots, PlotBatch):
+        plots.add(coverages, instance_name, use_local_search)
+    elif plots:
+        return plot_coverage(coverages, instance_name, use_local_search)
+    return None
+
 def print_test_cases(valid_cases: List[Any], invalid_cases: List[Any], boundary_cases: List[Any] = None, instance_name: str = ""):
     """
     Print test cases to the console.
@@ -72,7 +185,8 @@ def print_test_cases(valid_cases: List[Any], invalid_cases: List[Any], boundary_
 
 def save_test_cases_to_csv(
     instance_results: Dict[str, tuple], 
-    filename: str = "test_cases_all.csv"
+    filename: str = "test_cases_all.csv",
+    data_dir: str = DATA_DIR
 ):
     """
     Save all test cases to a CSV file.
@@ -80,9 +194,9 @@ def save_test_cases_to_csv(
     Args:
         instance_results: Dictionary mapping instance names to tuples of (coverage, test_cases)
         filename: Output CSV filename
+        data_dir: Directory the CSV file is saved in
     """
     # Ensure directory exists
-    data_dir = os.path.join("src", "assets", "data")
     os.makedirs(data_dir, exist_ok=True)
     
     # Create full path for the CSV file
@@ -110,3 +224,34 @@ def print_coverage_comparison(results: Dict[str, float]):
     print("\n=== Coverage Comparison ===")
     for instance, coverage in results.items():
         print(f"{instance}: {coverage:.2f}%")
+
+def print_phase_breakdown(run_stats: Dict[str, Any]):
+    """
+    Print where the time of each run went, phase by phase.
+    
+    Args:
+        run_stats: Dictionary mapping instance names to the RunStats of their runs
+    """
+    print("\n=== Time Breakdown ===")
+    for instance, stats in run_stats.items():
+        print(f"\n{instance}")
+        print(stats.summary())
+
+def save_run_stats_to_json(run_stats: Dict[str, Any], filename: str = "run_stats.json",
+                           data_dir: str = DATA_DIR):
+    """
+    Save the phase timings of several runs to a JSON file.
+    
+    Args:
+        run_stats: Dictionary mapping instance names to the RunStats of their runs
+        filename: Output JSON filename
+        data_dir: Directory the JSON file is saved in
+    """
+    # Ensure directory exists
+    os.makedirs(data_dir, exist_ok=True)
+    
+    full_path = os.path.join(data_dir, filename)
+    with open(full_path, "w") as f:
+        json.dump({instance: stats.as_dict() for instance, stats in run_stats.items()}, f, indent=2)
+    
+    print(f"Run statistics saved to {full_path}")
@@ -0,0 +1,218 @@
+import os
+import queue
+import select
+import subprocess
+import sys
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Sequence, Union
+import numpy as np
+
+# Verdict lines accepted from workers (compared case-insensitively)
+TRUE_VERDICTS = ("1", "true", "valid", "yes")
+FALSE_VERDICTS = ("0", "false", "invalid", "no")
+
+
+class WorkerFailure(RuntimeError):
+    """A validator worker crashed, hung or broke the line protocol."""
+
+
+def _parse_verdict(line: bytes) -> bool:
+    """Parse one verdict line written by a worker."""
+    verdict = line.decode(errors="replace").strip().lower()
+    if verdict in TRUE_VERDICTS:
+        return True
+    if verdict in FALSE_VERDICTS:
+        return False
+    raise WorkerFailure(f"Unexpected verdict {verdict!r} from worker")
+
+
+def _terminate(processes: List[Optional[subprocess.Popen]]):
+    """Stop worker processes."""
+    for process in processes:
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+class WorkerPoolValidator:
+    """
+    Validator backed by a pool of long-lived external worker processes.
+
+    Workers speak a line-oriented batch protocol: they read one date string per line on
+    stdin (followed by a tab and the format type for format-aware instances) and write
+    one verdict line per input on stdout, in order ("1"/"0", "true"/"false" or
+    "valid"/"invalid"). Inputs are sent in batches of batch_size lines, spread over the
+    workers. A worker that exits, breaks the protocol or does not answer a batch within
+    timeout seconds is killed and restarted, and the batch is retried.
+
+    The pool is started on first use and can be passed wherever a validator is
+    accepted; the engine then validates each generation's new test cases in batches.
+    Uses select() on pipes, so it needs a POSIX system.
+    """
+
+    def __init__(self, command: Sequence[str], workers: int = 4, batch_size: int = 256,
+                 timeout: float = 10.0, retries: int = 2):
+        """
+        Initialize the pool without starting any worker.
+
+        Args:
+            command: Worker command line, e.g. ["./validate-dates", "--batch"]
+            workers: Number of worker processes
+            batch_size: Maximum number of lines sent to a worker at once
+            timeout: Seconds a worker may take to answer a batch before it is restarted
+            retries: Number of times a failed batch is retried on a restarted worker
+        """
+        if workers < 1 or batch_size < 1:
+            raise ValueError("workers and batch_size must be at least 1")
+        self.command = list(command)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.retries = retries
+        self.restarts = 0  # Number of workers restarted after a failure
+        self._processes: List[Optional[subprocess.Popen]] = [None] * workers
+        self._buffers = [bytearray() for _ in range(workers)]
+        self._idle: "queue.Queue[int]" = queue.Queue()
+        for slot in range(workers):
+            self._idle.put(slot)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._finalizer = weakref.finalize(self, _terminate, self._processes)
+
+    def __call__(self, date_str: str, *format_type: str) -> bool:
+        """Validate a single date string (and format type)."""
+        return bool(self.strings([date_str], [format_type[0]] if format_type else None)[0])
+
+    def strings(self, date_strs: Sequence[str], format_types: Union[None, str, Sequence[str]] = None) -> np.ndarray:
+        """
+        Validate many date strings, in batches spread over the workers.
+
+        Args:
+            date_strs: Date strings
+            format_types: Format type of all strings, or one per string, for format-aware validators
+
+        Returns:
+            Boolean array, True where the date is valid
+
+        Raises:
+            WorkerFailure: If a batch still fails after all retries
+        """
+        if isinstance(format_types, str):
+            format_types = [format_types] * len(date_strs)
+        lines = list(date_strs) if format_types is None else [f"{s}\t{f}" for s, f in zip(date_strs, format_types)]
+        if not lines:
+            return np.zeros(0, dtype=bool)
+
+        batches = [lines[i:i + self.batch_size] for i in range(0, len(lines), self.batch_size)]
+        if len(batches) == 1:
+            return np.array(self._run_batch(batches[0]), dtype=bool)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        results = list(self._executor.map(self._run_batch, batches))
+        return np.array([verdict for batch in results for verdict in batch], dtype=bool)
+
+    def _run_batch(self, lines: List[str]) -> List[bool]:
+        """Send a batch to an idle worker, restarting it and retrying on failure."""
+        for attempt in range(self.retries + 1):
+            slot = self._idle.get()
+            try:
+                return self._exchange(slot, lines)
+            except WorkerFailure as error:
+                failure = error
+                self._restart(slot)
+            finally:
+                self._idle.put(slot)
+        raise WorkerFailure(f"Batch failed {self.retries + 1} times: {failure}")
+
+    def _exchange(self, slot: int, lines: List[str]) -> List[bool]:
+        """Write a batch to a worker and read one verdict per line before the deadline."""
+        process = self._processes[slot]
+        if process is None or process.poll() is not None:
+            process = self._start(slot)
+        try:
+            process.stdin.write("".join(line + "\n" for line in lines).encode())
+            process.stdin.flush()
+        except OSError:
+            raise WorkerFailure(f"Worker exited with code {process.poll()}") from None
+
+        buffer = self._buffers[slot]
+        fd = process.stdout.fileno()
+        deadline = time.monotonic() + self.timeout
+        verdicts = []
+        while len(verdicts) < len(lines):
+            newline = buffer.find(b"\n")
+            if newline >= 0:
+                verdicts.append(_parse_verdict(bytes(buffer[:newline])))
+                del buffer[:newline + 1]
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise WorkerFailure(f"Worker did not answer {len(lines)} lines within {self.timeout}s")
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise WorkerFailure(f"Worker exited with code {process.wait()}")
+            buffer += chunk
+        return verdicts
+
+    def _start(self, slot: int) -> subprocess.Popen:
+        """Start the worker of a slot."""
+        self._buffers[slot].clear()
+        process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._processes[slot] = process
+        return process
+
+    def _restart(self, slot: int):
+        """Kill the worker of a slot; it is started again on its next batch."""
+        _terminate([self._processes[slot]])
+        self._processes[slot] = None
+        self.restarts += 1
+
+    def close(self):
+        """Stop all workers."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        _terminate(self._processes)
+        self._processes[:] = [None] * self.workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle only the configuration; each process starts its own workers."""
+        return {"command": self.command, "workers": self.workers, "batch_size": self.batch_size,
+                "timeout": self.timeout, "retries": self.retries}
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__init__(**state)
+
+    def __repr__(self):
+        # Deterministic, so instance fingerprints (and checkpoints) do not depend on the process
+        return f"WorkerPoolValidator({self.command!r})"
+
+
+def serve(validator_name: str):
+    """
+    Run a line-protocol worker around one of the bundled validators.
+
+    Serves as a reference implementation of the protocol and as a stand-in for an
+    external validator, e.g. WorkerPoolValidator([sys.executable, "-m",
+    "src.utils.worker_pool", "is_valid_date"]).
+
+    Args:
+        validator_name: Name of a validator in src.utils.validation
+    """
+    from . import validation
+    validator = getattr(validation, validator_name)
+    for line in sys.stdin:
+        verdict = validator(*line.rstrip("\n").split("\t"))
+        sys.stdout.write("1\n" if verdict else "0\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1])